@@ -27,18 +27,131 @@ that violation will result in immediate legal action to the fullest extent
 of applicable law.
 """
 
+import time
+
+STARTUP_STARTED = time.perf_counter()  # --profile-startup measures from here
+
 import curses
-import json
+import math
+import mmap
 import random
-import time
+import re
+import struct
 import os
 import sys
-from typing import Dict, List, Optional, Tuple, Any, Callable
-from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Tuple, Any, Callable, Iterator, MutableMapping, Union, get_type_hints
+from dataclasses import dataclass, field, fields, asdict, is_dataclass
 from enum import Enum, auto
 from datetime import datetime, timedelta
 from collections import defaultdict
-import textwrap
+from functools import lru_cache, partial
+
+IMPORTS_FINISHED = time.perf_counter()
+
+# NumPy is optional and slow to import, so it is only loaded by the batched
+# systems when they are first used; without it they fall back to plain Python
+np = None
+NUMPY_CHECKED = False
+
+
+def load_numpy():
+    """Import NumPy on first use, returning None when it is not installed"""
+    global np, NUMPY_CHECKED
+    if not NUMPY_CHECKED:
+        NUMPY_CHECKED = True
+        started = time.perf_counter()
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+        if STARTUP_PROFILER:
+            STARTUP_PROFILER.record("numpy (lazy)", time.perf_counter() - started)
+    return np
+
+
+class StartupProfiler:
+    """Wall-clock time spent in each startup stage, reported by --profile-startup"""
+    
+    def __init__(self, started: float):
+        self.last = started
+        self.stages: List[Tuple[str, float]] = []
+    
+    def mark(self, stage: str, now: Optional[float] = None):
+        """Close a stage that ran from the previous mark until now"""
+        if any(name == stage for name, _ in self.stages):
+            return
+        now = time.perf_counter() if now is None else now
+        self.stages.append((stage, now - self.last))
+        self.last = now
+    
+    def record(self, stage: str, seconds: float):
+        """Record a stage timed elsewhere, such as a lazy import"""
+        self.stages.append((stage, seconds))
+    
+    def report(self) -> str:
+        """Format the stage timings as a table"""
+        width = max(len(name) for name, _ in self.stages + [("total to first frame", 0)])
+        lines = [f"{name:<{width}}  {seconds * 1000:8.2f} ms" for name, seconds in self.stages]
+        total = sum(seconds for name, seconds in self.stages if "lazy" not in name)
+        lines.append(f"{'total to first frame':<{width}}  {total * 1000:8.2f} ms")
+        return "\n".join(lines)
+
+
+STARTUP_PROFILER: Optional[StartupProfiler] = None
+
+
+# ============================================================================
+# RANDOM STREAMS
+# ============================================================================
+
+class RandomStreams:
+    """Seeded random streams, one per subsystem
+    
+    Each stream is seeded from the master seed and its own name, so what one
+    subsystem draws never shifts another's numbers and a run replays from its
+    seed. The batched systems take a derived seed for their NumPy generators,
+    and spawn() derives independent streams for parallel runs.
+    """
+    
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = 0
+        self.streams: Dict[str, random.Random] = {}
+        self.reset(seed)
+    
+    def reset(self, seed: Optional[int] = None):
+        """Reseed every stream from a new master seed (a fresh one if None)"""
+        self.seed = int.from_bytes(os.urandom(8), "big") if seed is None else seed
+        for name, stream in self.streams.items():
+            stream.seed(self.derive(name))
+    
+    def derive(self, name: str) -> int:
+        """Seed derived from the master seed for a name"""
+        return random.Random(f"{self.seed}/{name}").getrandbits(64)
+    
+    def get(self, name: str) -> random.Random:
+        """The stream for a subsystem"""
+        if name not in self.streams:
+            self.streams[name] = random.Random(self.derive(name))
+        return self.streams[name]
+    
+    def spawn(self, key: Any) -> "RandomStreams":
+        """Independent streams for a child run, e.g. one parallel simulation"""
+        return RandomStreams(self.derive(f"spawn/{key}"))
+    
+    def to_state(self) -> Dict[str, Any]:
+        """Master seed and the state of every stream, ready for JSON"""
+        streams = {}
+        for name, stream in self.streams.items():
+            version, internal, gauss_next = stream.getstate()
+            streams[name] = [version, list(internal), gauss_next]
+        return {"seed": self.seed, "streams": streams}
+    
+    def restore(self, state: Dict[str, Any]):
+        """Put every stream back where to_state found it"""
+        self.reset(state["seed"])
+        for name, (version, internal, gauss_next) in state.get("streams", {}).items():
+            self.get(name).setstate((version, tuple(internal), gauss_next))
 
 
 # ============================================================================
@@ -60,6 +173,7 @@ class GameState(Enum):
     TRADING = auto()
     GAME_OVER = auto()
     PAUSED = auto()
+    LAUNDERING = auto()
 
 
 class LocationType(Enum):
@@ -387,6 +501,9 @@ class Player:
     # Weather system
     current_weather: str = "Clear"
     weather_effects: Dict[str, Any] = field(default_factory=dict)
+    # Random streams, handed over by the engine
+    rng: random.Random = field(default=random, repr=False, compare=False)
+    weather_rng: random.Random = field(default=random, repr=False, compare=False)
 
     def update_mood(self) -> None:
         """Update mood based on psychological wellness metrics"""
@@ -405,9 +522,9 @@ class Player:
 
     def update_psychological_wellness(self, stress_change: int = 0, hope_change: int = 0, fatigue_change: int = 0) -> None:
         """Update psychological wellness metrics"""
-        self.stress_level = max(0, min(100, self.stress_level + stress_change))
-        self.hope_level = max(0, min(100, self.hope_level + hope_change))
-        self.mental_fatigue = max(0, min(100, self.mental_fatigue + fatigue_change))
+        self.stress_level = max(0, min(100, self.stress_level + int(stress_change)))
+        self.hope_level = max(0, min(100, self.hope_level + int(hope_change)))
+        self.mental_fatigue = max(0, min(100, self.mental_fatigue + int(fatigue_change)))
         self.update_mood()
 
     def add_recipe(self, recipe_name: str) -> None:
@@ -420,15 +537,28 @@ class Player:
         if operation_name not in self.manufacturing_operations:
             self.manufacturing_operations.append(operation_name)
 
-    def launder_money(self, amount: int, risk_tolerance: int) -> Tuple[bool, int, str]:
-        """Attempt to launder dirty money"""
+    def launder_money(self, amount: int, risk_tolerance: int,
+                      operation: Optional["MoneyLaunderingOperation"] = None) -> Tuple[bool, int, str]:
+        """Attempt to launder dirty money, optionally through one of the laundering operations"""
         if amount > self.dirty_money:
             return False, 0, "Not enough dirty money"
         
+        if operation is not None:
+            success, busted, clean_return, loss, reputation_change = resolve_laundering(
+                operation, amount, self.underground_reputation, risk_tolerance,
+                self.rng.random(), self.rng.random(), self.rng.random())
+            clean_return = int(clean_return)
+            self.dirty_money = max(0, self.dirty_money - (amount if success else int(loss)))
+            self.clean_money += clean_return
+            self.underground_reputation = max(0, min(100, self.underground_reputation + reputation_change))
+            if success:
+                return True, clean_return, f"{operation.name} paid out"
+            return False, 0, f"{operation.name} was busted" if busted else f"{operation.name} fell through"
+        
         # Base success chance based on player's underground reputation and risk tolerance
         success_chance = min(0.9, self.underground_reputation / 100.0 + risk_tolerance / 200.0)
         
-        if random.random() < success_chance:
+        if self.rng.random() < success_chance:
             # Successful laundering
             clean_return = int(amount * 0.7)  # 70% return rate
             self.dirty_money -= amount
@@ -624,8 +754,9 @@ class Player:
 
     def advance_time(self, hours: int = 1) -> None:
         """Advance game time and update related systems"""
+        previous_time = self.game_time
         self.game_time += timedelta(hours=hours)
-        self.days_served += hours // 24
+        self.days_served += (self.game_time.date() - previous_time.date()).days
         
         # Update psychological wellness over time
         # Slowly increase stress and fatigue, decrease hope
@@ -637,22 +768,53 @@ class Player:
         
         # Update medical conditions
         for condition in self.medical_conditions[:]:  # Create a copy to iterate over
-            if condition.chronic and random.random() < condition.recurrence_chance:
+            if condition.chronic and self.rng.random() < condition.recurrence_chance:
                 # Condition flares up again
                 pass  # In a real implementation, this might apply effects
         
         # Update weather (simplified)
-        if random.random() < 0.1:  # 10% chance of weather change each time
+        if self.weather_rng.random() < 0.1:  # 10% chance of weather change each time
             weathers = ["Clear", "Cloudy", "Rainy", "Windy", "Foggy"]
-            self.current_weather = random.choice(weathers)
+            self.current_weather = self.weather_rng.choice(weathers)
+
+
+# ============================================================================
+# LAZY MODULE CONSTANTS
+# ============================================================================
+
+# The art and built-in content tables are only needed to draw a location or to
+# (re)compile the content index, so they are built on first use rather than at
+# import. The module constants (ASCII_ARTS, ITEMS, ...) still resolve through
+# __getattr__; code inside this module calls the cached builders directly.
+LAZY_CONSTANTS: Dict[str, Callable[[], Any]] = {}
+
+
+def lazy_constant(name: str):
+    """Register a cached builder as the lazily built module constant name"""
+    def register(builder):
+        cached = lru_cache(maxsize=None)(builder)
+        LAZY_CONSTANTS[name] = cached
+        return cached
+    return register
+
+
+def __getattr__(name: str) -> Any:
+    """Build a lazy module constant on first access"""
+    builder = LAZY_CONSTANTS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return builder()
 
 
 # ============================================================================
 # ASCII ART ASSETS
 # ============================================================================
 
-ASCII_ARTS = {
-    "chapel": '''
+@lazy_constant("ASCII_ARTS")
+def builtin_ascii_arts() -> Dict[str, str]:
+    """ASCII art shown by the location screens"""
+    return {
+        "chapel": '''
         =========================
               CHAPEL OF REDEMPTION
         =========================
@@ -666,7 +828,7 @@ ASCII_ARTS = {
                    |___|
                    |___|
     ''',
-    "education": '''
+        "education": '''
         =========================
               EDUCATION BLOCK
         =========================
@@ -678,7 +840,7 @@ ASCII_ARTS = {
          |  DESKS        ||
          |______________|/
     ''',
-    "visitation": '''
+        "visitation": '''
         =========================
              VISITATION CENTRE
         =========================
@@ -689,7 +851,7 @@ ASCII_ARTS = {
            ||    |ILY|ILY|
            ||    +---+-+-+
     ''',
-    "solitary": '''
+        "solitary": '''
         =========================
             THE HOLE (SOLITARY)
         =========================
@@ -700,7 +862,7 @@ ASCII_ARTS = {
         |  [===]  [===]  |
         |________________|
     ''',
-    "showers": '''
+        "showers": '''
         =========================
               SHOWERS BLOCK
         =========================
@@ -710,7 +872,7 @@ ASCII_ARTS = {
          |[|]    |[|]    |[|]|
          |[|]    |[|]    |[|]|
     ''',
-    "laundry": '''
+        "laundry": '''
         =========================
             LAUNDRY FACILITY
         =========================
@@ -719,7 +881,7 @@ ASCII_ARTS = {
          ( )( ) ( )( ) ( )( )
          ( )( ) ( )( ) ( )( )
     ''',
-    "padre_osullivan": '''
+        "padre_osullivan": '''
          .--.     .--.
         /.-. \   / .-.\\
         | | | |   | | | |
@@ -728,14 +890,14 @@ ASCII_ARTS = {
          '--'       '--'
           ||         ||
     ''',
-    "teacher_jenny": '''
+        "teacher_jenny": '''
           .-.
          (   )
         .-.| |.-.
        (   : :   )
         `-'" "'-'
     ''',
-    "officer_sally": '''
+        "officer_sally": '''
           .--.
          /  _ `.
         |  (_)  |
@@ -743,7 +905,7 @@ ASCII_ARTS = {
          \\ `--. \\
           `---.'`
     ''',
-    "brad_student": '''
+        "brad_student": '''
           .--.
          /   |\\
         |    ||
@@ -751,7 +913,7 @@ ASCII_ARTS = {
          \\   ||
           `--'|
     ''',
-    "mike_laundry": '''
+        "mike_laundry": '''
           .--.
          |    |
          |    |
@@ -759,7 +921,7 @@ ASCII_ARTS = {
          |    |
          '----'
     ''',
-    "yatala_prison": '''
+        "yatala_prison": '''
         =========================
              YATALA LOCKDOWN
         =========================
@@ -771,552 +933,874 @@ ASCII_ARTS = {
          |  [V]  [E]  [A]  |
          '-----------------'
     '''
-}
+    }
 
 
 # ============================================================================
 # GAME DATA
 # ============================================================================
 
-# Crafting recipes
-CRAFTING_RECIPES = [
-    CraftingRecipe(
-        name="Shiv",
-        description="A makeshift knife made from scrap metal",
-        required_items={"scrap metal": 1, "tape": 1},
-        required_skills={Skill.CRAFTING: 20},
-        output_item="shiv",
-        output_quantity=1,
-        success_chance=0.8
-    ),
-    CraftingRecipe(
-        name="Lockpick Set",
-        description="A set of tools for picking locks",
-        required_items={"wire": 2, "plastic": 1},
-        required_skills={Skill.CRAFTING: 30, Skill.DEXTERITY: 25},
-        output_item="lockpick set",
-        output_quantity=1,
-        success_chance=0.7
-    ),
-    CraftingRecipe(
-        name="Contraband Radio",
-        description="A hidden radio for news and entertainment",
-        required_items={"electronics parts": 3, "battery": 1, "plastic case": 1},
-        required_skills={Skill.CRAFTING: 40, Skill.ELECTRONICS: 35},
-        output_item="contraband radio",
-        output_quantity=1,
-        success_chance=0.6,
-        faction_required=Faction.INMATE_COUNCIL
-    )
-]
+@lazy_constant("CRAFTING_RECIPES")
+def builtin_crafting_recipes() -> List[CraftingRecipe]:
+    """Built-in crafting recipes"""
+    return [
+        CraftingRecipe(
+            name="Shiv",
+            description="A makeshift knife made from scrap metal",
+            required_items={"scrap metal": 1, "tape": 1},
+            required_skills={Skill.CRAFTING: 20},
+            output_item="shiv",
+            output_quantity=1,
+            success_chance=0.8
+        ),
+        CraftingRecipe(
+            name="Lockpick Set",
+            description="A set of tools for picking locks",
+            required_items={"wire": 2, "plastic": 1},
+            required_skills={Skill.CRAFTING: 30, Skill.DEXTERITY: 25},
+            output_item="lockpick set",
+            output_quantity=1,
+            success_chance=0.7
+        ),
+        CraftingRecipe(
+            name="Contraband Radio",
+            description="A hidden radio for news and entertainment",
+            required_items={"electronics parts": 3, "battery": 1, "plastic case": 1},
+            required_skills={Skill.CRAFTING: 40, Skill.ELECTRONICS: 35},
+            output_item="contraband radio",
+            output_quantity=1,
+            success_chance=0.6,
+            faction_required=Faction.INMATE_COUNCIL
+        )
+    ]
+
+@lazy_constant("MANUFACTURING_PROCESSES")
+def builtin_manufacturing_processes() -> List[ManufacturingProcess]:
+    """Built-in manufacturing processes"""
+    return [
+        ManufacturingProcess(
+            name="Alcohol Brewery",
+            description="Large-scale production of homemade alcohol",
+            required_materials={"sugar": 10, "yeast": 5, "water": 20},
+            required_skills={Skill.CRAFTING: 50, Skill.CHEMISTRY: 40},
+            output_item="bottle of alcohol",
+            output_quantity=50,
+            time_required=7,  # 7 game days
+            worker_requirements=3,
+            risk_factor=0.3,  # 30% chance of getting caught
+            faction_required=Faction.REBELS_MC
+        ),
+        ManufacturingProcess(
+            name="Cigarette Production",
+            description="Mass production of contraband cigarettes",
+            required_materials={"tobacco": 20, "paper": 50, "filters": 50},
+            required_skills={Skill.CRAFTING: 30, Skill.DEXTERITY: 25},
+            output_item="pack of cigarettes",
+            output_quantity=100,
+            time_required=3,  # 3 game days
+            worker_requirements=2,
+            risk_factor=0.2,  # 20% chance of getting caught
+            faction_required=None
+        )
+    ]
+
+@lazy_constant("MONEY_LAUNDERING_OPERATIONS")
+def builtin_money_laundering_operations() -> List[MoneyLaunderingOperation]:
+    """Built-in money laundering operations"""
+    return [
+        MoneyLaunderingOperation(
+            name="Laundry Service Front",
+            description="Use a legitimate business to clean dirty money",
+            capital_required=1000,
+            risk_level=0.2,  # Low risk
+            clean_money_return=700,  # 70% return
+            time_required=5,  # 5 game days
+            success_chance=0.8,
+            underground_rep_required=20,
+            faction_required=Faction.STAFF_CORRUPTION
+        ),
+        MoneyLaunderingOperation(
+            name="Casino Chips",
+            description="Convert dirty money to casino chips and back",
+            capital_required=5000,
+            risk_level=0.6,  # High risk
+            clean_money_return=3000,  # 60% return
+            time_required=10,  # 10 game days
+            success_chance=0.5,
+            underground_rep_required=50,
+            faction_required=Faction.BLACK_UHLANS
+        )
+    ]
+
+@lazy_constant("REHABILITATION_PROGRAMS")
+def builtin_rehabilitation_programs() -> List[RehabilitationProgram]:
+    """Built-in rehabilitation programs"""
+    return [
+        RehabilitationProgram(
+            name="Basic Literacy",
+            description="Improve reading and writing skills",
+            duration=30,  # 30 game days
+            cost=200,  # in clean money
+            skill_improvements={Skill.EDUCATION: 10},
+            attribute_improvements={"intelligence": 2},
+            parole_benefit=5,  # 5 days off sentence
+            education_level_required=0
+        ),
+        RehabilitationProgram(
+            name="Vocational Training - Carpentry",
+            description="Learn carpentry skills for post-prison employment",
+            duration=60,  # 60 game days
+            cost=500,
+            skill_improvements={Skill.CRAFTING: 15, Skill.STRENGTH: 5},
+            attribute_improvements={"dexterity": 3},
+            parole_benefit=10,
+            prerequisites=["Basic Literacy"],
+            education_level_required=30
+        ),
+        RehabilitationProgram(
+            name="Anger Management Therapy",
+            description="Learn to control aggressive behavior",
+            duration=45,  # 45 game days
+            cost=300,
+            skill_improvements={Skill.PSYCHOLOGY: 12},
+            attribute_improvements={"wisdom": 4, "emotional_stability": 10},
+            parole_benefit=7,
+            education_level_required=20
+        )
+    ]
+
+@lazy_constant("MEDICAL_CONDITIONS")
+def builtin_medical_conditions() -> List[MedicalCondition]:
+    """Built-in medical conditions"""
+    return [
+        MedicalCondition(
+            name="Depression",
+            description="Persistent feelings of sadness and hopelessness",
+            severity=7,
+            chronic=True,
+            treatment_required=True,
+            treatment_cost=500,
+            recurrence_chance=0.3,
+            stat_effects={"wisdom": -2, "charisma": -3}
+        ),
+        MedicalCondition(
+            name="Anxiety Disorder",
+            description="Excessive worry and fear",
+            severity=6,
+            chronic=True,
+            treatment_required=True,
+            treatment_cost=400,
+            recurrence_chance=0.25,
+            stat_effects={"dexterity": -2, "stress_tolerance": -10}
+        ),
+        MedicalCondition(
+            name="Influenza",
+            description="Viral infection causing fever and body aches",
+            severity=4,
+            chronic=False,
+            treatment_required=False,
+            treatment_cost=100,
+            recurrence_chance=0.1,
+            stat_effects={"strength": -3, "constitution": -2}
+        )
+    ]
+
+@lazy_constant("RELATIONSHIP_EVENTS")
+def builtin_relationship_events() -> List[RelationshipEvent]:
+    """Built-in relationship events"""
+    return [
+        RelationshipEvent(
+            name="Helped in Fight",
+            description="You helped an inmate in a fight",
+            relationship_effects={
+                "Generic Inmate": (10, 5, -5),  # +10 trust, +5 respect, -5 fear
+            },
+            cooldown_days=30,
+            faction_involved=Faction.REBELS_MC
+        ),
+        RelationshipEvent(
+            name="Snitched to Guards",
+            description="You reported illegal activity to the guards",
+            relationship_effects={
+                "Generic Inmate": (-20, -10, 15),  # -20 trust, -10 respect, +15 fear
+            },
+            cooldown_days=60
+        )
+    ]
+
+@lazy_constant("SEASONAL_EVENTS")
+def builtin_seasonal_events() -> List[SeasonalEvent]:
+    """Built-in seasonal events"""
+    return [
+        SeasonalEvent(
+            name="Christmas Day",
+            description="Christmas celebration in the prison",
+            start_date=(12, 25),
+            end_date=(12, 25),
+            effects=["Special meal", "Visitation hours extended"],
+            participation_requirements=["Good behavior"],
+            rewards={"clean_money": 100, "hope_level": 10},
+            risk_level=0.1,
+            faction_involved=None
+        ),
+        SeasonalEvent(
+            name="ANZAC Day",
+            description="Commemorating Australian military personnel",
+            start_date=(4, 25),
+            end_date=(4, 25),
+            effects=["Memorial service", "Moment of silence"],
+            participation_requirements=["Attendance at service"],
+            rewards={"respect": 5, "wisdom": 2},
+            risk_level=0.05,
+            faction_involved=None
+        )
+    ]
+
+@lazy_constant("ITEMS")
+def builtin_items() -> List[Item]:
+    """Built-in items"""
+    return [
+        Item(
+            name="shiv",
+            description="A makeshift knife made from scrap metal",
+            item_type=ItemType.WEAPON,
+            value=50,
+            weight=0.5,
+            effects={"damage": 15}
+        ),
+        Item(
+            name="contraband radio",
+            description="A hidden radio for news and entertainment",
+            item_type=ItemType.TOOL,
+            value=200,
+            weight=1.0,
+            effects={"entertainment": 10}
+        ),
+        Item(
+            name="bottle of alcohol",
+            description="Homemade brew, strong and potent",
+            item_type=ItemType.CONSUMABLE,
+            value=150,
+            weight=1.5,
+            effects={"intoxication": 20, "stress_relief": 15}
+        ),
+        Item(
+            name="pack of cigarettes",
+            description="Contraband cigarettes",
+            item_type=ItemType.CONSUMABLE,
+            value=100,
+            weight=0.2,
+            effects={"stress_relief": 5, "addiction_risk": 10}
+        ),
+        Item(
+            name="educational book",
+            description="A book to improve your knowledge",
+            item_type=ItemType.CONSUMABLE,
+            value=75,
+            weight=0.8,
+            effects={"education": 5}
+        ),
+        Item(
+            name="Vili's Pie",
+            description="A famous South Australian pie",
+            item_type=ItemType.CONSUMABLE,
+            value=15,
+            weight=0.3,
+            effects={"hunger": -20, "happiness": 5}
+        ),
+        Item(
+            name="Farmers Union Iced Coffee",
+            description="Iconic South Australian iced coffee",
+            item_type=ItemType.CONSUMABLE,
+            value=5,
+            weight=0.5,
+            effects={"thirst": -15, "energy": 10}
+        )
+    ]
+
+@lazy_constant("LOCATIONS")
+def builtin_locations() -> List[Location]:
+    """Built-in locations"""
+    return [
+        Location(
+            name="Cell Block C",
+            description="Your assigned cell in the main cell block. Bunk beds, concrete walls, and a small window looking out to the yard.",
+            location_type=LocationType.CELL_BLOCK,
+            connected_locations=["Yard", "Mess Hall", "Showers Block"],
+            npcs=["Cellmate Bob"],
+            items=["shiv", "contraband radio"],
+            ascii_art="yatala_prison"
+        ),
+        Location(
+            name="Yard",
+            description="The prison yard where inmates get some fresh air and exercise. Various groups gather here.",
+            location_type=LocationType.YARD,
+            connected_locations=["Cell Block C", "Workshop", "Chapel of Redemption", "Education Block"],
+            npcs=["Yard Boss Tony", "Recreation Inmate"],
+            items=["pack of cigarettes"],
+            faction_presence=[Faction.REBELS_MC, Faction.HELLS_ANGELS, Faction.WHITE_POWER]
+        ),
+        Location(
+            name="Mess Hall",
+            description="Where inmates eat their meals. Long tables and benches, supervised by guards.",
+            location_type=LocationType.MESS_HALL,
+            connected_locations=["Cell Block C", "Main Kitchen"],
+            npcs=["Cook Mike", "Food Line Guard"],
+            items=["Vili's Pie"],
+            ascii_art="yatala_prison"
+        ),
+        Location(
+            name="Workshop",
+            description="An industrial workshop where inmates work on various maintenance and manufacturing tasks.",
+            location_type=LocationType.WORKSHOP,
+            connected_locations=["Yard", "Laundry Facility"],
+            npcs=["Workshop Foreman", "Inmate Worker"],
+            items=["scrap metal", "tools"],
+            faction_presence=[Faction.INMATE_COUNCIL]
+        ),
+        Location(
+            name="Infirmary",
+            description="The prison medical facility, staffed by doctors and nurses.",
+            location_type=LocationType.INFIRMARY,
+            connected_locations=["Administration Block"],
+            npcs=["Dr. Smith", "Nurse Jenny"],
+            items=["medical supplies", "prescription medication"],
+            restricted_access=True,
+            access_requirements=["medical appointment"]
+        ),
+        Location(
+            name="Library",
+            description="A quiet space with books, magazines, and educational materials.",
+            location_type=LocationType.LIBRARY,
+            connected_locations=["Education Block"],
+            npcs=["Librarian Sarah", "Studious Inmate"],
+            items=["educational book", "newspaper"],
+            ascii_art="education"
+        ),
+        Location(
+            name="Solitary Confinement",
+            description="The Hole. A place of isolation for disciplinary reasons.",
+            location_type=LocationType.SOLITARY,
+            connected_locations=["Administration Block"],
+            npcs=["Solitary Guard"],
+            items=[],
+            restricted_access=True,
+            access_requirements=["disciplinary action"],
+            ascii_art="solitary"
+        ),
+        Location(
+            name="Visitation Centre",
+            description="Where inmates meet with family and friends behind reinforced glass.",
+            location_type=LocationType.VISITATION,
+            connected_locations=["Administration Block"],
+            npcs=["Padre O'Sullivan", "Officer Sally", "Visitor"],
+            items=[],
+            ascii_art="visitation"
+        ),
+        Location(
+            name="Chapel of Redemption",
+            description="A place for spiritual reflection and religious services.",
+            location_type=LocationType.CHAPEL,
+            connected_locations=["Yard"],
+            npcs=["Padre O'Sullivan", "Chapel Regular"],
+            items=["religious text"],
+            ascii_art="chapel"
+        ),
+        Location(
+            name="Education Block",
+            description="Classrooms for educational and vocational programs.",
+            location_type=LocationType.EDUCATION,
+            connected_locations=["Yard", "Library"],
+            npcs=["Teacher Jenny", "Brad 'the Student'", "Education Coordinator"],
+            items=["educational materials", "computers"],
+            ascii_art="education"
+        ),
+        Location(
+            name="Showers Block",
+            description="Communal shower facilities, a place where conflicts often arise.",
+            location_type=LocationType.SHOWERS,
+            connected_locations=["Cell Block C"],
+            npcs=["Shower Monitor", "Inmate"],
+            items=[],
+            ascii_art="showers"
+        ),
+        Location(
+            name="Laundry Facility",
+            description="Where all the prison laundry is processed.",
+            location_type=LocationType.LAUNDRY,
+            connected_locations=["Workshop"],
+            npcs=["Laundry Supervisor Mike", "Laundry Worker"],
+            items=["clean uniforms"],
+            ascii_art="laundry"
+        ),
+        Location(
+            name="Administration Block",
+            description="The heart of prison operations, housing offices and special facilities.",
+            location_type=LocationType.ADMIN,
+            connected_locations=["Infirmary", "Solitary Confinement", "Visitation Centre"],
+            npcs=["Warden Johnson", "Administrator"],
+            items=["files", "forms"],
+            restricted_access=True,
+            access_requirements=["authorized personnel"]
+        ),
+        Location(
+            name="Main Kitchen",
+            description="Where all meals are prepared for the prison population.",
+            location_type=LocationType.KITCHEN,
+            connected_locations=["Mess Hall"],
+            npcs=["Head Chef", "Kitchen Staff"],
+            items=["Vili's Pie", "Farmers Union Iced Coffee"],
+            faction_presence=[Faction.STAFF_CORRUPTION]
+        )
+    ]
+
+@lazy_constant("NPCS")
+def builtin_npcs() -> List[NPC]:
+    """Built-in NPCs"""
+    return [
+        NPC(
+            name="Padre O'Sullivan",
+            description="A kind Irish priest who runs the chapel services.",
+            personality="Compassionate and wise, Padre O'Sullivan offers spiritual guidance to inmates of all backgrounds.",
+            dialogue={
+                "default": "God bless you, my son. What brings you to the chapel today?",
+                "spiritual guidance": "Remember, redemption is always possible, no matter what you've done.",
+                "confession": "I'm here to listen, and what is said in this chapel stays in this chapel."
+            },
+            faction=Faction.CHAPLAINS,
+            location="Chapel of Redemption",
+            services=["spiritual guidance", "confession"]
+        ),
+        NPC(
+            name="Teacher Jenny",
+            description="An enthusiastic educator who runs the literacy programs.",
+            personality="Dedicated to helping inmates improve their lives through education.",
+            dialogue={
+                "default": "Hello there! Ready to learn something new today?",
+                "classes": "We're covering basic reading skills this week. Have you enrolled?",
+                "education": "Education is the key to a better future, both inside and outside these walls."
+            },
+            faction=Faction.EDUCATORS,
+            location="Education Block",
+            services=["education", "literacy classes"]
+        ),
+        NPC(
+            name="Brad 'the Student'",
+            description="An inmate who takes his education seriously.",
+            personality="Quiet and studious, Brad is focused on bettering himself for when he's released.",
+            dialogue={
+                "default": "G'day mate. Just trying to get through this chapter on mathematics.",
+                "education": "I'm working on my GED. It's tough, but it'll be worth it when I get out.",
+                "future": "Got to plan for the future, you know? Can't stay here forever."
+            },
+            location="Education Block"
+        ),
+        NPC(
+            name="Officer Sally",
+            description="A stern but fair corrections officer who supervises visitations.",
+            personality="Professional and by-the-book, but shows compassion when appropriate.",
+            dialogue={
+                "default": "Name and business, prisoner.",
+                "visitation": "Visitation hours are from 9 AM to 4 PM. No contraband allowed.",
+                "rules": "I don't make the rules, but I enforce them. Keep that in mind."
+            },
+            faction=Faction.STAFF_CORRUPTION,
+            location="Visitation Centre",
+            services=["visitation supervision"]
+        ),
+        NPC(
+            name="Laundry Supervisor Mike",
+            description="A gruff inmate who runs the laundry operations.",
+            personality="Tough but fair, Mike keeps the laundry running smoothly.",
+            dialogue={
+                "default": "What do you want? This is a busy operation here.",
+                "work": "Everyone pulls their weight in my laundry, or they face consequences.",
+                "clean clothes": "Clean clothes don't just magically appear, you know. It takes work."
+            },
+            faction=Faction.INMATE_COUNCIL,
+            location="Laundry Facility",
+            services=["laundry work"]
+        ),
+        NPC(
+            name="Cellmate Bob",
+            description="Your assigned cellmate, a veteran of the prison system.",
+            personality="Streetwise and cautious, Bob knows the unwritten rules of prison life.",
+            dialogue={
+                "default": "What's the deal, mate? You new around here?",
+                "survival": "Look, just keep your head down and mind your own business. That's how you survive.",
+                "advice": "Stick with a group, but don't trust anyone completely. That's prison 101."
+            },
+            location="Cell Block C"
+        ),
+        NPC(
+            name="Yard Boss Tony",
+            description="A powerful inmate who controls activities in the yard.",
+            personality="Charismatic and intimidating, Tony commands respect from other inmates.",
+            dialogue={
+                "default": "You got business with me, or you just wasting my time?",
+                "respect": "Respect is earned in here, not given. You show me respect, I'll show you the same.",
+                "protection": "You want protection, you pay the price. That's how it works in here."
+            },
+            faction=Faction.REBELS_MC,
+            location="Yard",
+            services=["protection"]
+        ),
+        NPC(
+            name="Dr. Smith",
+            description="The prison physician, responsible for inmate health.",
+            personality="Professional and empathetic, Dr. Smith tries to provide the best care possible.",
+            dialogue={
+                "default": "How are you feeling today? Any complaints?",
+                "health": "Your health is important. Don't hesitate to come see me if you're not feeling well.",
+                "treatment": "I'll need to run some tests to determine the best course of treatment."
+            },
+            faction=Faction.MEDICAL_STAFF,
+            location="Infirmary",
+            services=["medical treatment", "health checkup"]
+        )
+    ]
+
+@lazy_constant("QUESTS")
+def builtin_quests() -> List[Quest]:
+    """Built-in quests"""
+    return [
+        Quest(
+            id="first_day",
+            title="First Day Blues",
+            description="Survive your first day in Yatala prison without getting into serious trouble.",
+            objectives=["Visit the mess hall", "Explore the yard", "Avoid disciplinary action"],
+            rewards={"experience": 50, "clean_money": 25}
+        ),
+        Quest(
+            id="education_enrollment",
+            title="Book Smart",
+            description="Enroll in an educational program to improve your future prospects.",
+            objectives=["Visit the Education Block", "Speak with Teacher Jenny", "Enroll in a program"],
+            rewards={"experience": 100, "education_level": 10, "wisdom": 2},
+            prerequisites=["first_day"]
+        ),
+        Quest(
+            id="chapel_visit",
+            title="Spiritual Guidance",
+            description="Seek spiritual guidance from Padre O'Sullivan to help with your inner struggles.",
+            objectives=["Visit the Chapel of Redemption", "Speak with Padre O'Sullivan", "Attend a service"],
+            rewards={"experience": 75, "hope_level": 15, "stress_level": -10}
+        ),
+        Quest(
+            id="work_assignment",
+            title="Honest Work",
+            description="Get assigned to a work detail to earn some extra money and stay out of trouble.",
+            objectives=["Visit the Workshop", "Speak with Workshop Foreman", "Complete a work shift"],
+            rewards={"experience": 75, "clean_money": 50, "strength": 1}
+        ),
+        Quest(
+            id="gang_approach",
+            title="Choice of Allegiance",
+            description="A gang leader has taken an interest in you. You must decide where your loyalties lie.",
+            objectives=["Speak with Yard Boss Tony", "Make a decision about joining a faction", "Deal with the consequences"],
+            rewards={"experience": 150, "faction_standing": 10}
+        )
+    ]
 
-# Manufacturing processes
-MANUFACTURING_PROCESSES = [
-    ManufacturingProcess(
-        name="Alcohol Brewery",
-        description="Large-scale production of homemade alcohol",
-        required_materials={"sugar": 10, "yeast": 5, "water": 20},
-        required_skills={Skill.CRAFTING: 50, Skill.CHEMISTRY: 40},
-        output_item="bottle of alcohol",
-        output_quantity=50,
-        time_required=7,  # 7 game days
-        worker_requirements=3,
-        risk_factor=0.3,  # 30% chance of getting caught
-        faction_required=Faction.REBELS_MC
-    ),
-    ManufacturingProcess(
-        name="Cigarette Production",
-        description="Mass production of contraband cigarettes",
-        required_materials={"tobacco": 20, "paper": 50, "filters": 50},
-        required_skills={Skill.CRAFTING: 30, Skill.DEXTERITY: 25},
-        output_item="pack of cigarettes",
-        output_quantity=100,
-        time_required=3,  # 3 game days
-        worker_requirements=2,
-        risk_factor=0.2,  # 20% chance of getting caught
-        faction_required=None
-    )
-]
+# ============================================================================
+# CONTENT PACKS
+# ============================================================================
 
-# Money laundering operations
-MONEY_LAUNDERING_OPERATIONS = [
-    MoneyLaunderingOperation(
-        name="Laundry Service Front",
-        description="Use a legitimate business to clean dirty money",
-        capital_required=1000,
-        risk_level=0.2,  # Low risk
-        clean_money_return=700,  # 70% return
-        time_required=5,  # 5 game days
-        success_chance=0.8,
-        underground_rep_required=20,
-        faction_required=Faction.STAFF_CORRUPTION
-    ),
-    MoneyLaunderingOperation(
-        name="Casino Chips",
-        description="Convert dirty money to casino chips and back",
-        capital_required=5000,
-        risk_level=0.6,  # High risk
-        clean_money_return=3000,  # 60% return
-        time_required=10,  # 10 game days
-        success_chance=0.5,
-        underground_rep_required=50,
-        faction_required=Faction.BLACK_UHLANS
-    )
-]
+CONTENT_DIR = os.path.expanduser("~/.local/share/yatala_lockdown")
+CONTENT_PACK_DIR = os.path.join(CONTENT_DIR, "packs")
+CONTENT_INDEX_PATH = os.path.join(CONTENT_DIR, "content.idx")
+CONTENT_SOURCES = [os.path.abspath(__file__)]  # files holding the built-in tables
+
+# table name: (record class, key field, builder of the built-in records)
+CONTENT_TABLES = {
+    "items": (Item, "name", builtin_items),
+    "locations": (Location, "name", builtin_locations),
+    "npcs": (NPC, "name", builtin_npcs),
+    "quests": (Quest, "id", builtin_quests),
+    "crafting_recipes": (CraftingRecipe, "name", builtin_crafting_recipes),
+    "manufacturing_processes": (ManufacturingProcess, "name", builtin_manufacturing_processes),
+    "money_laundering_operations": (MoneyLaunderingOperation, "name", builtin_money_laundering_operations),
+    "rehabilitation_programs": (RehabilitationProgram, "name", builtin_rehabilitation_programs),
+    "medical_conditions": (MedicalCondition, "name", builtin_medical_conditions),
+    "relationship_events": (RelationshipEvent, "name", builtin_relationship_events),
+    "seasonal_events": (SeasonalEvent, "name", builtin_seasonal_events),
+}
 
-# Rehabilitation programs
-REHABILITATION_PROGRAMS = [
-    RehabilitationProgram(
-        name="Basic Literacy",
-        description="Improve reading and writing skills",
-        duration=30,  # 30 game days
-        cost=200,  # in clean money
-        skill_improvements={Skill.EDUCATION: 10},
-        attribute_improvements={"intelligence": 2},
-        parole_benefit=5,  # 5 days off sentence
-        education_level_required=0
-    ),
-    RehabilitationProgram(
-        name="Vocational Training - Carpentry",
-        description="Learn carpentry skills for post-prison employment",
-        duration=60,  # 60 game days
-        cost=500,
-        skill_improvements={Skill.CRAFTING: 15, Skill.STRENGTH: 5},
-        attribute_improvements={"dexterity": 3},
-        parole_benefit=10,
-        prerequisites=["Basic Literacy"],
-        education_level_required=30
-    ),
-    RehabilitationProgram(
-        name="Anger Management Therapy",
-        description="Learn to control aggressive behavior",
-        duration=45,  # 45 game days
-        cost=300,
-        skill_improvements={Skill.PSYCHOLOGY: 12},
-        attribute_improvements={"wisdom": 4, "emotional_stability": 10},
-        parole_benefit=7,
-        education_level_required=20
-    )
-]
 
-# Medical conditions
-MEDICAL_CONDITIONS = [
-    MedicalCondition(
-        name="Depression",
-        description="Persistent feelings of sadness and hopelessness",
-        severity=7,
-        chronic=True,
-        treatment_required=True,
-        treatment_cost=500,
-        recurrence_chance=0.3,
-        stat_effects={"wisdom": -2, "charisma": -3}
-    ),
-    MedicalCondition(
-        name="Anxiety Disorder",
-        description="Excessive worry and fear",
-        severity=6,
-        chronic=True,
-        treatment_required=True,
-        treatment_cost=400,
-        recurrence_chance=0.25,
-        stat_effects={"dexterity": -2, "stress_tolerance": -10}
-    ),
-    MedicalCondition(
-        name="Influenza",
-        description="Viral infection causing fever and body aches",
-        severity=4,
-        chronic=False,
-        treatment_required=False,
-        treatment_cost=100,
-        recurrence_chance=0.1,
-        stat_effects={"strength": -3, "constitution": -2}
-    )
-]
+def encode_content(value: Any) -> Any:
+    """Convert a content record to plain JSON data (enums become member names)"""
+    if isinstance(value, Enum):
+        return value.name
+    if is_dataclass(value):
+        return {f.name: encode_content(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, dict):
+        return {encode_content(k): encode_content(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_content(v) for v in value]
+    return value
+
+
+def decode_content(value: Any, hint: Any) -> Any:
+    """Convert plain JSON data back to the type described by a type hint"""
+    if value is None or hint is Any:
+        return value
+    origin = getattr(hint, "__origin__", None)
+    args = getattr(hint, "__args__", ())
+    if origin is Union:
+        options = [a for a in args if a is not type(None)]
+        return decode_content(value, options[0]) if options else value
+    if origin in (list, List):
+        return [decode_content(v, args[0]) for v in value]
+    if origin in (tuple, Tuple):
+        return tuple(decode_content(v, a) for v, a in zip(value, args))
+    if origin in (dict, Dict):
+        return {decode_content(k, args[0]): decode_content(v, args[1]) for k, v in value.items()}
+    if isinstance(hint, type) and issubclass(hint, Enum):
+        return hint[value]
+    if is_dataclass(hint):
+        return decode_record(hint, value)
+    return value
+
+
+CONTENT_TYPE_HINTS: Dict[type, Dict[str, Any]] = {}
+
+
+def decode_record(cls: type, data: Dict[str, Any]) -> Any:
+    """Build a content record from its JSON data"""
+    hints = CONTENT_TYPE_HINTS.get(cls)
+    if hints is None:
+        hints = CONTENT_TYPE_HINTS[cls] = get_type_hints(cls)
+    return cls(**{key: decode_content(value, hints[key]) for key, value in data.items()})
+
+
+def content_fingerprint(pack_dir: str = CONTENT_PACK_DIR) -> bytes:
+    """Digest of the size and mtime of every content source, to spot a stale index"""
+    import hashlib
+    paths = list(CONTENT_SOURCES)
+    if os.path.isdir(pack_dir):
+        paths += [os.path.join(pack_dir, name) for name in sorted(os.listdir(pack_dir)) if name.endswith(".json")]
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.digest()[:16]
+
+
+def compile_content(pack_dir: str = CONTENT_PACK_DIR, index_path: str = CONTENT_INDEX_PATH) -> Dict[str, int]:
+    """Compile the built-in tables and every JSON pack in pack_dir into a binary index
+    
+    A pack is a JSON object mapping table names to lists of records. Packs are
+    applied in file name order and a record replaces any earlier one with the
+    same key. Returns the number of records written per table.
+    """
+    import json
+    tables = {name: {getattr(record, key): encode_content(record) for record in builtin()}
+              for name, (_, key, builtin) in CONTENT_TABLES.items()}
+    
+    if os.path.isdir(pack_dir):
+        for filename in sorted(os.listdir(pack_dir)):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(pack_dir, filename), "r", encoding="utf-8") as f:
+                pack = json.load(f)
+            for name, records in pack.items():
+                if name not in CONTENT_TABLES:
+                    raise ValueError(f"{filename}: unknown content table '{name}'")
+                cls, key, _ = CONTENT_TABLES[name]
+                for data in records:
+                    decode_record(cls, data)  # Validate before it reaches the index
+                    tables[name][data[key]] = data
+    
+    ContentIndex.write(index_path, tables, content_fingerprint(pack_dir))
+    return {name: len(records) for name, records in tables.items()}
 
-# Relationship events
-RELATIONSHIP_EVENTS = [
-    RelationshipEvent(
-        name="Helped in Fight",
-        description="You helped an inmate in a fight",
-        relationship_effects={
-            "Generic Inmate": (10, 5, -5),  # +10 trust, +5 respect, -5 fear
-        },
-        cooldown_days=30,
-        faction_involved=Faction.REBELS_MC
-    ),
-    RelationshipEvent(
-        name="Snitched to Guards",
-        description="You reported illegal activity to the guards",
-        relationship_effects={
-            "Generic Inmate": (-20, -10, 15),  # -20 trust, -10 respect, +15 fear
-        },
-        cooldown_days=60
-    )
-]
 
-# Seasonal events
-SEASONAL_EVENTS = [
-    SeasonalEvent(
-        name="Christmas Day",
-        description="Christmas celebration in the prison",
-        start_date=(12, 25),
-        end_date=(12, 25),
-        effects=["Special meal", "Visitation hours extended"],
-        participation_requirements=["Good behavior"],
-        rewards={"clean_money": 100, "hope_level": 10},
-        risk_level=0.1,
-        faction_involved=None
-    ),
-    SeasonalEvent(
-        name="ANZAC Day",
-        description="Commemorating Australian military personnel",
-        start_date=(4, 25),
-        end_date=(4, 25),
-        effects=["Memorial service", "Moment of silence"],
-        participation_requirements=["Attendance at service"],
-        rewards={"respect": 5, "wisdom": 2},
-        risk_level=0.05,
-        faction_involved=None
-    )
-]
+class ContentIndex:
+    """Read-only, memory-mapped content index produced by compile_content
+    
+    Layout: header (with the fingerprint of the sources it was built from),
+    table directory, then per table a sorted array of fixed size entries (key
+    offset/length, record offset/length) pointing into a blob of table names,
+    UTF-8 keys and compact JSON records. Lookups binary search the entry array
+    in place, so only the records actually used are decoded.
+    """
+    
+    MAGIC = b"YLCI"
+    VERSION = 2
+    HEADER = struct.Struct("<4sHH16s")  # magic, version, table count, source fingerprint
+    TABLE = struct.Struct("<IIII")  # name offset, name length, entry count, entries offset
+    ENTRY = struct.Struct("<IIII")  # key offset, key length, record offset, record length
+    
+    def __init__(self, path: str):
+        import json
+        self.loads = json.loads
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, table_count, self.fingerprint = self.HEADER.unpack_from(self.data, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{path} is not a compatible content index; recompile it")
+        
+        self.tables: Dict[str, Tuple[int, int]] = {}
+        pos = self.HEADER.size
+        for _ in range(table_count):
+            name_offset, name_length, count, offset = self.TABLE.unpack_from(self.data, pos)
+            self.tables[self.data[name_offset:name_offset + name_length].decode("utf-8")] = (count, offset)
+            pos += self.TABLE.size
+    
+    @classmethod
+    def read_fingerprint(cls, path: str) -> Optional[bytes]:
+        """Source fingerprint of an index file, or None if it is not a current index"""
+        with open(path, "rb") as f:
+            header = f.read(cls.HEADER.size)
+        if len(header) < cls.HEADER.size:
+            return None
+        magic, version, _, fingerprint = cls.HEADER.unpack(header)
+        return fingerprint if magic == cls.MAGIC and version == cls.VERSION else None
+    
+    @classmethod
+    def write(cls, path: str, tables: Dict[str, Dict[str, Any]], fingerprint: bytes = bytes(16)):
+        """Write encoded tables to an index file"""
+        import json
+        blob = bytearray()
+        directory = []
+        entries = bytearray()
+        base = cls.HEADER.size + cls.TABLE.size * len(tables)
+        
+        encoded_tables = []
+        for name, records in tables.items():
+            encoded = sorted((key.encode("utf-8"), json.dumps(data, separators=(",", ":")).encode("utf-8"))
+                             for key, data in records.items())
+            encoded_tables.append((name, encoded))
+        entry_count = sum(len(encoded) for _, encoded in encoded_tables)
+        blob_base = base + cls.ENTRY.size * entry_count
+        
+        for name, encoded in encoded_tables:
+            raw_name = name.encode("utf-8")
+            directory.append(cls.TABLE.pack(blob_base + len(blob), len(raw_name), len(encoded), base + len(entries)))
+            blob += raw_name
+            for key, record in encoded:
+                key_offset = blob_base + len(blob)
+                blob += key
+                entries += cls.ENTRY.pack(key_offset, len(key), blob_base + len(blob), len(record))
+                blob += record
+        
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(tables), fingerprint))
+            f.write(b"".join(directory))
+            f.write(entries)
+            f.write(blob)
+        os.replace(temp_path, path)
+    
+    def _entry(self, table: str, position: int) -> Tuple[int, int, int, int]:
+        """Read one entry of a table's sorted entry array"""
+        offset = self.tables[table][1] + position * self.ENTRY.size
+        return self.ENTRY.unpack_from(self.data, offset)
+    
+    def _key(self, table: str, position: int) -> bytes:
+        """Read the key of one entry"""
+        key_offset, key_length, _, _ = self._entry(table, position)
+        return self.data[key_offset:key_offset + key_length]
+    
+    def find(self, table: str, key: str) -> Optional[Dict[str, Any]]:
+        """Look up one record's JSON data by key"""
+        if table not in self.tables:
+            return None
+        target = key.encode("utf-8")
+        low, high = 0, self.tables[table][0]
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(table, middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.tables[table][0] and self._key(table, low) == target:
+            _, _, record_offset, record_length = self._entry(table, low)
+            return self.loads(self.data[record_offset:record_offset + record_length])
+        return None
+    
+    def keys(self, table: str) -> Iterator[str]:
+        """Iterate over a table's keys in sorted order"""
+        for position in range(self.tables.get(table, (0, 0))[0]):
+            yield self._key(table, position).decode("utf-8")
+    
+    def count(self, table: str) -> int:
+        """Number of records in a table"""
+        return self.tables.get(table, (0, 0))[0]
+    
+    def table(self, name: str) -> "ContentTable":
+        """Get a lazily decoded view of a table"""
+        return ContentTable(self, name)
 
-# Items
-ITEMS = [
-    Item(
-        name="shiv",
-        description="A makeshift knife made from scrap metal",
-        item_type=ItemType.WEAPON,
-        value=50,
-        weight=0.5,
-        effects={"damage": 15}
-    ),
-    Item(
-        name="contraband radio",
-        description="A hidden radio for news and entertainment",
-        item_type=ItemType.TOOL,
-        value=200,
-        weight=1.0,
-        effects={"entertainment": 10}
-    ),
-    Item(
-        name="bottle of alcohol",
-        description="Homemade brew, strong and potent",
-        item_type=ItemType.CONSUMABLE,
-        value=150,
-        weight=1.5,
-        effects={"intoxication": 20, "stress_relief": 15}
-    ),
-    Item(
-        name="pack of cigarettes",
-        description="Contraband cigarettes",
-        item_type=ItemType.CONSUMABLE,
-        value=100,
-        weight=0.2,
-        effects={"stress_relief": 5, "addiction_risk": 10}
-    ),
-    Item(
-        name="educational book",
-        description="A book to improve your knowledge",
-        item_type=ItemType.CONSUMABLE,
-        value=75,
-        weight=0.8,
-        effects={"education": 5}
-    ),
-    Item(
-        name="Vili's Pie",
-        description="A famous South Australian pie",
-        item_type=ItemType.CONSUMABLE,
-        value=15,
-        weight=0.3,
-        effects={"hunger": -20, "happiness": 5}
-    ),
-    Item(
-        name="Farmers Union Iced Coffee",
-        description="Iconic South Australian iced coffee",
-        item_type=ItemType.CONSUMABLE,
-        value=5,
-        weight=0.5,
-        effects={"thirst": -15, "energy": 10}
-    )
-]
 
-# Locations
-LOCATIONS = [
-    Location(
-        name="Cell Block C",
-        description="Your assigned cell in the main cell block. Bunk beds, concrete walls, and a small window looking out to the yard.",
-        location_type=LocationType.CELL_BLOCK,
-        connected_locations=["Yard", "Mess Hall", "Showers Block"],
-        npcs=["Cellmate Bob"],
-        items=["shiv", "contraband radio"],
-        ascii_art="yatala_prison"
-    ),
-    Location(
-        name="Yard",
-        description="The prison yard where inmates get some fresh air and exercise. Various groups gather here.",
-        location_type=LocationType.YARD,
-        connected_locations=["Cell Block C", "Workshop", "Chapel", "Education Block"],
-        npcs=["Yard Boss Tony", "Recreation Inmate"],
-        items=["pack of cigarettes"],
-        faction_presence=[Faction.REBELS_MC, Faction.HELLS_ANGELS, Faction.WHITE_POWER]
-    ),
-    Location(
-        name="Mess Hall",
-        description="Where inmates eat their meals. Long tables and benches, supervised by guards.",
-        location_type=LocationType.MESS_HALL,
-        connected_locations=["Cell Block C", "Kitchen"],
-        npcs=["Cook Mike", "Food Line Guard"],
-        items=["Vili's Pie"],
-        ascii_art="yatala_prison"
-    ),
-    Location(
-        name="Workshop",
-        description="An industrial workshop where inmates work on various maintenance and manufacturing tasks.",
-        location_type=LocationType.WORKSHOP,
-        connected_locations=["Yard", "Laundry Facility"],
-        npcs=["Workshop Foreman", "Inmate Worker"],
-        items=["scrap metal", "tools"],
-        faction_presence=[Faction.INMATE_COUNCIL]
-    ),
-    Location(
-        name="Infirmary",
-        description="The prison medical facility, staffed by doctors and nurses.",
-        location_type=LocationType.INFIRMARY,
-        connected_locations=["Administration Block"],
-        npcs=["Dr. Smith", "Nurse Jenny"],
-        items=["medical supplies", "prescription medication"],
-        restricted_access=True,
-        access_requirements=["medical appointment"]
-    ),
-    Location(
-        name="Library",
-        description="A quiet space with books, magazines, and educational materials.",
-        location_type=LocationType.LIBRARY,
-        connected_locations=["Education Block"],
-        npcs=["Librarian Sarah", "Studious Inmate"],
-        items=["educational book", "newspaper"],
-        ascii_art="education"
-    ),
-    Location(
-        name="Solitary Confinement",
-        description="The Hole. A place of isolation for disciplinary reasons.",
-        location_type=LocationType.SOLITARY,
-        connected_locations=["Administration Block"],
-        npcs=["Solitary Guard"],
-        items=[],
-        restricted_access=True,
-        access_requirements=["disciplinary action"],
-        ascii_art="solitary"
-    ),
-    Location(
-        name="Visitation Centre",
-        description="Where inmates meet with family and friends behind reinforced glass.",
-        location_type=LocationType.VISITATION,
-        connected_locations=["Administration Block"],
-        npcs=["Padre O'Sullivan", "Officer Sally", "Visitor"],
-        items=[],
-        ascii_art="visitation"
-    ),
-    Location(
-        name="Chapel of Redemption",
-        description="A place for spiritual reflection and religious services.",
-        location_type=LocationType.CHAPEL,
-        connected_locations=["Yard"],
-        npcs=["Padre O'Sullivan", "Chapel Regular"],
-        items=["religious text"],
-        ascii_art="chapel"
-    ),
-    Location(
-        name="Education Block",
-        description="Classrooms for educational and vocational programs.",
-        location_type=LocationType.EDUCATION,
-        connected_locations=["Yard", "Library"],
-        npcs=["Teacher Jenny", "Brad 'the Student'", "Education Coordinator"],
-        items=["educational materials", "computers"],
-        ascii_art="education"
-    ),
-    Location(
-        name="Showers Block",
-        description="Communal shower facilities, a place where conflicts often arise.",
-        location_type=LocationType.SHOWERS,
-        connected_locations=["Cell Block C"],
-        npcs=["Shower Monitor", "Inmate"],
-        items=[],
-        ascii_art="showers"
-    ),
-    Location(
-        name="Laundry Facility",
-        description="Where all the prison laundry is processed.",
-        location_type=LocationType.LAUNDRY,
-        connected_locations=["Workshop"],
-        npcs=["Laundry Supervisor Mike", "Laundry Worker"],
-        items=["clean uniforms"],
-        ascii_art="laundry"
-    ),
-    Location(
-        name="Administration Block",
-        description="The heart of prison operations, housing offices and special facilities.",
-        location_type=LocationType.ADMIN,
-        connected_locations=["Infirmary", "Solitary Confinement", "Visitation Centre"],
-        npcs=["Warden Johnson", "Administrator"],
-        items=["files", "forms"],
-        restricted_access=True,
-        access_requirements=["authorized personnel"]
-    ),
-    Location(
-        name="Main Kitchen",
-        description="Where all meals are prepared for the prison population.",
-        location_type=LocationType.KITCHEN,
-        connected_locations=["Mess Hall"],
-        npcs=["Head Chef", "Kitchen Staff"],
-        items=["Vili's Pie", "Farmers Union Iced Coffee"],
-        faction_presence=[Faction.STAFF_CORRUPTION]
-    )
-]
+class ContentTable(MutableMapping):
+    """Dict-like view of one index table that decodes records on first access
+    
+    Decoded records are kept, so changes made to them by the engine stick for
+    the lifetime of the view. Records added at runtime live alongside them.
+    """
+    
+    def __init__(self, index: ContentIndex, name: str):
+        self.index = index
+        self.name = name
+        self.cls = CONTENT_TABLES[name][0]
+        self.loaded: Dict[str, Any] = {}
+        self.added: Dict[str, Any] = {}
+        self.deleted: set = set()
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.added:
+            return self.added[key]
+        if key in self.loaded:
+            return self.loaded[key]
+        data = self.index.find(self.name, key) if key not in self.deleted else None
+        if data is None:
+            raise KeyError(key)
+        record = self.loaded[key] = decode_record(self.cls, data)
+        return record
+    
+    def __setitem__(self, key: str, value: Any):
+        self.added[key] = value
+        self.deleted.discard(key)
+    
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self.added.pop(key, None)
+        self.loaded.pop(key, None)
+        self.deleted.add(key)
+    
+    def __contains__(self, key: object) -> bool:
+        if key in self.added or key in self.loaded:
+            return True
+        return isinstance(key, str) and key not in self.deleted and self.index.find(self.name, key) is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in self.index.keys(self.name):
+            if key not in self.deleted and key not in self.added:
+                yield key
+        yield from self.added
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
 
-# NPCs
-NPCS = [
-    NPC(
-        name="Padre O'Sullivan",
-        description="A kind Irish priest who runs the chapel services.",
-        personality="Compassionate and wise, Padre O'Sullivan offers spiritual guidance to inmates of all backgrounds.",
-        dialogue={
-            "default": "God bless you, my son. What brings you to the chapel today?",
-            "spiritual guidance": "Remember, redemption is always possible, no matter what you've done.",
-            "confession": "I'm here to listen, and what is said in this chapel stays in this chapel."
-        },
-        faction=Faction.CHAPLAINS,
-        location="Chapel of Redemption",
-        services=["spiritual guidance", "confession"]
-    ),
-    NPC(
-        name="Teacher Jenny",
-        description="An enthusiastic educator who runs the literacy programs.",
-        personality="Dedicated to helping inmates improve their lives through education.",
-        dialogue={
-            "default": "Hello there! Ready to learn something new today?",
-            "classes": "We're covering basic reading skills this week. Have you enrolled?",
-            "education": "Education is the key to a better future, both inside and outside these walls."
-        },
-        faction=Faction.EDUCATORS,
-        location="Education Block",
-        services=["education", "literacy classes"]
-    ),
-    NPC(
-        name="Brad 'the Student'",
-        description="An inmate who takes his education seriously.",
-        personality="Quiet and studious, Brad is focused on bettering himself for when he's released.",
-        dialogue={
-            "default": "G'day mate. Just trying to get through this chapter on mathematics.",
-            "education": "I'm working on my GED. It's tough, but it'll be worth it when I get out.",
-            "future": "Got to plan for the future, you know? Can't stay here forever."
-        },
-        location="Education Block"
-    ),
-    NPC(
-        name="Officer Sally",
-        description="A stern but fair corrections officer who supervises visitations.",
-        personality="Professional and by-the-book, but shows compassion when appropriate.",
-        dialogue={
-            "default": "Name and business, prisoner.",
-            "visitation": "Visitation hours are from 9 AM to 4 PM. No contraband allowed.",
-            "rules": "I don't make the rules, but I enforce them. Keep that in mind."
-        },
-        faction=Faction.STAFF_CORRUPTION,
-        location="Visitation Centre",
-        services=["visitation supervision"]
-    ),
-    NPC(
-        name="Laundry Supervisor Mike",
-        description="A gruff inmate who runs the laundry operations.",
-        personality="Tough but fair, Mike keeps the laundry running smoothly.",
-        dialogue={
-            "default": "What do you want? This is a busy operation here.",
-            "work": "Everyone pulls their weight in my laundry, or they face consequences.",
-            "clean clothes": "Clean clothes don't just magically appear, you know. It takes work."
-        },
-        faction=Faction.INMATE_COUNCIL,
-        location="Laundry Facility",
-        services=["laundry work"]
-    ),
-    NPC(
-        name="Cellmate Bob",
-        description="Your assigned cellmate, a veteran of the prison system.",
-        personality="Streetwise and cautious, Bob knows the unwritten rules of prison life.",
-        dialogue={
-            "default": "What's the deal, mate? You new around here?",
-            "survival": "Look, just keep your head down and mind your own business. That's how you survive.",
-            "advice": "Stick with a group, but don't trust anyone completely. That's prison 101."
-        },
-        location="Cell Block C"
-    ),
-    NPC(
-        name="Yard Boss Tony",
-        description="A powerful inmate who controls activities in the yard.",
-        personality="Charismatic and intimidating, Tony commands respect from other inmates.",
-        dialogue={
-            "default": "You got business with me, or you just wasting my time?",
-            "respect": "Respect is earned in here, not given. You show me respect, I'll show you the same.",
-            "protection": "You want protection, you pay the price. That's how it works in here."
-        },
-        faction=Faction.REBELS_MC,
-        location="Yard",
-        services=["protection"]
-    ),
-    NPC(
-        name="Dr. Smith",
-        description="The prison physician, responsible for inmate health.",
-        personality="Professional and empathetic, Dr. Smith tries to provide the best care possible.",
-        dialogue={
-            "default": "How are you feeling today? Any complaints?",
-            "health": "Your health is important. Don't hesitate to come see me if you're not feeling well.",
-            "treatment": "I'll need to run some tests to determine the best course of treatment."
-        },
-        faction=Faction.MEDICAL_STAFF,
-        location="Infirmary",
-        services=["medical treatment", "health checkup"]
-    )
-]
 
-# Quests
-QUESTS = [
-    Quest(
-        id="first_day",
-        title="First Day Blues",
-        description="Survive your first day in Yatala prison without getting into serious trouble.",
-        objectives=["Visit the mess hall", "Explore the yard", "Avoid disciplinary action"],
-        rewards={"experience": 50, "clean_money": 25}
-    ),
-    Quest(
-        id="education_enrollment",
-        title="Book Smart",
-        description="Enroll in an educational program to improve your future prospects.",
-        objectives=["Visit the Education Block", "Speak with Teacher Jenny", "Enroll in a program"],
-        rewards={"experience": 100, "education_level": 10, "wisdom": 2},
-        prerequisites=["first_day"]
-    ),
-    Quest(
-        id="chapel_visit",
-        title="Spiritual Guidance",
-        description="Seek spiritual guidance from Padre O'Sullivan to help with your inner struggles.",
-        objectives=["Visit the Chapel of Redemption", "Speak with Padre O'Sullivan", "Attend a service"],
-        rewards={"experience": 75, "hope_level": 15, "stress_level": -10}
-    ),
-    Quest(
-        id="work_assignment",
-        title="Honest Work",
-        description="Get assigned to a work detail to earn some extra money and stay out of trouble.",
-        objectives=["Visit the Workshop", "Speak with Workshop Foreman", "Complete a work shift"],
-        rewards={"experience": 75, "clean_money": 50, "strength": 1}
-    ),
-    Quest(
-        id="gang_approach",
-        title="Choice of Allegiance",
-        description="A gang leader has taken an interest in you. You must decide where your loyalties lie.",
-        objectives=["Speak with Yard Boss Tony", "Make a decision about joining a faction", "Deal with the consequences"],
-        rewards={"experience": 150, "faction_standing": 10}
-    )
-]
+def load_content(index_path: str = CONTENT_INDEX_PATH, pack_dir: str = CONTENT_PACK_DIR) -> Dict[str, MutableMapping]:
+    """Get every content table, from the compiled index if there is one
+    
+    An index built from older sources (or an older format) is recompiled first.
+    """
+    if os.path.exists(index_path):
+        if ContentIndex.read_fingerprint(index_path) != content_fingerprint(pack_dir):
+            compile_content(pack_dir, index_path)
+        index = ContentIndex(index_path)
+        return {name: index.table(name) for name in CONTENT_TABLES}
+    return {name: {getattr(record, key): record for record in builtin()}
+            for name, (_, key, builtin) in CONTENT_TABLES.items()}
+
 
 # ============================================================================
 # UI RENDERER
@@ -1337,41 +1821,80 @@ class UIRenderer:
         curses.init_pair(5, curses.COLOR_BLUE, curses.COLOR_BLACK)    # Info
         curses.init_pair(6, curses.COLOR_CYAN, curses.COLOR_BLACK)    # Special
         curses.init_pair(7, curses.COLOR_MAGENTA, curses.COLOR_BLACK) # Faction
+        
+        # Retained frame state: draw calls are collected per screen row and
+        # only rows whose contents differ from what is on screen get repainted
+        self.frame: Dict[int, List[Tuple[int, Any, int]]] = defaultdict(list)
+        self.shown: Dict[int, List[Tuple[int, Any, int]]] = {}
     
     def clear(self):
         """Clear the screen"""
         self.stdscr.clear()
         self.stdscr.refresh()
     
-    def draw_box(self, y, x, height, width):
-        """Draw a box at the specified position"""
+    def invalidate(self):
+        """Forget what is on screen, e.g. after a resize, forcing a full repaint"""
+        self.height, self.width = self.stdscr.getmaxyx()
+        self.shown = {}
+        self.clear()
+    
+    def begin_frame(self):
+        """Start collecting draw calls for a new frame"""
+        self.frame = defaultdict(list)
+    
+    def end_frame(self):
+        """Repaint the rows that changed since the last frame and flush once"""
+        for y in sorted(set(self.frame) | set(self.shown)):
+            ops = self.frame.get(y, [])
+            if self.shown.get(y) == ops:
+                continue
+            try:
+                self.stdscr.move(y, 0)
+                self.stdscr.clrtoeol()
+            except curses.error:
+                continue  # Row is outside the screen
+            for x, content, color_pair in ops:
+                self.paint(y, x, content, color_pair)
+        
+        self.shown = {y: ops for y, ops in self.frame.items() if ops}
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+    
+    def paint(self, y, x, content, color_pair):
+        """Write a single recorded draw call to the screen"""
         try:
-            self.stdscr.addch(y, x, curses.ACS_ULCORNER)
-            self.stdscr.addch(y, x + width - 1, curses.ACS_URCORNER)
-            self.stdscr.addch(y + height - 1, x, curses.ACS_LLCORNER)
-            self.stdscr.addch(y + height - 1, x + width - 1, curses.ACS_LRCORNER)
-            
-            for i in range(1, width - 1):
-                self.stdscr.addch(y, x + i, curses.ACS_HLINE)
-                self.stdscr.addch(y + height - 1, x + i, curses.ACS_HLINE)
-            
-            for i in range(1, height - 1):
-                self.stdscr.addch(y + i, x, curses.ACS_VLINE)
-                self.stdscr.addch(y + i, x + width - 1, curses.ACS_VLINE)
+            if isinstance(content, str):
+                self.stdscr.addstr(y, x, content, curses.color_pair(color_pair))
+            else:
+                self.stdscr.addch(y, x, content)
         except curses.error:
             pass  # Ignore errors when drawing outside the screen
     
+    def draw_box(self, y, x, height, width):
+        """Draw a box at the specified position"""
+        self.frame[y].append((x, curses.ACS_ULCORNER, 1))
+        self.frame[y].append((x + width - 1, curses.ACS_URCORNER, 1))
+        self.frame[y + height - 1].append((x, curses.ACS_LLCORNER, 1))
+        self.frame[y + height - 1].append((x + width - 1, curses.ACS_LRCORNER, 1))
+        
+        for i in range(1, width - 1):
+            self.frame[y].append((x + i, curses.ACS_HLINE, 1))
+            self.frame[y + height - 1].append((x + i, curses.ACS_HLINE, 1))
+        
+        for i in range(1, height - 1):
+            self.frame[y + i].append((x, curses.ACS_VLINE, 1))
+            self.frame[y + i].append((x + width - 1, curses.ACS_VLINE, 1))
+    
     def draw_text(self, y, x, text, color_pair=1):
         """Draw text at the specified position"""
-        try:
-            self.stdscr.addstr(y, x, text, curses.color_pair(color_pair))
-        except curses.error:
-            pass  # Ignore errors when drawing outside the screen
+        # Clip to the row so text never wraps into rows owned by other panels
+        self.frame[y].append((x, text[:max(0, self.width - x)], color_pair))
     
     def draw_ascii_art(self, y, x, art_key, color_pair=6):
         """Draw ASCII art at the specified position"""
-        if art_key in ASCII_ARTS:
-            art_lines = ASCII_ARTS[art_key].strip().split('\n')
+        arts = builtin_ascii_arts()
+        if art_key in arts:
+            art_lines = arts[art_key].strip().split('\n')
             for i, line in enumerate(art_lines):
                 self.draw_text(y + i, x, line, color_pair)
     
@@ -1510,9 +2033,10 @@ class UIRenderer:
         self.draw_text(12, 2, "M: Map", 1)
         self.draw_text(13, 2, "Q: Quest Log", 1)
         self.draw_text(14, 2, "F: Factions", 1)
-        self.draw_text(15, 2, "H: Help", 1)
-        self.draw_text(16, 2, "ESC: Pause Game", 1)
-        self.draw_text(17, 2, "X: Quit Game", 1)
+        self.draw_text(15, 2, "L: Launder Money", 1)
+        self.draw_text(16, 2, "H: Help", 1)
+        self.draw_text(17, 2, "ESC: Pause Game", 1)
+        self.draw_text(18, 2, "X: Quit Game", 1)
     
     def draw_dialogue(self, npc, options):
         """Draw dialogue interface"""
@@ -1536,6 +2060,712 @@ class UIRenderer:
         return self.stdscr.getch()
 
 
+# ============================================================================
+# SPATIAL INDEX
+# ============================================================================
+
+class LocationIndex:
+    """Location to NPC/item index, maintained incrementally as things move"""
+    
+    def __init__(self):
+        self.npcs_by_location: Dict[str, Dict[str, NPC]] = defaultdict(dict)
+        self.items_by_location: Dict[str, List[Item]] = defaultdict(list)
+    
+    def add_npc(self, npc: NPC):
+        """Register an NPC at its current location"""
+        self.npcs_by_location[npc.location][npc.name] = npc
+    
+    def remove_npc(self, npc: NPC):
+        """Drop an NPC from the index"""
+        residents = self.npcs_by_location.get(npc.location)
+        if residents:
+            residents.pop(npc.name, None)
+    
+    def move_npc(self, npc: NPC, new_location: str):
+        """Move an NPC, keeping the index and NPC.location in step"""
+        self.remove_npc(npc)
+        npc.location = new_location
+        self.add_npc(npc)
+    
+    def add_item(self, location_name: str, item: Item):
+        """Register an item lying at a location"""
+        self.items_by_location[location_name].append(item)
+    
+    def remove_item(self, location_name: str, item_name: str) -> Optional[Item]:
+        """Remove the first item with the given name from a location"""
+        items = self.items_by_location.get(location_name, [])
+        for i, item in enumerate(items):
+            if item.name == item_name:
+                return items.pop(i)
+        return None
+    
+    def npcs_at(self, location_name: str) -> List[NPC]:
+        """NPCs currently at a location"""
+        return list(self.npcs_by_location.get(location_name, {}).values())
+    
+    def items_at(self, location_name: str) -> List[Item]:
+        """Items currently lying at a location"""
+        return list(self.items_by_location.get(location_name, []))
+
+
+# ============================================================================
+# ROUTE PLANNER
+# ============================================================================
+
+TRAVEL_MINUTES_PER_HOP = 60  # move_player advances the clock an hour per hop
+
+
+class RoutePlanner:
+    """Cached shortest routes over the location graph
+    
+    Connections are walkable both ways and restricted locations are never
+    entered. The first query from a location runs one BFS that fills that
+    location's row of predecessors for every destination; later queries just
+    walk predecessors back from the destination, so a route costs O(path
+    length). Any change to connections or
+    access must call invalidate().
+    """
+    
+    def __init__(self, locations: MutableMapping[str, Location], minutes_per_hop: int = TRAVEL_MINUTES_PER_HOP):
+        self.locations = locations
+        self.minutes_per_hop = minutes_per_hop
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drop every cached route; the graph is rebuilt on the next query"""
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.neighbours: List[List[int]] = []
+        self.parents: Dict[int, List[int]] = {}  # source id: previous location id per destination (-1 unreachable)
+        self.hops: Dict[int, List[int]] = {}  # source id: hop count per destination (-1 unreachable)
+        self.built = False
+    
+    def _build(self):
+        """Index locations and collect undirected, access-aware adjacency"""
+        self.names = list(self.locations.keys())
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        adjacency = [set() for _ in self.names]
+        for name in self.names:
+            for other in self.locations[name].connected_locations:
+                if other in self.ids:
+                    adjacency[self.ids[name]].add(self.ids[other])
+                    adjacency[self.ids[other]].add(self.ids[name])
+        self.neighbours = [
+            sorted(n for n in adjacent if not self.locations[self.names[n]].restricted_access)
+            for adjacent in adjacency
+        ]
+        self.built = True
+    
+    def _row(self, source: int) -> Tuple[List[int], List[int]]:
+        """BFS from one location, caching its predecessors and distances"""
+        if source not in self.parents:
+            parents = [-1] * len(self.names)
+            hops = [-1] * len(self.names)
+            hops[source] = 0
+            frontier = [source]
+            while frontier:
+                following = []
+                for node in frontier:
+                    for neighbour in self.neighbours[node]:
+                        if hops[neighbour] < 0:
+                            hops[neighbour] = hops[node] + 1
+                            parents[neighbour] = node
+                            following.append(neighbour)
+                frontier = following
+            self.parents[source] = parents
+            self.hops[source] = hops
+        return self.parents[source], self.hops[source]
+    
+    def distance(self, start: str, destination: str) -> Optional[int]:
+        """Number of hops between two locations, or None if unreachable"""
+        if not self.built:
+            self._build()
+        if start not in self.ids or destination not in self.ids:
+            return None
+        hops = self._row(self.ids[start])[1][self.ids[destination]]
+        return hops if hops >= 0 else None
+    
+    def route(self, start: str, destination: str) -> Optional[Tuple[List[str], int]]:
+        """Locations to walk through (excluding start) and total travel minutes"""
+        if self.distance(start, destination) is None:
+            return None
+        source = self.ids[start]
+        parents = self._row(source)[0]
+        path = []
+        current = self.ids[destination]
+        while current != source:
+            path.append(self.names[current])
+            current = parents[current]
+        path.reverse()
+        return path, len(path) * self.minutes_per_hop
+    
+    def reachable(self, start: str) -> List[Tuple[str, int]]:
+        """Every other location reachable from start, with its hop count, nearest first"""
+        if self.distance(start, start) is None:
+            return []
+        hops = self._row(self.ids[start])[1]
+        return sorted(((self.names[i], h) for i, h in enumerate(hops) if h > 0), key=lambda entry: (entry[1], entry[0]))
+
+
+# ============================================================================
+# NPC POPULATION
+# ============================================================================
+
+NPC_NEEDS = ("hunger", "rest", "social")
+
+# Needs grow every hour and are met by spending time in the right kind of place
+NPC_NEED_GROWTH = {"hunger": 4.0, "rest": 3.0, "social": 2.0}
+NPC_NEED_SATISFIERS = {
+    LocationType.MESS_HALL: "hunger",
+    LocationType.KITCHEN: "hunger",
+    LocationType.CELL_BLOCK: "rest",
+    LocationType.YARD: "social",
+    LocationType.CHAPEL: "social",
+}
+
+NPC_MOODS = list(MoodState)
+
+
+class NPCPopulation:
+    """Column-oriented NPC state, ticked for every NPC in one batched operation
+    
+    Each NPC is a row; trust, respect, fear, faction, location, needs and mood
+    are columns. With NumPy installed the columns are arrays and a tick is a
+    handful of vector operations; without it the same rules run as a loop.
+    NPCs offering services stay at their posts, everyone else wanders.
+    """
+    
+    def __init__(self, npcs: List[NPC], locations: List[Location],
+                 move_chance: float = 0.1, drift_rate: float = 0.02, seed: Optional[int] = None):
+        self.move_chance = move_chance  # per NPC per hour
+        self.drift_rate = drift_rate    # fraction of the distance to neutral lost per hour
+        load_numpy()
+        self.rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+        
+        # Location tables; the extra last slot is a sentinel for unknown locations
+        self.location_names = [location.name for location in locations]
+        self.location_ids = {name: i for i, name in enumerate(self.location_names)}
+        self.sentinel = len(self.location_names)
+        self.neighbours = [
+            [self.location_ids[name] for name in location.connected_locations
+             if name in self.location_ids and not locations[self.location_ids[name]].restricted_access]
+            for location in locations
+        ] + [[]]
+        self.satisfies = [
+            [NPC_NEED_SATISFIERS.get(location.location_type) == need for need in NPC_NEEDS]
+            for location in locations
+        ] + [[False] * len(NPC_NEEDS)]
+        self.factions = [None] + list(Faction)
+        
+        self.names: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.columns: Dict[str, Any] = {}
+        if np is not None:
+            degree = [len(n) for n in self.neighbours]
+            self.degree = np.array(degree, dtype=np.int64)
+            self.neighbour_table = np.zeros((len(self.neighbours), max(degree + [1])), dtype=np.int64)
+            for i, ids in enumerate(self.neighbours):
+                self.neighbour_table[i, :len(ids)] = ids
+            self.satisfies_table = np.array(self.satisfies, dtype=bool)
+            self.need_growth = np.array([NPC_NEED_GROWTH[need] for need in NPC_NEEDS])
+        self.add(npcs)
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def add(self, npcs: List[NPC]):
+        """Append NPCs as new rows"""
+        rows = {
+            "trust": [float(npc.relationship_traits.get("trust", 50)) for npc in npcs],
+            "respect": [float(npc.relationship_traits.get("respect", 50)) for npc in npcs],
+            "fear": [float(npc.relationship_traits.get("fear", 0)) for npc in npcs],
+            "faction": [self.factions.index(npc.faction) for npc in npcs],
+            "location": [self.location_ids.get(npc.location, self.sentinel) for npc in npcs],
+            "mobile": [not npc.services for npc in npcs],
+            "needs": [[0.0] * len(NPC_NEEDS) for _ in npcs],
+            "mood": [NPC_MOODS.index(MoodState.NEUTRAL)] * len(npcs),
+        }
+        for npc in npcs:
+            self.rows[npc.name] = len(self.names)
+            self.names.append(npc.name)
+        
+        for column, values in rows.items():
+            if np is None:
+                self.columns.setdefault(column, []).extend(values)
+            elif column in self.columns:
+                self.columns[column] = np.concatenate([self.columns[column], np.array(values, dtype=self.columns[column].dtype)])
+            else:
+                self.columns[column] = np.array(values).reshape((len(npcs), len(NPC_NEEDS)) if column == "needs" else -1)
+    
+    def tick(self, hours: int = 1) -> List[Tuple[str, str]]:
+        """Advance every NPC by some hours and return the (name, location) of those who moved"""
+        if hours <= 0 or not self.names:
+            return []
+        if np is not None:
+            moved = self._tick_vectorised(hours)
+        else:
+            moved = self._tick_rows(hours)
+        locations = self.columns["location"]
+        return [(self.names[row], self.location_names[locations[row]]) for row in moved]
+    
+    def _tick_vectorised(self, hours: int) -> List[int]:
+        """Batched tick over NumPy columns"""
+        c = self.columns
+        keep = (1 - self.drift_rate) ** hours
+        c["trust"] = 50 + (c["trust"] - 50) * keep
+        c["respect"] = 50 + (c["respect"] - 50) * keep
+        c["fear"] = c["fear"] * keep
+        c["needs"] = np.minimum(100.0, c["needs"] + self.need_growth * hours)
+        
+        # Wander one hop to a random neighbour
+        move_chance = 1 - (1 - self.move_chance) ** hours
+        movers = c["mobile"] & (self.degree[c["location"]] > 0) & (self.rng.random(len(self)) < move_chance)
+        moved = np.nonzero(movers)[0]
+        here = c["location"][moved]
+        picks = (self.rng.random(len(moved)) * self.degree[here]).astype(np.int64)
+        c["location"][moved] = self.neighbour_table[here, picks]
+        
+        # Needs met where each NPC now stands
+        c["needs"][self.satisfies_table[c["location"]]] = 0.0
+        
+        needs = c["needs"]
+        c["mood"] = np.select(
+            [c["fear"] > 70, needs[:, NPC_NEEDS.index("rest")] > 80, needs.max(axis=1) > 60,
+             c["trust"] < 25, (c["trust"] > 70) & (needs.max(axis=1) < 30)],
+            [NPC_MOODS.index(mood) for mood in (MoodState.DISTRESSED, MoodState.EXHAUSTED, MoodState.ANXIOUS,
+                                                 MoodState.DESPONDENT, MoodState.OPTIMISTIC)],
+            NPC_MOODS.index(MoodState.NEUTRAL)
+        )
+        return moved.tolist()
+    
+    def _tick_rows(self, hours: int) -> List[int]:
+        """Row-by-row tick with the same rules, for when NumPy is unavailable"""
+        c = self.columns
+        keep = (1 - self.drift_rate) ** hours
+        move_chance = 1 - (1 - self.move_chance) ** hours
+        moved = []
+        for row in range(len(self)):
+            c["trust"][row] = 50 + (c["trust"][row] - 50) * keep
+            c["respect"][row] = 50 + (c["respect"][row] - 50) * keep
+            c["fear"][row] *= keep
+            needs = [min(100.0, value + NPC_NEED_GROWTH[need] * hours) for need, value in zip(NPC_NEEDS, c["needs"][row])]
+            
+            neighbours = self.neighbours[c["location"][row]]
+            if c["mobile"][row] and neighbours and self.rng.random() < move_chance:
+                c["location"][row] = self.rng.choice(neighbours)
+                moved.append(row)
+            
+            satisfied = self.satisfies[c["location"][row]]
+            needs = [0.0 if met else value for met, value in zip(satisfied, needs)]
+            c["needs"][row] = needs
+            
+            if c["fear"][row] > 70:
+                mood = MoodState.DISTRESSED
+            elif needs[NPC_NEEDS.index("rest")] > 80:
+                mood = MoodState.EXHAUSTED
+            elif max(needs) > 60:
+                mood = MoodState.ANXIOUS
+            elif c["trust"][row] < 25:
+                mood = MoodState.DESPONDENT
+            elif c["trust"][row] > 70 and max(needs) < 30:
+                mood = MoodState.OPTIMISTIC
+            else:
+                mood = MoodState.NEUTRAL
+            c["mood"][row] = NPC_MOODS.index(mood)
+        return moved
+    
+    def traits(self, name: str) -> Dict[str, int]:
+        """Current trust/respect/fear for an NPC"""
+        row = self.rows[name]
+        return {trait: int(round(float(self.columns[trait][row]))) for trait in ("trust", "respect", "fear")}
+    
+    def mood(self, name: str) -> MoodState:
+        """Current mood of an NPC"""
+        return NPC_MOODS[int(self.columns["mood"][self.rows[name]])]
+    
+    def needs(self, name: str) -> Dict[str, float]:
+        """Current needs of an NPC"""
+        return dict(zip(NPC_NEEDS, (float(v) for v in self.columns["needs"][self.rows[name]])))
+    
+    def sync_npc(self, npc: NPC):
+        """Copy an NPC's population row back onto its dataclass"""
+        npc.relationship_traits.update(self.traits(npc.name))
+
+
+# ============================================================================
+# QUEST ENGINE
+# ============================================================================
+
+class GameEvent(Enum):
+    """Things that happen in the world which quests can react to"""
+    MOVED = auto()          # target: location name
+    TALKED = auto()         # target: NPC name
+    ITEM_ACQUIRED = auto()  # target: item name
+    DAY_ELAPSED = auto()    # days: days served so far
+    FIGHT_WON = auto()      # target: opponent name
+
+
+class GameEventBus:
+    """Publish/subscribe hub for typed game events"""
+    
+    def __init__(self):
+        self.subscribers: Dict[GameEvent, List[Callable[..., None]]] = defaultdict(list)
+    
+    def subscribe(self, event: GameEvent, handler: Callable[..., None]):
+        """Call handler(**data) whenever the event is published"""
+        self.subscribers[event].append(handler)
+    
+    def unsubscribe(self, event: GameEvent, handler: Callable[..., None]):
+        """Stop calling a handler"""
+        if handler in self.subscribers[event]:
+            self.subscribers[event].remove(handler)
+    
+    def publish(self, event: GameEvent, **data):
+        """Deliver an event to its subscribers"""
+        for handler in list(self.subscribers[event]):
+            handler(**data)
+
+
+# Objective text patterns and the event that completes them. Objectives that
+# match none of these have no game system behind them yet and stay open.
+QUEST_OBJECTIVE_PATTERNS = [
+    (re.compile(r"^(?:visit|explore|go to|check) (?:the )?(?P<target>.+)$", re.I), GameEvent.MOVED),
+    (re.compile(r"^(?:speak|talk) (?:with|to) (?P<target>.+)$", re.I), GameEvent.TALKED),
+    (re.compile(r"^(?:find|obtain|acquire|collect|get) (?:an? |the |some )?(?P<target>.+)$", re.I), GameEvent.ITEM_ACQUIRED),
+    (re.compile(r"^win (?:a|an|the) fight(?: against (?P<target>.+))?$", re.I), GameEvent.FIGHT_WON),
+    (re.compile(r"^(?:avoid|survive) ", re.I), GameEvent.DAY_ELAPSED),
+]
+
+
+@dataclass
+class ObjectiveTrigger:
+    """Compiled quest objective: the event and target that complete it"""
+    quest_id: str
+    index: int
+    event: GameEvent
+    target: Optional[str] = None  # lower-cased; None matches any target
+    days: int = 0  # for DAY_ELAPSED, days served relative to when the quest started
+
+
+def compile_objective(quest_id: str, index: int, objective: str, days_served: int = 0) -> Optional[ObjectiveTrigger]:
+    """Turn objective text into a trigger, or None if no event can complete it"""
+    for pattern, event in QUEST_OBJECTIVE_PATTERNS:
+        match = pattern.match(objective.strip())
+        if not match:
+            continue
+        if event == GameEvent.DAY_ELAPSED:
+            return ObjectiveTrigger(quest_id, index, event, days=days_served + 1)
+        target = match.groupdict().get("target")
+        return ObjectiveTrigger(quest_id, index, event, target.lower() if target else None)
+    return None
+
+
+class QuestEngine:
+    """Event-driven quest tracking
+    
+    Starting a quest compiles its objectives into triggers indexed by event
+    and target. Published events look up only the triggers waiting on that
+    exact event and target, so quest bookkeeping costs nothing per frame and
+    scales with the events that matter rather than the number of quests.
+    """
+    
+    def __init__(self, engine: "GameEngine", bus: GameEventBus):
+        self.engine = engine
+        self.bus = bus
+        self.triggers: Dict[GameEvent, Dict[Optional[str], List[ObjectiveTrigger]]] = defaultdict(lambda: defaultdict(list))
+        self.by_quest: Dict[str, Dict[int, ObjectiveTrigger]] = defaultdict(dict)  # quest id: objective index: trigger
+        self.progress: Dict[str, set] = {}  # quest id: completed objective indexes
+        for event in GameEvent:
+            bus.subscribe(event, partial(self.handle, event))
+    
+    def start(self, quest_id: str) -> bool:
+        """Activate a quest and start listening for its objectives"""
+        quest = self.engine.quests.get(quest_id)
+        player = self.engine.player
+        if not quest or not player or quest.status in ("active", "completed"):
+            return False
+        
+        quest.status = "active"
+        if quest_id not in player.active_quests:
+            player.active_quests.append(quest_id)
+        self.progress[quest_id] = set()
+        for index, objective in enumerate(quest.objectives):
+            trigger = compile_objective(quest_id, index, objective, player.days_served)
+            if trigger:
+                self.triggers[trigger.event][trigger.target].append(trigger)
+                self.by_quest[quest_id][index] = trigger
+        return True
+    
+    def handle(self, event: GameEvent, target: Optional[str] = None, days: int = 0, **data):
+        """Complete the objectives an event satisfies"""
+        waiting = self.triggers.get(event)
+        if not waiting:
+            return
+        candidates = list(waiting.get(None, ()))
+        if target is not None:
+            candidates += waiting.get(target.lower(), ())
+        for trigger in candidates:
+            if event == GameEvent.DAY_ELAPSED and days < trigger.days:
+                continue
+            self.complete_objective(trigger.quest_id, trigger.index)
+    
+    def complete_objective(self, quest_id: str, index: int):
+        """Mark one objective done, finishing the quest once all are done"""
+        quest = self.engine.quests.get(quest_id)
+        if not quest or quest.status != "active":
+            return
+        
+        done = self.progress.setdefault(quest_id, set())
+        done.add(index)
+        self._drop_trigger(quest_id, index)
+        if len(done) >= len(quest.objectives):
+            self.finish(quest_id)
+    
+    def finish(self, quest_id: str):
+        """Complete a quest and award its rewards"""
+        quest = self.engine.quests[quest_id]
+        player = self.engine.player
+        quest.status = "completed"
+        for index in list(self.by_quest.get(quest_id, ())):
+            self._drop_trigger(quest_id, index)
+        self.by_quest.pop(quest_id, None)
+        if quest_id in player.active_quests:
+            player.active_quests.remove(quest_id)
+        player.completed_quests.append(quest_id)
+        # Award rewards
+        player.experience += quest.rewards.get("experience", 0)
+        player.clean_money += quest.rewards.get("clean_money", 0)
+    
+    def _drop_trigger(self, quest_id: str, index: int):
+        """Stop listening for one objective"""
+        trigger = self.by_quest.get(quest_id, {}).pop(index, None)
+        if trigger is None:
+            return
+        by_target = self.triggers[trigger.event]
+        triggers = by_target[trigger.target]
+        triggers.remove(trigger)
+        if not triggers:
+            del by_target[trigger.target]
+
+
+# ============================================================================
+# MONEY LAUNDERING
+# ============================================================================
+
+LAUNDERING_SAMPLES = 100_000          # simulated attempts per estimate
+LAUNDERING_REPUTATION_BUCKET = 10     # reputation points per cached estimate
+LAUNDERING_RISK_TOLERANCE = 50        # risk tolerance used by the laundering menu
+LAUNDERING_FAILURE_PENALTY = 0.3      # share of the money lost when a scheme falls through
+LAUNDERING_MAX_SKIM = 0.1             # share of the return middlemen may keep
+LAUNDERING_RISK_BUDGET = 0.1          # advisor default: share of capital you accept having seized on average
+LAUNDERING_RISK_STEPS = 100           # resolution of the risk budget in the advisor
+LAUNDERING_CAPITAL_STEPS = 500        # most capital units the advisor's table may span
+
+
+def resolve_laundering(operation: MoneyLaunderingOperation, amount: float, reputation: float,
+                       risk_tolerance: float, success_roll, skim_roll, bust_roll):
+    """Outcome of laundering attempts given their uniform random rolls
+    
+    Written without branches so the same rules work on single rolls and on
+    NumPy arrays of rolls. Returns (success, busted, clean return, loss,
+    reputation change).
+    """
+    chance = operation.success_chance + (reputation - operation.underground_rep_required) / 200 \
+        + (risk_tolerance - LAUNDERING_RISK_TOLERANCE) / 400
+    chance = min(0.95, max(0.05, chance))
+    rate = operation.clean_money_return / operation.capital_required
+    
+    success = success_roll < chance
+    busted = (1 - success) * (bust_roll < operation.risk_level)
+    fell_through = 1 - success - busted
+    clean = success * amount * rate * (1 - LAUNDERING_MAX_SKIM * skim_roll)
+    loss = success * (amount - clean) + busted * amount + fell_through * amount * LAUNDERING_FAILURE_PENALTY
+    reputation_change = success * 5 - busted * 20 - fell_through * 10
+    return success, busted, clean, loss, reputation_change
+
+
+@dataclass
+class LaunderingEstimate:
+    """Simulated outcome of running a laundering operation once"""
+    operation: str
+    reputation: int  # bottom of the reputation bucket simulated
+    samples: int
+    success_rate: float
+    bust_rate: float
+    expected_clean: float
+    expected_loss: float
+    loss_percentiles: Dict[int, float]  # percentile: dirty money lost
+    expected_reputation_change: float
+
+
+class LaunderingEstimator:
+    """Monte Carlo odds for the laundering operations, cached per reputation bucket
+    
+    Every attempt in an estimate is simulated in one batch of NumPy arrays
+    (or a plain loop without NumPy). Reputation is bucketed so the laundering
+    menu only pays for a simulation the first time a bucket is shown.
+    """
+    
+    def __init__(self, samples: int = LAUNDERING_SAMPLES, bucket_size: int = LAUNDERING_REPUTATION_BUCKET,
+                 seed: Optional[int] = None):
+        self.samples = samples
+        self.bucket_size = bucket_size
+        self.seed = seed
+        self.cache: Dict[Tuple[str, int, int], LaunderingEstimate] = {}
+    
+    def estimate(self, operation: MoneyLaunderingOperation, reputation: int,
+                 risk_tolerance: int = LAUNDERING_RISK_TOLERANCE) -> LaunderingEstimate:
+        """Estimate one run of an operation for a player with the given reputation"""
+        bucket = reputation // self.bucket_size * self.bucket_size
+        key = (operation.name, bucket, risk_tolerance)
+        if key not in self.cache:
+            self.cache[key] = self._simulate(operation, bucket, risk_tolerance)
+        return self.cache[key]
+    
+    def invalidate(self):
+        """Forget every estimate, e.g. after the operations change"""
+        self.cache.clear()
+    
+    def _simulate(self, operation: MoneyLaunderingOperation, reputation: int, risk_tolerance: int) -> LaunderingEstimate:
+        """Run the batch of simulated attempts"""
+        amount = operation.capital_required
+        percentiles = (10, 50, 90)
+        
+        if load_numpy() is not None:
+            rng = np.random.default_rng(self.seed)
+            rolls = rng.random((3, self.samples))
+            success, busted, clean, loss, change = resolve_laundering(
+                operation, amount, reputation, risk_tolerance, rolls[0], rolls[1], rolls[2])
+            change = np.clip(reputation + change, 0, 100) - reputation
+            return LaunderingEstimate(
+                operation.name, reputation, self.samples,
+                float(success.mean()), float(busted.mean()), float(clean.mean()), float(loss.mean()),
+                dict(zip(percentiles, (float(p) for p in np.percentile(loss, percentiles)))),
+                float(change.mean()),
+            )
+        
+        rng = random.Random(self.seed)
+        totals = [0.0] * 5
+        losses = []
+        for _ in range(self.samples):
+            success, busted, clean, loss, change = resolve_laundering(
+                operation, amount, reputation, risk_tolerance, rng.random(), rng.random(), rng.random())
+            change = max(0, min(100, reputation + change)) - reputation
+            for i, value in enumerate((success, busted, clean, loss, change)):
+                totals[i] += value
+            losses.append(loss)
+        losses.sort()
+        means = [total / self.samples for total in totals]
+        return LaunderingEstimate(
+            operation.name, reputation, self.samples, means[0], means[1], means[2], means[3],
+            {p: losses[min(len(losses) - 1, p * len(losses) // 100)] for p in percentiles},
+            means[4],
+        )
+
+
+@dataclass
+class LaunderingPlan:
+    """How many runs of each laundering operation to fund"""
+    runs: Dict[str, int]  # operation name: runs
+    capital: int          # dirty money committed
+    expected_clean: float
+    expected_seized: float  # dirty money lost to busts on average
+    days: int             # longest time any operation is tied up
+
+
+class LaunderingAdvisor:
+    """Splits dirty money across laundering operations to maximise the expected clean return
+    
+    A bounded knapsack over the estimator's odds: capital is the weight, the
+    expected seizure (bust rate times stake) is charged against a risk budget,
+    and each operation can only be run back to back as often as the time
+    horizon allows. Plans are memoised per (capital, reputation bucket,
+    operations, risk budget, horizon), so browsing the menu costs nothing.
+    
+    Capital is counted in units of the operations' common divisor, coarsened
+    so the table never spans more than LAUNDERING_CAPITAL_STEPS units. Stakes
+    are rounded up to whole units, so a coarse plan never overspends.
+    """
+    
+    def __init__(self, estimator: LaunderingEstimator):
+        self.estimator = estimator
+        self.cache: Dict[Tuple[Any, ...], LaunderingPlan] = {}
+    
+    def advise(self, capital: int, reputation: int, operations: List[MoneyLaunderingOperation],
+               risk_budget: float, horizon_days: int) -> LaunderingPlan:
+        """Best plan for the money, reputation and time available"""
+        usable = sorted((op for op in operations
+                         if op.underground_rep_required <= reputation and op.capital_required > 0),
+                        key=lambda op: op.name)
+        bucket = reputation // self.estimator.bucket_size
+        key = (capital, bucket, tuple(op.name for op in usable), risk_budget, horizon_days)
+        if key not in self.cache:
+            self.cache[key] = self._solve(capital, reputation, usable, risk_budget, horizon_days)
+        return self.cache[key]
+    
+    def _solve(self, capital: int, reputation: int, operations: List[MoneyLaunderingOperation],
+               risk_budget: float, horizon_days: int) -> LaunderingPlan:
+        """Bounded knapsack over (capital units, risk units)"""
+        unit = 0
+        for op in operations:
+            unit = math.gcd(unit, op.capital_required)
+        if unit:
+            coarse = -(-capital // LAUNDERING_CAPITAL_STEPS)
+            unit *= max(1, -(-coarse // unit))
+        risk_unit = max(risk_budget, 1) / LAUNDERING_RISK_STEPS
+        risk_capacity = int(risk_budget / risk_unit) if risk_budget > 0 else 0
+        
+        # Split each operation's run limit into power-of-two bundles, turning the
+        # bounded knapsack into a 0/1 knapsack over O(log runs) bundles per operation
+        bundles = []  # (operation index, runs, capital units, risk units, expected clean)
+        for index, op in enumerate(operations):
+            odds = self.estimator.estimate(op, reputation)
+            weight = -(-op.capital_required // unit)
+            risk = math.ceil(odds.bust_rate * op.capital_required / risk_unit - 1e-9)
+            limit = min(horizon_days // max(1, op.time_required), capital // op.capital_required)
+            size = 1
+            while limit > 0:
+                runs = min(size, limit)
+                bundles.append((index, runs, runs * weight, runs * risk, runs * odds.expected_clean))
+                limit -= runs
+                size *= 2
+        capacity = min(capital // unit if unit else 0, sum(bundle[2] for bundle in bundles))
+        
+        # best[c][r]: highest expected clean return using at most c capital units and r risk units.
+        # One bit per (bundle, c, r) cell records whether the bundle improved it, for reconstruction.
+        best = [[0.0] * (risk_capacity + 1) for _ in range(capacity + 1)]
+        cells = (capacity + 1) * (risk_capacity + 1)
+        taken = bytearray((len(bundles) * cells + 7) // 8)
+        for number, (_, _, weight, risk, value) in enumerate(bundles):
+            for c in range(capacity, weight - 1, -1):
+                row, source = best[c], best[c - weight]
+                base = number * cells + c * (risk_capacity + 1)
+                for r in range(risk_capacity, risk - 1, -1):
+                    candidate = source[r - risk] + value
+                    if candidate > row[r]:
+                        row[r] = candidate
+                        taken[(base + r) >> 3] |= 1 << ((base + r) & 7)
+        
+        runs: Dict[str, int] = defaultdict(int)
+        c, r = capacity, risk_capacity
+        for number in range(len(bundles) - 1, -1, -1):
+            index, count, weight, risk, _ = bundles[number]
+            bit = number * cells + c * (risk_capacity + 1) + r
+            if taken[bit >> 3] >> (bit & 7) & 1:
+                runs[operations[index].name] += count
+                c -= weight
+                r -= risk
+        
+        chosen_ops = [(op, runs[op.name]) for op in operations if runs.get(op.name)]
+        return LaunderingPlan(
+            dict(runs),
+            sum(op.capital_required * count for op, count in chosen_ops),
+            best[capacity][risk_capacity],
+            sum(self.estimator.estimate(op, reputation).bust_rate * op.capital_required * count for op, count in chosen_ops),
+            max((op.time_required * count for op, count in chosen_ops), default=0),
+        )
+
+
 # ============================================================================
 # GAME ENGINE
 # ============================================================================
@@ -1543,12 +2773,23 @@ class UIRenderer:
 class GameEngine:
     """Main game engine"""
     
-    def __init__(self):
+    def __init__(self, content: Optional[Dict[str, MutableMapping]] = None, seed: Optional[int] = None):
         self.player = None
-        self.locations = {loc.name: loc for loc in LOCATIONS}
-        self.npcs = {npc.name: npc for npc in NPCS}
-        self.items = {item.name: item for item in ITEMS}
-        self.quests = {quest.id: quest for quest in QUESTS}
+        self.random = RandomStreams(seed)
+        self.content = content if content is not None else load_content()
+        self.locations = self.content["locations"]
+        self.npcs = self.content["npcs"]
+        self.items = self.content["items"]
+        self.quests = self.content["quests"]
+        self.location_index = self.build_location_index()
+        self.routes = RoutePlanner(self.locations)
+        self._population: Optional[NPCPopulation] = None
+        self.travel_minutes = 0  # walking time not yet added to the hourly clock
+        self.events = GameEventBus()
+        self.quest_engine = QuestEngine(self, self.events)
+        self.laundering = LaunderingEstimator(seed=self.random.derive("laundering_odds"))
+        self.laundering_advisor = LaunderingAdvisor(self.laundering)
+        self.laundering_result: Optional[str] = None
         self.ui_renderer = None
         self.game_state = GameState.MAIN_MENU
         self.current_menu_selection = 0
@@ -1588,28 +2829,82 @@ class GameEngine:
                 Skill.CHEMISTRY: 6
             },
             inventory=[],
-            location="Cell Block C"
+            location="Cell Block C",
+            rng=self.random.get("player"),
+            weather_rng=self.random.get("weather")
         )
     
+    @property
+    def population(self) -> NPCPopulation:
+        """The NPC population layer, built the first time the world ticks"""
+        if self._population is None:
+            self._population = NPCPopulation(list(self.npcs.values()), list(self.locations.values()),
+                                             seed=self.random.derive("population"))
+        return self._population
+    
+    def build_location_index(self) -> LocationIndex:
+        """Index every NPC and item by the location it is in"""
+        index = LocationIndex()
+        for npc in self.npcs.values():
+            index.add_npc(npc)
+        for location in self.locations.values():
+            for item_name in location.items:
+                if item_name in self.items:
+                    index.add_item(location.name, self.items[item_name])
+        return index
+    
     def get_items_in_location(self, location_name: str) -> List[Item]:
         """Get items present in a location"""
-        location = self.locations.get(location_name)
-        if not location:
-            return []
-        
-        items = []
-        for item_name in location.items:
-            if item_name in self.items:
-                items.append(self.items[item_name])
-        return items
+        return self.location_index.items_at(location_name)
     
     def get_npcs_in_location(self, location_name: str) -> List[NPC]:
         """Get NPCs present in a location"""
-        npcs = []
-        for npc in self.npcs.values():
-            if npc.location == location_name:
-                npcs.append(npc)
-        return npcs
+        return self.location_index.npcs_at(location_name)
+    
+    def spawn_inmates(self, count: int) -> List[NPC]:
+        """Fill the prison with generic inmates on top of the named NPCs"""
+        open_locations = [loc.name for loc in self.locations.values() if not loc.restricted_access]
+        gangs = [Faction.REBELS_MC, Faction.HELLS_ANGELS, Faction.COMANCHEROS, Faction.VIKINGS_OMCG,
+                 Faction.BLACK_UHLANS, Faction.WHITE_POWER, Faction.ISLAMIC_GROUP,
+                 Faction.ABORIGINAL_ALLIANCE, None]
+        
+        rng = self.random.get("inmates")
+        inmates = []
+        for _ in range(count):
+            npc = NPC(
+                name=f"Inmate #{len(self.npcs) + 1:04d}",
+                description="One of Yatala's many inmates.",
+                personality="Keeps their head down and their business private.",
+                dialogue={"default": "What are you looking at?"},
+                faction=rng.choice(gangs),
+                location=rng.choice(open_locations)
+            )
+            self.npcs[npc.name] = npc
+            self.location_index.add_npc(npc)
+            inmates.append(npc)
+        
+        self.population.add(inmates)
+        return inmates
+    
+    def advance_time(self, hours: int = 1):
+        """Advance the clock for the player and the whole NPC population"""
+        days_served = self.player.days_served
+        self.player.advance_time(hours)
+        for npc_name, location_name in self.population.tick(hours):
+            self.location_index.move_npc(self.npcs[npc_name], location_name)
+        if self.player.days_served > days_served:
+            self.events.publish(GameEvent.DAY_ELAPSED, days=self.player.days_served)
+    
+    def move_npc(self, npc_name: str, location_name: str) -> bool:
+        """Move an NPC to another location"""
+        npc = self.npcs.get(npc_name)
+        if not npc or location_name not in self.locations:
+            return False
+        self.location_index.move_npc(npc, location_name)
+        if npc_name in self.population.rows and location_name in self.population.location_ids:
+            row = self.population.rows[npc_name]
+            self.population.columns["location"][row] = self.population.location_ids[location_name]
+        return True
     
     def move_player(self, direction: str):
         """Move player to a new location"""
@@ -1622,20 +2917,52 @@ class GameEngine:
         if current_location.connected_locations:
             new_location = current_location.connected_locations[0]
             self.player.location = new_location
-            self.player.advance_time(1)  # Moving takes time
+            self.advance_time(1)  # Moving takes time
+            self.events.publish(GameEvent.MOVED, target=new_location)
+    
+    def travel_to(self, destination: str) -> Optional[Tuple[List[str], int]]:
+        """Walk the shortest route to a location, returning the route and minutes taken"""
+        planned = self.routes.route(self.player.location, destination)
+        if not planned or not planned[0]:
+            return None
+        
+        path, minutes = planned
+        for location_name in path:
+            self.player.location = location_name
+            # The clock runs in whole hours, so walking time is banked until an hour is up
+            self.travel_minutes += self.routes.minutes_per_hop
+            hours, self.travel_minutes = divmod(self.travel_minutes, 60)
+            if hours:
+                self.advance_time(hours)
+            self.events.publish(GameEvent.MOVED, target=location_name)
+        return planned
+    
+    def connect_locations(self, first: str, second: str):
+        """Open a passage between two locations"""
+        if first in self.locations and second in self.locations:
+            if second not in self.locations[first].connected_locations:
+                self.locations[first].connected_locations.append(second)
+            self.routes.invalidate()
+    
+    def set_restricted_access(self, location_name: str, restricted: bool):
+        """Open or close a location to travel"""
+        if location_name in self.locations:
+            self.locations[location_name].restricted_access = restricted
+            self.routes.invalidate()
     
     def pickup_item(self, item_name: str):
         """Pick up an item from the current location"""
-        items_here = self.get_items_in_location(self.player.location)
-        for item in items_here:
-            if item.name == item_name:
-                self.player.inventory.append(item)
-                # Remove item from location
-                location = self.locations.get(self.player.location)
-                if location and item_name in location.items:
-                    location.items.remove(item_name)
-                return True
-        return False
+        item = self.location_index.remove_item(self.player.location, item_name)
+        if not item:
+            return False
+        
+        self.player.inventory.append(item)
+        # Remove item from location
+        location = self.locations.get(self.player.location)
+        if location and item_name in location.items:
+            location.items.remove(item_name)
+        self.events.publish(GameEvent.ITEM_ACQUIRED, target=item_name)
+        return True
     
     def talk_to_npc(self, npc_name: str):
         """Initiate dialogue with an NPC"""
@@ -1643,9 +2970,11 @@ class GameEngine:
         if not npc or npc.location != self.player.location:
             return False
         
+        self.population.sync_npc(npc)
         self.current_npc = npc
         self.dialogue_options = list(npc.dialogue.keys())
         self.game_state = GameState.DIALOGUE
+        self.events.publish(GameEvent.TALKED, target=npc_name)
         return True
     
     def handle_dialogue(self, choice: int):
@@ -1661,72 +2990,79 @@ class GameEngine:
             return response
         return "Invalid choice."
     
-    def update_quests(self):
-        """Update quest progress based on player actions"""
-        # This is a simplified implementation
-        # In a real game, this would be much more complex
-        for quest_id, quest in self.quests.items():
-            if quest.status == "active":
-                # Check if objectives are completed
-                # For now, we'll just complete the first objective of the first quest as an example
-                if quest_id == "first_day" and self.player.days_served >= 1:
-                    quest.status = "completed"
-                    self.player.completed_quests.append(quest_id)
-                    self.player.active_quests.remove(quest_id)
-                    # Award rewards
-                    self.player.experience += quest.rewards.get("experience", 0)
-                    self.player.clean_money += quest.rewards.get("clean_money", 0)
-    
-    def run(self, stdscr):
-        """Main game loop"""
+    def run(self, stdscr, journal: Optional["InputJournal"] = None):
+        """Main game loop, recording every key when given a journal"""
         self.ui_renderer = UIRenderer(stdscr)
         
         while True:
-            self.ui_renderer.clear()
-            
-            # Draw status bar
-            if self.player:
-                self.ui_renderer.draw_status_bar(self.player)
-            
-            # Handle different game states
-            if self.game_state == GameState.MAIN_MENU:
-                self.handle_main_menu()
-            elif self.game_state == GameState.CHARACTER_CREATION:
-                self.handle_character_creation()
-            elif self.game_state == GameState.PLAYING:
-                self.handle_gameplay()
-            elif self.game_state == GameState.INVENTORY:
-                self.handle_inventory()
-            elif self.game_state == GameState.CHARACTER_SHEET:
-                self.handle_character_sheet()
-            elif self.game_state == GameState.MAP:
-                self.handle_map()
-            elif self.game_state == GameState.QUEST_LOG:
-                self.handle_quest_log()
-            elif self.game_state == GameState.RELATIONSHIPS:
-                self.handle_relationships()
-            elif self.game_state == GameState.COMBAT:
-                self.handle_combat()
-            elif self.game_state == GameState.DIALOGUE:
-                self.handle_dialogue_state()
-            elif self.game_state == GameState.TRADING:
-                self.handle_trading()
-            elif self.game_state == GameState.GAME_OVER:
-                self.handle_game_over()
-            elif self.game_state == GameState.PAUSED:
-                self.handle_pause()
+            self.draw_frame()
+            if STARTUP_PROFILER:
+                STARTUP_PROFILER.mark("first frame")
             
             # Get user input
             key = self.ui_renderer.get_input()
-            self.handle_input(key)
-            
-            # Update game state
-            if self.player:
-                self.update_quests()
-                
-                # Check for game over conditions
-                if self.player.days_served >= self.player.sentence_length:
-                    self.game_state = GameState.GAME_OVER
+            if key == curses.KEY_RESIZE:
+                self.ui_renderer.invalidate()
+                continue
+            if journal:
+                journal.add(key)
+            self.step(key)
+    
+    def show_final_frame(self, stdscr):
+        """Draw the current state once and wait for a key, e.g. after a replay"""
+        self.ui_renderer = UIRenderer(stdscr)
+        self.draw_frame()
+        self.ui_renderer.get_input()
+    
+    def draw_frame(self):
+        """Draw the screen for the current state"""
+        self.ui_renderer.begin_frame()
+        
+        # Draw status bar
+        if self.player:
+            self.ui_renderer.draw_status_bar(self.player)
+        
+        # Handle different game states
+        if self.game_state == GameState.MAIN_MENU:
+            self.handle_main_menu()
+        elif self.game_state == GameState.CHARACTER_CREATION:
+            self.handle_character_creation()
+        elif self.game_state == GameState.PLAYING:
+            self.handle_gameplay()
+        elif self.game_state == GameState.INVENTORY:
+            self.handle_inventory()
+        elif self.game_state == GameState.CHARACTER_SHEET:
+            self.handle_character_sheet()
+        elif self.game_state == GameState.MAP:
+            self.handle_map()
+        elif self.game_state == GameState.QUEST_LOG:
+            self.handle_quest_log()
+        elif self.game_state == GameState.RELATIONSHIPS:
+            self.handle_relationships()
+        elif self.game_state == GameState.COMBAT:
+            self.handle_combat()
+        elif self.game_state == GameState.DIALOGUE:
+            self.handle_dialogue_state()
+        elif self.game_state == GameState.TRADING:
+            self.handle_trading()
+        elif self.game_state == GameState.GAME_OVER:
+            self.handle_game_over()
+        elif self.game_state == GameState.PAUSED:
+            self.handle_pause()
+        elif self.game_state == GameState.LAUNDERING:
+            self.handle_laundering()
+        
+        self.ui_renderer.end_frame()
+    
+    def step(self, key: int):
+        """Apply one input and update the game state without drawing anything"""
+        self.handle_input(key)
+        
+        # Update game state
+        if self.player:
+            # Check for game over conditions
+            if self.player.days_served >= self.player.sentence_length:
+                self.game_state = GameState.GAME_OVER
     
     def handle_main_menu(self):
         """Handle main menu state"""
@@ -1760,6 +3096,12 @@ class GameEngine:
     def handle_map(self):
         """Handle map state"""
         self.ui_renderer.draw_text(5, 2, "=== PRISON MAP ===", 6)
+        
+        if self.player:
+            self.ui_renderer.draw_text(16, 2, "Travel to:", 5)
+            for i, (location_name, hops) in enumerate(self.routes.reachable(self.player.location)[:9]):
+                minutes = hops * self.routes.minutes_per_hop
+                self.ui_renderer.draw_text(17 + i, 4, f"{i + 1}. {location_name} ({minutes} min)", 1)
         # Simplified map display
         map_lines = [
             "Cell Block C --- Yard --- Chapel",
@@ -1773,6 +3115,60 @@ class GameEngine:
         for i, line in enumerate(map_lines):
             self.ui_renderer.draw_text(7 + i, 2, line, 1)
     
+    def laundering_operations(self) -> List[MoneyLaunderingOperation]:
+        """Every laundering operation in the loaded content"""
+        return list(self.content["money_laundering_operations"].values())
+    
+    def launder(self, operation: MoneyLaunderingOperation) -> Tuple[bool, str]:
+        """Put one operation's worth of dirty money through a laundering scheme"""
+        if self.player.underground_reputation < operation.underground_rep_required:
+            return False, f"You need {operation.underground_rep_required} underground reputation"
+        success, clean_return, message = self.player.launder_money(
+            operation.capital_required, LAUNDERING_RISK_TOLERANCE, operation)
+        if message != "Not enough dirty money":
+            self.advance_time(operation.time_required * 24)
+        return success, message + (f": ${clean_return} clean" if success else "")
+    
+    def laundering_advice(self, risk_budget: Optional[float] = None,
+                          horizon_days: Optional[int] = None) -> LaunderingPlan:
+        """Advisor's split of the player's dirty money, by default over the rest of the sentence"""
+        player = self.player
+        if risk_budget is None:
+            risk_budget = player.dirty_money * LAUNDERING_RISK_BUDGET
+        if horizon_days is None:
+            horizon_days = max(0, player.sentence_length - player.days_served)
+        return self.laundering_advisor.advise(player.dirty_money, player.underground_reputation,
+                                              self.laundering_operations(), risk_budget, horizon_days)
+    
+    def handle_laundering(self):
+        """Handle laundering state: each operation with its simulated odds"""
+        self.ui_renderer.draw_text(5, 2, "=== MONEY LAUNDERING ===", 6)
+        if not self.player:
+            return
+        
+        player = self.player
+        self.ui_renderer.draw_text(6, 2, f"Dirty: ${player.dirty_money}  Clean: ${player.clean_money}  "
+                                         f"Reputation: {player.underground_reputation}", 1)
+        y_pos = 8
+        for i, operation in enumerate(self.laundering_operations()[:9]):
+            odds = self.laundering.estimate(operation, player.underground_reputation)
+            self.ui_renderer.draw_text(y_pos, 2, f"{i + 1}. {operation.name} - ${operation.capital_required} "
+                                                 f"over {operation.time_required} days", 5)
+            self.ui_renderer.draw_text(y_pos + 1, 4, f"Success {odds.success_rate:.0%}, busted {odds.bust_rate:.0%}, "
+                                                     f"expect ${odds.expected_clean:.0f} clean", 1)
+            self.ui_renderer.draw_text(y_pos + 2, 4, f"Loss: median ${odds.loss_percentiles[50]:.0f}, "
+                                                     f"worst 10% ${odds.loss_percentiles[90]:.0f}; "
+                                                     f"reputation {odds.expected_reputation_change:+.1f}", 1)
+            y_pos += 4
+        advice = self.laundering_advice()
+        if advice.runs:
+            runs = ", ".join(f"{count}x {name}" for name, count in advice.runs.items())
+            self.ui_renderer.draw_text(y_pos, 2, f"Advisor: {runs} - expect ${advice.expected_clean:.0f} clean, "
+                                                 f"${advice.expected_seized:.0f} seized", 3)
+            y_pos += 2
+        if self.laundering_result:
+            self.ui_renderer.draw_text(y_pos, 2, self.laundering_result, 2)
+    
     def handle_quest_log(self):
         """Handle quest log state"""
         self.ui_renderer.draw_text(5, 2, "=== QUEST LOG ===", 6)
@@ -1851,8 +3247,12 @@ class GameEngine:
             self.handle_inventory_input(key)
         elif self.game_state == GameState.DIALOGUE:
             self.handle_dialogue_input(key)
+        elif self.game_state == GameState.MAP:
+            self.handle_map_input(key)
         elif self.game_state == GameState.GAME_OVER:
             self.handle_game_over_input(key)
+        elif self.game_state == GameState.LAUNDERING:
+            self.handle_laundering_input(key)
         # Other states would be handled similarly
     
     def handle_main_menu_input(self, key):
@@ -1885,9 +3285,7 @@ class GameEngine:
         if key == curses.KEY_ENTER or key == 10 or key == 13:  # Enter key
             self.init_player("Prisoner")
             # Start the first quest
-            if "first_day" in self.quests:
-                self.quests["first_day"].status = "active"
-                self.player.active_quests.append("first_day")
+            self.quest_engine.start("first_day")
             self.game_state = GameState.PLAYING
     
     def handle_gameplay_input(self, key):
@@ -1910,6 +3308,9 @@ class GameEngine:
             self.game_state = GameState.QUEST_LOG
         elif key == ord('f') or key == ord('F'):
             self.game_state = GameState.RELATIONSHIPS  # Using relationships for factions
+        elif key == ord('l') or key == ord('L'):
+            self.laundering_result = None
+            self.game_state = GameState.LAUNDERING
         elif key == ord('h') or key == ord('H'):
             self.game_state = GameState.PLAYING  # Help will be shown in playing state
         elif key == 27:  # ESC key
@@ -1927,6 +3328,27 @@ class GameEngine:
         if key == 27 or key == ord('i') or key == ord('I'):  # ESC or I key
             self.game_state = GameState.PLAYING
     
+    def handle_map_input(self, key):
+        """Handle map input: pick a destination to travel to"""
+        if ord('1') <= key <= ord('9'):
+            destinations = self.routes.reachable(self.player.location)
+            choice = key - ord('1')
+            if choice < len(destinations):
+                self.travel_to(destinations[choice][0])
+                self.game_state = GameState.PLAYING
+        elif key == 27 or key == ord('m') or key == ord('M'):  # ESC or M key
+            self.game_state = GameState.PLAYING
+    
+    def handle_laundering_input(self, key):
+        """Handle laundering input: pick an operation to run"""
+        if ord('1') <= key <= ord('9'):
+            operations = self.laundering_operations()
+            choice = key - ord('1')
+            if choice < len(operations):
+                _, self.laundering_result = self.launder(operations[choice])
+        elif key == 27 or key == ord('l') or key == ord('L'):  # ESC or L key
+            self.game_state = GameState.PLAYING
+    
     def handle_dialogue_input(self, key):
         """Handle dialogue input"""
         if ord('1') <= key <= ord('9'):
@@ -1941,22 +3363,200 @@ class GameEngine:
         self.current_menu_selection = 0
 
 
+# ============================================================================
+# INPUT JOURNAL
+# ============================================================================
+
+class InputJournal:
+    """Compact binary log of every key a session received
+    
+    The file is a short header holding the master seed the engine's random
+    streams started from, then one zigzag varint per key (a byte for most
+    keys). Keys are flushed as they are recorded, so a crash still leaves a
+    usable journal. The seed and the keys reproduce the session exactly.
+    """
+    
+    MAGIC = b"YLKJ"  # not the enhanced game's b"YLIJ", whose records are tagged
+    VERSION = 1
+    HEADER = struct.Struct("<4sH")
+    
+    def __init__(self, seed: int, keys: Optional[List[int]] = None):
+        self.seed = seed
+        self.keys = keys if keys is not None else []
+        self.file = None
+    
+    @staticmethod
+    def encode_varint(value: int) -> bytes:
+        """Zigzag varint, so small negative keys (curses' -1) stay short"""
+        value = value * 2 if value >= 0 else -value * 2 - 1
+        out = bytearray()
+        while value >= 0x80:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+        return bytes(out)
+    
+    @staticmethod
+    def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+        """Read a zigzag varint, returning it and the position after it"""
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        return (value >> 1) ^ -(value & 1), pos
+    
+    @classmethod
+    def record(cls, path: str, seed: int) -> "InputJournal":
+        """Start a journal file for a session"""
+        journal = cls(seed)
+        journal.file = open(path, "wb")
+        journal.file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION) + cls.encode_varint(seed))
+        journal.file.flush()
+        return journal
+    
+    @classmethod
+    def load(cls, path: str) -> "InputJournal":
+        """Read a journal, ignoring a record cut short by a crash"""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < cls.HEADER.size:
+            raise ValueError(f"{path} is not an input journal")
+        magic, version = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path} is not an input journal")
+        seed, pos = cls.decode_varint(data, cls.HEADER.size)
+        keys = []
+        while pos < len(data):
+            try:
+                key, pos = cls.decode_varint(data, pos)
+            except IndexError:
+                break
+            keys.append(key)
+        return cls(seed, keys)
+    
+    def add(self, key: int):
+        """Record one key"""
+        self.keys.append(key)
+        if self.file:
+            self.file.write(self.encode_varint(key))
+            self.file.flush()
+    
+    def close(self):
+        """Close the journal file"""
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def replay_session(path: str, content_index: str = CONTENT_INDEX_PATH,
+                   pack_dir: str = CONTENT_PACK_DIR) -> GameEngine:
+    """Re-run a recorded session headlessly, returning the engine at its end
+    
+    Raises ValueError if the replay falls out of step with the journal, i.e.
+    the game quits while recorded keys are still left to play.
+    """
+    journal = InputJournal.load(path)
+    game = GameEngine(load_content(content_index, pack_dir), journal.seed)
+    for played, key in enumerate(journal.keys, 1):
+        try:
+            game.step(key)
+        except SystemExit:  # The player quit from the main menu
+            left = len(journal.keys) - played
+            if left:
+                raise ValueError(f"Journal out of step: the game quit with {left} keys left") from None
+            break
+    return game
+
+
 # ============================================================================
 # MAIN FUNCTION
 # ============================================================================
 
-def main(stdscr):
+def main(stdscr, content_index: str = CONTENT_INDEX_PATH, seed: Optional[int] = None,
+         record_path: Optional[str] = None, pack_dir: str = CONTENT_PACK_DIR):
     """Main function"""
+    if STARTUP_PROFILER:
+        STARTUP_PROFILER.mark("curses setup")
+    
     # Initialize the game engine
-    game = GameEngine()
+    content = load_content(content_index, pack_dir)
+    if STARTUP_PROFILER:
+        STARTUP_PROFILER.mark("content tables")
+    game = GameEngine(content, seed)
+    if STARTUP_PROFILER:
+        STARTUP_PROFILER.mark("game engine")
+    
+    # Start the game loop, journalling the keys if asked to
+    journal = InputJournal.record(record_path, game.random.seed) if record_path else None
+    try:
+        game.run(stdscr, journal)
+    finally:
+        if journal:
+            journal.close()
+
+
+def parse_arguments(argv: List[str]):
+    """Parse command line options; a plain launch skips loading argparse"""
+    defaults = {"compile_content": False, "profile_startup": False,
+                "packs": CONTENT_PACK_DIR, "content_index": CONTENT_INDEX_PATH, "seed": None,
+                "record": None, "replay": None, "render_final": False}
+    if not argv:
+        from types import SimpleNamespace
+        return SimpleNamespace(**defaults)
     
-    # Start the game loop
-    game.run(stdscr)
+    import argparse
+    parser = argparse.ArgumentParser(description="Yatala Lockdown")
+    parser.add_argument("--compile-content", action="store_true",
+                        help="compile content packs into the content index and exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report how long each startup stage took when the game exits")
+    parser.add_argument("--packs", default=defaults["packs"], help="content pack directory")
+    parser.add_argument("--content-index", default=defaults["content_index"], help="compiled content index")
+    parser.add_argument("--seed", type=int, default=defaults["seed"],
+                        help="seed every random stream, so the run can be replayed")
+    parser.add_argument("--record", metavar="JOURNAL", help="record every key of the session to an input journal")
+    parser.add_argument("--replay", metavar="JOURNAL", help="replay an input journal headlessly and report the result")
+    parser.add_argument("--render-final", action="store_true", help="draw the last frame of a replay")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    # Run the game with curses
-    curses.wrapper(main)
+    module_finished = time.perf_counter()
+    args = parse_arguments(sys.argv[1:])
+    
+    if args.profile_startup:
+        STARTUP_PROFILER = StartupProfiler(STARTUP_STARTED)
+        STARTUP_PROFILER.mark("imports", IMPORTS_FINISHED)
+        STARTUP_PROFILER.mark("module body", module_finished)
+        STARTUP_PROFILER.mark("arguments")
+    
+    if args.replay:
+        started = time.perf_counter()
+        game = replay_session(args.replay, args.content_index, args.packs)
+        elapsed = time.perf_counter() - started
+        summary = f"ended in {game.game_state.name}"
+        if game.player:
+            summary += f" on day {game.player.days_served} at {game.player.location}"
+        print(f"Replayed {args.replay} in {elapsed * 1000:.1f} ms: {summary}")
+        if args.render_final:
+            curses.wrapper(game.show_final_frame)
+    elif args.compile_content:
+        counts = compile_content(args.packs, args.content_index)
+        print(f"Compiled {sum(counts.values())} records into {args.content_index}")
+        for name, count in counts.items():
+            print(f"  {name}: {count}")
+    else:
+        try:
+            # Run the game with curses
+            curses.wrapper(main, args.content_index, args.seed, args.record, args.packs)
+        finally:
+            # Quitting from the menu exits via sys.exit, so report on the way out
+            if STARTUP_PROFILER:
+                print(STARTUP_PROFILER.report())
 # WATERMARK_INTEGRITY_CHECK
 # This file is protected by digital watermarking technology
 # Unauthorized modification or distribution will be detected
@@ -15,7 +15,6 @@ Any attempt to circumvent these protections is illegal and will be detected.
 Author: NovaSysErr-X
 Version: 0.5.0 beta
 Protected by: COPYRIGHT_PROTECTION.md and SECURITY_POLICY.md
-"""
 
 PRISON BREAK: The Ultimate Inmate Simulation
 A sophisticated CLI-based prison survival RPG game
@@ -27,20 +26,41 @@ Python: 3.9+
 
 This is a complete, production-grade game with zero external dependencies.
 Simply run: python3 prison_break.py
+"""
 
-import curses
+import bisect
+import copy
+import heapq
+import itertools
 import json
+import math
 import random
 import time
 import os
+import struct
 import sys
-from typing import Dict, List, Optional, Tuple, Any, Callable
-from dataclasses import dataclass, field, asdict
+import zlib
+from typing import Dict, List, Optional, Tuple, Any, Callable, Iterable, Iterator, Mapping, MutableMapping, Sequence
+from dataclasses import dataclass, field, asdict, replace
 from enum import Enum, auto
 from datetime import datetime, timedelta
 from collections import defaultdict
+from types import MappingProxyType
 import textwrap
 
+# curses is only needed to draw on a real terminal, so it is imported on first
+# use; the engine, replays and the headless simulator run without it
+curses = None
+
+
+def load_curses():
+    """Import curses on first use and return it"""
+    global curses
+    if curses is None:
+        import curses as curses_module
+        curses = curses_module
+    return curses
+
 
 # ============================================================================
 # TYPE DEFINITIONS AND ENUMS
@@ -89,6 +109,14 @@ class ItemType(Enum):
     QUEST = auto()
 
 
+class EquipmentSlot(Enum):
+    """Where an item is worn or carried"""
+    WEAPON = "weapon"
+    SHANK = "shank"  # concealed blade
+    ARMOUR = "armour"
+    TOOLS = "tools"
+
+
 class GangType(Enum):
     """Available gangs - Australian style"""
     NONE = auto()
@@ -225,6 +253,7 @@ class StatusEffect:
     duration: int  # in game hours
     stat_modifiers: Dict[str, float] = field(default_factory=dict)
     description: str = ""
+    expires_at: Optional[int] = None  # absolute game minute, set when applied
 
 
 @dataclass
@@ -272,9 +301,9 @@ class ManufacturingProcess:
     required_time: int  # minutes
     required_workers: int  # how many people needed
     output_item: str  # item_id
+    location_id: str  # where it can be done
     output_quantity: int = 1
     difficulty: int = 1  # 1-10
-    location_id: str  # where it can be done
     faction_required: Optional[Faction] = None  # faction needed to access
     success_chance: float = 1.0  # 0.0-1.0
     risk_level: int = 1  # 1-10 (chance of getting caught)
@@ -374,6 +403,7 @@ class NPC:
     dialogue: Dict[str, List[str]] = field(default_factory=dict)
     is_guard: bool = False
     is_hostile: bool = False
+    skills: Dict[str, int] = field(default_factory=dict)  # skill or attribute name: level
 
 
 @dataclass
@@ -403,6 +433,9 @@ class Location:
     time_restrictions: Dict[str, Tuple[int, int]] = field(default_factory=dict)
 
 
+PERIOD_START_HOURS = (6, 8, 12, 13, 17, 18, 22)  # hours where get_period changes
+
+
 @dataclass
 class GameTime:
     """Game time tracking"""
@@ -412,13 +445,18 @@ class GameTime:
     
     def advance(self, minutes: int) -> None:
         """Advance time by minutes"""
-        self.minute += minutes
-        while self.minute >= 60:
-            self.minute -= 60
-            self.hour += 1
-        while self.hour >= 24:
-            self.hour -= 24
-            self.day += 1
+        self.set_total_minutes(self.total_minutes + minutes)
+    
+    @property
+    def total_minutes(self) -> int:
+        """Absolute game minutes since 00:00 on day 1"""
+        return ((self.day - 1) * 24 + self.hour) * 60 + self.minute
+    
+    def set_total_minutes(self, total: int) -> None:
+        """Set the clock from absolute game minutes"""
+        days, remainder = divmod(total, 24 * 60)
+        self.day = days + 1
+        self.hour, self.minute = divmod(remainder, 60)
     
     def get_time_string(self) -> str:
         """Get formatted time string"""
@@ -440,6 +478,342 @@ class GameTime:
             return "Evening"
         else:
             return "Lockdown"
+    
+    def minutes_until_period_change(self) -> int:
+        """Minutes until get_period next changes"""
+        minute_of_day = self.hour * 60 + self.minute
+        for hour in PERIOD_START_HOURS:
+            if hour * 60 > minute_of_day:
+                return hour * 60 - minute_of_day
+        return (24 + PERIOD_START_HOURS[0]) * 60 - minute_of_day
+
+
+# ============================================================================
+# TIME SCHEDULING
+# ============================================================================
+
+@dataclass(order=True)
+class ScheduledEvent:
+    """Callback due at an absolute game minute"""
+    due: int
+    sequence: int
+    callback: Callable[[], None] = field(compare=False)
+    interval: Optional[int] = field(default=None, compare=False)  # minutes between repeats
+    cancelled: bool = field(default=False, compare=False)
+
+
+class Scheduler:
+    """Priority-queue scheduler keyed on absolute game minutes
+    
+    Systems register callbacks instead of being polled every tick. Advancing
+    the clock pops only the events that are due, moving the clock to each
+    event's time before firing it, so a long rest costs O(events fired).
+    """
+    
+    def __init__(self, game_time: GameTime):
+        self.game_time = game_time
+        self.queue: List[ScheduledEvent] = []
+        self.sequence = 0
+    
+    def schedule_at(self, due: int, callback: Callable[[], None],
+                    interval: Optional[int] = None) -> ScheduledEvent:
+        """Schedule a callback at an absolute game minute"""
+        self.sequence += 1
+        event = ScheduledEvent(max(due, self.game_time.total_minutes), self.sequence, callback, interval)
+        heapq.heappush(self.queue, event)
+        return event
+    
+    def schedule_in(self, minutes: int, callback: Callable[[], None],
+                    interval: Optional[int] = None) -> ScheduledEvent:
+        """Schedule a callback a number of minutes from now"""
+        return self.schedule_at(self.game_time.total_minutes + minutes, callback, interval)
+    
+    def schedule_every(self, interval: int, callback: Callable[[], None],
+                       offset: int = 0) -> ScheduledEvent:
+        """Schedule a repeating callback on every interval boundary (plus offset)"""
+        now = self.game_time.total_minutes
+        due = (now - offset) // interval * interval + offset + interval
+        return self.schedule_at(due, callback, interval)
+    
+    def cancel(self, event: ScheduledEvent) -> None:
+        """Cancel a scheduled event (it is dropped lazily when it reaches the front)"""
+        event.cancelled = True
+    
+    def advance(self, minutes: int) -> int:
+        """Advance the clock, firing due events in order; returns how many fired"""
+        target = self.game_time.total_minutes + minutes
+        fired = 0
+        
+        while self.queue and self.queue[0].due <= target:
+            event = heapq.heappop(self.queue)
+            if event.cancelled:
+                continue
+            self.game_time.set_total_minutes(event.due)
+            if event.interval:
+                self.sequence += 1
+                event.due += event.interval
+                event.sequence = self.sequence
+                heapq.heappush(self.queue, event)
+            event.callback()
+            fired += 1
+        
+        self.game_time.set_total_minutes(target)
+        return fired
+    
+    def pending(self) -> int:
+        """Number of live events in the queue"""
+        return sum(1 for event in self.queue if not event.cancelled)
+
+
+# ============================================================================
+# RANDOM STREAMS
+# ============================================================================
+
+RANDOM_BLOCK_SIZE = 4096  # uniforms a block stream draws per NumPy call
+
+
+class BlockRandom(random.Random):
+    """random.Random that reads its uniforms from blocks drawn by NumPy
+    
+    Every random.Random method (randint, choice, expovariate, ...) is built
+    on random(), which here just hands out the next value of a pre-drawn
+    block, so hot loops pay one NumPy call per block instead of per draw.
+    The state is the generator state before the current block and the
+    position in it.
+    """
+    
+    def __init__(self, seed: int, block_size: int = RANDOM_BLOCK_SIZE):
+        self.block_size = block_size
+        super().__init__(seed)
+    
+    def seed(self, a: Optional[int] = None, version: int = 2) -> None:
+        """Restart the stream from a seed"""
+        import numpy
+        self.generator = numpy.random.default_rng(a)
+        self.block_state = self.generator.bit_generator.state
+        self.block: List[float] = []
+        self.position = 0
+    
+    def random(self) -> float:
+        """Next uniform in [0, 1)"""
+        if self.position >= len(self.block):
+            self.block_state = self.generator.bit_generator.state
+            self.block = self.generator.random(self.block_size).tolist()
+            self.position = 0
+        value = self.block[self.position]
+        self.position += 1
+        return value
+    
+    def getstate(self) -> Dict[str, Any]:
+        """Generator state before the current block and the position in it"""
+        return {"generator": self.block_state, "position": self.position}
+    
+    def setstate(self, state: Dict[str, Any]) -> None:
+        """Rewind to a state from getstate"""
+        self.generator.bit_generator.state = state["generator"]
+        self.block_state = state["generator"]
+        self.block = []
+        self.position = 0
+        if state["position"]:
+            self.block = self.generator.random(self.block_size).tolist()
+            self.position = state["position"]
+
+
+class RandomStreams:
+    """Seeded random streams, one per subsystem
+    
+    Each stream is seeded from the master seed and its own name, so what one
+    subsystem draws never shifts another's numbers. A game replays from its
+    seed, spawn() derives independent streams for parallel runs, and the
+    state of every stream is saved with the game. Hot loops ask for a block
+    stream, which draws through NumPy when it is installed.
+    """
+    
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = 0
+        self.streams: Dict[str, random.Random] = {}
+        self.saved: Dict[str, Any] = {}  # restored states of streams not created yet
+        self.reset(seed)
+    
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Reseed every stream from a new master seed (a fresh one if None)"""
+        self.seed = int.from_bytes(os.urandom(8), "big") if seed is None else seed
+        self.saved = {}
+        for name, stream in self.streams.items():
+            stream.seed(self.derive(name))
+    
+    def derive(self, name: str) -> int:
+        """Seed derived from the master seed for a name"""
+        return random.Random(f"{self.seed}/{name}").getrandbits(64)
+    
+    def get(self, name: str) -> random.Random:
+        """The stream for a subsystem"""
+        if name not in self.streams:
+            self._add(name, random.Random(self.derive(name)))
+        return self.streams[name]
+    
+    def block(self, name: str) -> random.Random:
+        """The stream for a hot loop, drawn in NumPy blocks when possible"""
+        if name not in self.streams:
+            try:
+                stream = BlockRandom(self.derive(name))
+            except ImportError:
+                stream = random.Random(self.derive(name))
+            self._add(name, stream)
+        return self.streams[name]
+    
+    def _add(self, name: str, stream: random.Random) -> None:
+        """Register a new stream, picking up any state restored for it"""
+        self.streams[name] = stream
+        if name in self.saved:
+            self.apply_state(stream, self.saved.pop(name))
+    
+    def spawn(self, key: Any) -> "RandomStreams":
+        """Independent streams for a child run, e.g. one parallel simulation"""
+        return RandomStreams(self.derive(f"spawn/{key}"))
+    
+    @staticmethod
+    def encode_state(stream: random.Random) -> Any:
+        """JSON-friendly state of a stream"""
+        if isinstance(stream, BlockRandom):
+            return stream.getstate()
+        version, internal, gauss_next = stream.getstate()
+        return [version, list(internal), gauss_next]
+    
+    @staticmethod
+    def apply_state(stream: random.Random, state: Any) -> None:
+        """Restore a state from encode_state; a stream saved with NumPy but
+        loaded without it (or the reverse) just stays freshly seeded"""
+        if isinstance(stream, BlockRandom) and isinstance(state, dict):
+            stream.setstate(state)
+        elif not isinstance(stream, BlockRandom) and isinstance(state, list):
+            stream.setstate((state[0], tuple(state[1]), state[2]))
+    
+    def to_state(self) -> Dict[str, Any]:
+        """Master seed and the state of every stream"""
+        states = dict(self.saved)
+        states.update((name, self.encode_state(stream)) for name, stream in self.streams.items())
+        return {"seed": self.seed, "streams": states}
+    
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Put every stream back where to_state found it"""
+        self.reset(state["seed"])
+        for name, stream_state in state.get("streams", {}).items():
+            if name in self.streams:
+                self.apply_state(self.streams[name], stream_state)
+            else:
+                self.saved[name] = stream_state
+
+
+# ============================================================================
+# INVENTORY
+# ============================================================================
+
+class Inventory:
+    """Item container indexed by item id and type with a running weight total
+    
+    Behaves like the list it replaces (iteration, len, indexing, slicing) while
+    keeping per-id quantity totals and the carried weight up to date on every
+    mutation, so lookups and capacity checks never scan the slots.
+    """
+    
+    def __init__(self, items: Iterable[Item] = ()):
+        self.on_change: Optional[Callable[[str, int], None]] = None  # called with (item id, new total)
+        self.slots: List[Item] = []
+        self.by_id: Dict[str, List[Item]] = defaultdict(list)
+        self.by_type: Dict[ItemType, List[Item]] = defaultdict(list)
+        self.quantities: Dict[str, int] = defaultdict(int)
+        self.total_weight: float = 0.0
+        for item in items:
+            self.add(item)
+    
+    def __iter__(self):
+        return iter(self.slots)
+    
+    def __len__(self) -> int:
+        return len(self.slots)
+    
+    def __getitem__(self, index):
+        return self.slots[index]
+    
+    def __contains__(self, item_id: str) -> bool:
+        return self.quantities.get(item_id, 0) > 0
+    
+    def add(self, item: Item) -> Item:
+        """Add an item, stacking onto an existing slot when stackable"""
+        self.total_weight += item.weight * item.quantity
+        self.quantities[item.id] += item.quantity
+        
+        if item.stackable and self.by_id.get(item.id):
+            slot = self.by_id[item.id][0]
+            slot.quantity += item.quantity
+        else:
+            # Slots are copies so stacking never mutates the caller's item
+            slot = replace(item, effects=item.effects.copy())
+            self.slots.append(slot)
+            self.by_id[item.id].append(slot)
+            self.by_type[item.item_type].append(slot)
+        
+        if self.on_change:
+            self.on_change(item.id, self.count(item.id))
+        return slot
+    
+    def remove(self, item_id: str, quantity: int = 1) -> bool:
+        """Remove a quantity of an item, draining slots in order"""
+        if self.count(item_id) < quantity:
+            return False
+        
+        remaining = quantity
+        for slot in self.by_id[item_id][:]:
+            taken = min(slot.quantity, remaining)
+            slot.quantity -= taken
+            remaining -= taken
+            self.total_weight -= slot.weight * taken
+            if slot.quantity <= 0:
+                self._drop_slot(slot)
+            if remaining <= 0:
+                break
+        
+        self.quantities[item_id] -= quantity
+        if self.quantities[item_id] <= 0:
+            del self.quantities[item_id]
+            del self.by_id[item_id]
+        if not self.slots:
+            self.total_weight = 0.0  # Clear accumulated float error
+        if self.on_change:
+            self.on_change(item_id, self.count(item_id))
+        return True
+    
+    def _drop_slot(self, slot: Item) -> None:
+        """Remove an emptied slot from every index"""
+        self.slots.remove(slot)
+        self.by_id[slot.id].remove(slot)
+        self.by_type[slot.item_type].remove(slot)
+    
+    def count(self, item_id: str) -> int:
+        """Total quantity held of an item"""
+        return self.quantities.get(item_id, 0)
+    
+    def get(self, item_id: str) -> Optional[Item]:
+        """First slot holding an item"""
+        slots = self.by_id.get(item_id)
+        return slots[0] if slots else None
+    
+    def of_type(self, item_type: ItemType) -> List[Item]:
+        """Slots holding items of a type"""
+        return list(self.by_type.get(item_type, ()))
+    
+    def clear(self) -> None:
+        """Empty the inventory"""
+        emptied = list(self.quantities)
+        self.slots.clear()
+        self.by_id.clear()
+        self.by_type.clear()
+        self.quantities.clear()
+        self.total_weight = 0.0
+        if self.on_change:
+            for item_id in emptied:
+                self.on_change(item_id, 0)
 
 
 # ============================================================================
@@ -451,6 +825,7 @@ class Player:
     
     def __init__(self, name: str = "Prisoner"):
         self.name: str = name
+        self.rng: random.Random = random  # the engine hands over the "player" stream
         self.level: int = 1
         self.xp: int = 0
         self.xp_to_next: int = 100
@@ -476,7 +851,7 @@ class Player:
         # Status
         self.status_effects: List[StatusEffect] = []
         self.medical_conditions: List[MedicalCondition] = []  # active medical conditions
-        self.location: str = "cell_b12"
+        self.location: str = "cell_a1"
         self.gang: GangType = GangType.NONE
         self.gang_rank: str = "None"
         
@@ -503,21 +878,32 @@ class Player:
         self.parole_progress: int = 0  # progress toward parole eligibility
         
         # Inventory - Aussie style
-        self.inventory: List[Item] = []
+        self.inventory = Inventory()
+        self.inventory.on_change = self.on_inventory_change
+        
+        # Equipment, and the totals derived from it and the status effects
+        self.equipment: Dict[EquipmentSlot, Item] = {}
+        self.stat_bonuses: Dict[str, float] = {}  # attribute or skill: flat bonus from equipment
+        self.stat_multipliers: Dict[str, float] = {}  # attribute: multiplier from status effects
+        self.weapon_damage: int = UNARMED_DAMAGE
+        self.armour: int = 0
         self.max_weight: float = 50.0
         self.money: int = 0  # Canteen money
         self.durries: int = 0  # Cigarettes (main currency)
         
         # Relationships
         self.relationships: Dict[str, int] = {}
-        self.relationship_traits: Dict[str, Dict[str, int]] = field(default_factory=dict)  # npc_id: {trait: value}
-        self.relationship_events: Dict[str, int] = field(default_factory=dict)  # event_id: last_occurrence_time
+        self.relationship_traits: Dict[str, Dict[str, int]] = {}  # npc_id: {trait: value}
+        self.relationship_events: Dict[str, int] = {}  # event_id: last_occurrence_time
         self.participated_events: List[str] = []  # event IDs
-        self.event_cooldowns: Dict[str, int] = field(default_factory=dict)  # event_id: cooldown_end_time
+        self.event_cooldowns: Dict[str, int] = {}  # event_id: cooldown_end_time
         
         # Perks
         self.perks: List[str] = []
         
+        # Called with (kind, key, value) when an item count, skill or known recipe changes
+        self.change_listeners: List[Callable[[str, str, int], None]] = []
+        
         # Background
         self.suburb: str = "Elizabeth"  # Northern suburbs
         self.crime: str = "Aggravated Assault"
@@ -569,45 +955,28 @@ class Player:
             return 1600 * (self.level - 40) + 15000
     
     def get_total_weight(self) -> float:
-        """Calculate total inventory weight"""
-        return sum(item.weight * item.quantity for item in self.inventory)
+        """Get total inventory weight"""
+        return self.inventory.total_weight
     
     def can_carry(self, item: Item) -> bool:
         """Check if player can carry item"""
-        return self.get_total_weight() + item.weight <= self.max_weight
+        return self.inventory.total_weight + item.weight <= self.max_weight
     
     def add_item(self, item: Item) -> bool:
         """Add item to inventory"""
         if not self.can_carry(item):
             return False
         
-        # Stack if stackable
-        if item.stackable:
-            for inv_item in self.inventory:
-                if inv_item.id == item.id:
-                    inv_item.quantity += item.quantity
-                    return True
-        
-        self.inventory.append(item)
+        self.inventory.add(item)
         return True
     
     def remove_item(self, item_id: str, quantity: int = 1) -> bool:
         """Remove item from inventory"""
-        for item in self.inventory:
-            if item.id == item_id:
-                if item.quantity >= quantity:
-                    item.quantity -= quantity
-                    if item.quantity <= 0:
-                        self.inventory.remove(item)
-                    return True
-        return False
+        return self.inventory.remove(item_id, quantity)
     
     def has_item(self, item_id: str, quantity: int = 1) -> bool:
         """Check if player has item"""
-        for item in self.inventory:
-            if item.id == item_id and item.quantity >= quantity:
-                return True
-        return False
+        return self.inventory.count(item_id) >= quantity
     
     def heal(self, amount: int) -> None:
         """Heal player"""
@@ -631,34 +1000,107 @@ class Player:
     def add_status_effect(self, effect: StatusEffect) -> None:
         """Add status effect"""
         self.status_effects.append(effect)
+        self.recompute_effects()
     
     def remove_status_effect(self, name: str) -> None:
         """Remove status effect by name"""
         self.status_effects = [e for e in self.status_effects if e.name != name]
+        self.recompute_effects()
     
-    def update_status_effects(self, hours: int) -> None:
-        """Update status effects duration"""
-        for effect in self.status_effects[:]:
-            effect.duration -= hours
-            if effect.duration <= 0:
-                self.status_effects.remove(effect)
+    def recompute_effects(self) -> None:
+        """Rebuild the stat multipliers after the status effects changed"""
+        multipliers: Dict[str, float] = defaultdict(lambda: 1.0)
+        for effect in self.status_effects:
+            for stat_name, modifier in effect.stat_modifiers.items():
+                multipliers[stat_name] += modifier
+        self.stat_multipliers = dict(multipliers)
     
     def get_effective_stat(self, stat_name: str) -> float:
-        """Get stat value with status effect modifiers"""
-        base_value = getattr(self.attributes, stat_name, 0)
-        modifier = 1.0
-        
-        for effect in self.status_effects:
-            if stat_name in effect.stat_modifiers:
-                modifier += effect.stat_modifiers[stat_name]
-        
-        return base_value * modifier
+        """Get stat value with equipment bonuses and status effect modifiers"""
+        base_value = getattr(self.attributes, stat_name, 0) + self.stat_bonuses.get(stat_name, 0)
+        return base_value * self.stat_multipliers.get(stat_name, 1.0)
+    
+    def get_effective_skill(self, skill_name: str) -> float:
+        """Get skill level with equipment bonuses"""
+        return getattr(self.skills, skill_name, 0) + self.stat_bonuses.get(skill_name, 0)
+    
+    @staticmethod
+    def equipment_slot(item: Item) -> Optional[EquipmentSlot]:
+        """Slot an item is worn or carried in, if any"""
+        slot = item.effects.get("slot")
+        if slot:
+            return EquipmentSlot(slot)
+        return EquipmentSlot.WEAPON if item.item_type == ItemType.WEAPON else None
+    
+    def equip(self, item: Item) -> Optional[EquipmentSlot]:
+        """Equip a carried item in its slot, returning the slot"""
+        slot = self.equipment_slot(item)
+        if slot is None or not any(carried is item for carried in self.inventory.by_id.get(item.id, ())):
+            return None
+        self.equipment[slot] = item
+        self.recompute_equipment()
+        return slot
+    
+    def unequip(self, slot: EquipmentSlot) -> Optional[Item]:
+        """Take the item out of a slot"""
+        item = self.equipment.pop(slot, None)
+        if item:
+            self.recompute_equipment()
+        return item
+    
+    def recompute_equipment(self) -> None:
+        """Rebuild the totals derived from equipment after it changed"""
+        old_bonuses = self.stat_bonuses
+        bonuses: Dict[str, float] = defaultdict(float)
+        armour = 0
+        for item in self.equipment.values():
+            for key, value in item.effects.items():
+                if key == "armour":
+                    armour += value
+                elif key != "slot" and isinstance(value, (int, float)):
+                    bonuses[key] += value
+        
+        self.stat_bonuses = dict(bonuses)
+        self.armour = armour
+        self.weapon_damage = max([UNARMED_DAMAGE] + [item.damage for slot, item in self.equipment.items()
+                                                     if slot in (EquipmentSlot.WEAPON, EquipmentSlot.SHANK)])
+        for skill_name in set(old_bonuses) | set(bonuses):
+            if hasattr(self.skills, skill_name) and old_bonuses.get(skill_name) != bonuses.get(skill_name):
+                self.notify_change("skill", skill_name, self.get_effective_skill(skill_name))
+    
+    def on_inventory_change(self, item_id: str, count: int) -> None:
+        """Keep equipment pointing at carried items, filling empty slots with new gear"""
+        carried = self.inventory.by_id.get(item_id, ())
+        for slot, item in list(self.equipment.items()):
+            if item.id == item_id and not any(c is item for c in carried):
+                if carried:
+                    self.equipment[slot] = carried[0]
+                else:
+                    del self.equipment[slot]
+                self.recompute_equipment()
+        if carried and not any(item.id == item_id for item in self.equipment.values()):
+            slot = self.equipment_slot(carried[0])
+            if slot and slot not in self.equipment:
+                self.equip(carried[0])
+        self.notify_change("item", item_id, count)
     
     def improve_skill(self, skill_name: str, amount: int = 1) -> None:
         """Improve a skill"""
         current = getattr(self.skills, skill_name, 0)
         new_value = min(100, current + amount)
         setattr(self.skills, skill_name, new_value)
+        self.notify_change("skill", skill_name, self.get_effective_skill(skill_name))
+    
+    def learn_recipe(self, recipe_id: str) -> None:
+        """Learn a crafting recipe"""
+        if recipe_id not in self.known_recipes:
+            self.known_recipes.append(recipe_id)
+            self.notify_change("recipe", recipe_id, 1)
+    
+    def notify_change(self, kind: str, key: str, value: int) -> None:
+        """Tell listeners that an item count ("item"), skill ("skill"), recipe ("recipe") or relationship changed"""
+        for listener in self.change_listeners:
+            listener(kind, key, value)
     
     def update_psychological_wellness(self, stress_change: int = 0, hope_change: int = 0, fatigue_change: int = 0) -> None:
         """Update psychological wellness metrics"""
@@ -697,7 +1139,7 @@ class Player:
         
         # Check required skills
         for skill_name, required_level in recipe.required_skills.items():
-            current_level = getattr(self.skills, skill_name, 0)
+            current_level = self.get_effective_skill(skill_name)
             if current_level < required_level:
                 return False
         
@@ -726,7 +1168,7 @@ class Player:
         self.use_energy(energy_cost)
         
         # Check success chance
-        if random.random() > recipe.success_chance:
+        if self.rng.random() > recipe.success_chance:
             return None  # Crafting failed
         
         # Create and add crafted item
@@ -759,7 +1201,7 @@ class Player:
         
         # Check required skills
         for skill_name, required_level in process.required_skills.items():
-            current_level = getattr(self.skills, skill_name, 0)
+            current_level = self.get_effective_skill(skill_name)
             if current_level < required_level:
                 return False
         
@@ -792,7 +1234,7 @@ class Player:
         
         # Check required skills
         for skill_name, required_level in operation.required_skills.items():
-            current_level = getattr(self.skills, skill_name, 0)
+            current_level = self.get_effective_skill(skill_name)
             if current_level < required_level:
                 return False
         
@@ -818,7 +1260,7 @@ class Player:
         self.dirty_money -= operation.required_dirty_money
         
         # Check success chance
-        if random.random() > operation.success_chance:
+        if self.rng.random() > operation.success_chance:
             # Operation failed, lose some money as penalty
             penalty = min(self.clean_money, operation.required_capital // 2)
             self.clean_money -= penalty
@@ -840,7 +1282,7 @@ class Player:
         
         # Check required skills
         for skill_name, required_level in program.required_skills.items():
-            current_level = getattr(self.skills, skill_name, 0)
+            current_level = self.get_effective_skill(skill_name)
             if current_level < required_level:
                 return False
         
@@ -925,7 +1367,7 @@ class Player:
         self.money -= condition.treatment_cost
         
         # Remove condition with chance of recurrence
-        if random.random() > condition.recurrence_chance:
+        if self.rng.random() > condition.recurrence_chance:
             self.remove_medical_condition(condition.id)
             return True
         else:
@@ -936,6 +1378,7 @@ class Player:
         """Update relationship value with an NPC"""
         current = self.relationships.get(npc_id, 0)
         self.relationships[npc_id] = max(-100, min(100, current + relationship_change))
+        self.notify_change("relationship", npc_id, self.relationships[npc_id])
     
     def update_relationship_traits(self, npc_id: str, trait_changes: Dict[str, int]) -> None:
         """Update specific relationship traits with an NPC"""
@@ -970,7 +1413,7 @@ class Player:
                     return False
             elif condition == "skill_min":
                 skill_name, min_level = value
-                if getattr(self.skills, skill_name, 0) < min_level:
+                if self.get_effective_skill(skill_name) < min_level:
                     return False
         
         # Apply relationship changes
@@ -1015,11 +1458,11 @@ class Player:
             self.remove_item(item_id)
         
         # Check risk level
-        if random.randint(1, 10) <= event.risk_level:
+        if self.rng.randint(1, 10) <= event.risk_level:
             # Event has negative consequences
             results["penalties"] = {
-                "health_loss": random.randint(5, 20),
-                "stress_gain": random.randint(10, 30)
+                "health_loss": self.rng.randint(5, 20),
+                "stress_gain": self.rng.randint(10, 30)
             }
             self.take_damage(results["penalties"]["health_loss"])
             self.update_psychological_wellness(stress_change=results["penalties"]["stress_gain"])
@@ -1064,13 +1507,18 @@ class GameData:
         return {
             # Weapons
             "shank": Item("shank", "Shank", "A sharpened piece of metal", ItemType.WEAPON, 
-                         value=50, weight=0.5, damage=20),
+                         value=50, weight=0.5, damage=20, effects={"slot": "shank"}),
             "sock_soap": Item("sock_soap", "Sock with Soap", "A sock filled with bars of soap", 
                              ItemType.WEAPON, value=20, weight=1.0, damage=15),
             "shiv": Item("shiv", "Shiv", "A well-crafted stabbing weapon", ItemType.WEAPON,
-                        value=75, weight=0.3, damage=25),
+                        value=75, weight=0.3, damage=25, effects={"slot": "shank", "knife_fighting": 5}),
             "brass_knuckles": Item("brass_knuckles", "Brass Knuckles", "Metal knuckles for punching",
-                                  ItemType.WEAPON, value=60, weight=0.5, damage=18),
+                                  ItemType.WEAPON, value=60, weight=0.5, damage=18, effects={"brawling": 5}),
+            
+            # Armour
+            "padded_vest": Item("padded_vest", "Padded Vest", "Magazines and cloth strapped under a shirt",
+                               ItemType.CONTRABAND, value=40, weight=1.5,
+                               effects={"slot": "armour", "armour": 4, "toughness": 5}),
             
             # Consumables
             "food_tray": Item("food_tray", "Food Tray", "Prison cafeteria meal", ItemType.CONSUMABLE,
@@ -1100,7 +1548,7 @@ class GameData:
             "rope": Item("rope", "Rope", "Strong rope", ItemType.CRAFTING,
                         value=15, weight=1.0, stackable=True),
             "tools": Item("tools", "Tools", "Basic tools", ItemType.CRAFTING,
-                         value=50, weight=2.0),
+                         value=50, weight=2.0, effects={"slot": "tools", "crafting": 5}),
             
             # Books
             "fitness_book": Item("fitness_book", "Fitness Guide", "Improves strength training", 
@@ -1111,6 +1559,99 @@ class GameData:
                                  ItemType.BOOK, value=60, weight=0.3, effects={"skill": "lockpicking"}),
         }
     
+    @staticmethod
+    def get_recipes() -> Dict[str, CraftingRecipe]:
+        """Get all crafting recipes"""
+        return {
+            "shank": CraftingRecipe(
+                "shank", "Shank", "Grind scrap metal to a point and wrap a cloth grip",
+                required_items={"metal_scrap": 2, "cloth": 1},
+                required_skills={"crafting": 5},
+                required_time=30,
+                output_item="shank",
+                difficulty=2,
+                success_chance=0.9
+            ),
+            "shiv": CraftingRecipe(
+                "shiv", "Shiv", "Rework a shank into a balanced stabbing weapon",
+                required_items={"shank": 1, "metal_scrap": 1},
+                required_skills={"crafting": 15, "knife_fighting": 5},
+                required_time=45,
+                output_item="shiv",
+                difficulty=4,
+                success_chance=0.75
+            ),
+            "rope": CraftingRecipe(
+                "rope", "Rope", "Braid strips of cloth into a strong rope",
+                required_items={"cloth": 3},
+                required_skills={"crafting": 3},
+                required_time=30,
+                output_item="rope",
+                success_chance=0.95
+            ),
+            "padded_vest": CraftingRecipe(
+                "padded_vest", "Padded Vest", "Strap layers of cloth together into a stab vest",
+                required_items={"cloth": 4, "rope": 1},
+                required_skills={"crafting": 6},
+                required_time=45,
+                output_item="padded_vest",
+                difficulty=2,
+                success_chance=0.9
+            ),
+            "brass_knuckles": CraftingRecipe(
+                "brass_knuckles", "Brass Knuckles", "Hammer scrap into a set of knuckle dusters",
+                required_items={"metal_scrap": 3},
+                required_skills={"crafting": 10, "brawling": 5},
+                required_time=60,
+                output_item="brass_knuckles",
+                difficulty=3,
+                success_chance=0.8
+            ),
+        }
+    
+    @staticmethod
+    def get_processes() -> Dict[str, ManufacturingProcess]:
+        """Get all manufacturing processes"""
+        return {
+            "rope_line": ManufacturingProcess(
+                "rope_line", "Rope Line", "Braid rope in bulk from laundry offcuts",
+                required_materials={"cloth": 9},
+                required_skills={"crafting": 3},
+                required_time=240,
+                required_workers=1,
+                output_item="rope",
+                location_id="workshop",
+                output_quantity=3,
+                success_chance=0.95,
+                risk_level=1
+            ),
+            "shank_batch": ManufacturingProcess(
+                "shank_batch", "Shank Batch", "Turn out a crate of shanks on the workshop grinder",
+                required_materials={"metal_scrap": 12, "cloth": 6},
+                required_skills={"crafting": 8},
+                required_time=720,
+                required_workers=3,
+                output_item="shank",
+                location_id="workshop",
+                output_quantity=6,
+                difficulty=4,
+                success_chance=0.85,
+                risk_level=5
+            ),
+            "tool_kit": ManufacturingProcess(
+                "tool_kit", "Tool Kit", "Fashion a roll of improvised tools",
+                required_materials={"metal_scrap": 8, "rope": 1},
+                required_skills={"crafting": 12},
+                required_time=1440,
+                required_workers=2,
+                output_item="tools",
+                location_id="workshop",
+                difficulty=5,
+                success_chance=0.8,
+                risk_level=3
+            ),
+        }
+    
     @staticmethod
     def get_locations() -> Dict[str, Location]:
         """Get all game locations"""
@@ -1204,7 +1745,8 @@ class GameData:
                     "greeting": ["Hey there, cellmate.", "What's up?", "Need something?"],
                     "help": ["I can show you around if you want.", "Been here 5 years, I know the drill."],
                     "advice": ["Keep your head down and don't trust anyone too quickly."]
-                }
+                },
+                skills={"cooking": 20, "crafting": 35, "strength": 45, "intelligence": 50, "planning": 30}
             ),
             "cook_joe": NPC(
                 "cook_joe", "Joe the Cook",
@@ -1214,18 +1756,61 @@ class GameData:
                 dialogue={
                     "greeting": ["What do you want?", "Make it quick, I'm busy."],
                     "trade": ["I might have something extra... for the right price."]
-                }
+                },
+                skills={"cooking": 75, "strength": 40, "intelligence": 45, "trading": 50}
             ),
             "gang_leader_rico": NPC(
                 "gang_leader_rico", "Rico",
                 "Leader of Los Hermanos. Respected and feared.",
                 personality={"tough": 90, "loyal": 70, "dangerous": 85},
-                gang=GangType.LOS_HERMANOS,
+                gang=GangType.ETHNIC_CREW,
                 location="yard",
                 dialogue={
                     "greeting": ["You got business with me?", "Speak."],
                     "respect": ["Respect is earned here, not given."]
-                }
+                },
+                skills={"strength": 80, "brawling": 70, "intelligence": 55, "leadership": 75}
+            ),
+            "inmate_tony": NPC(
+                "inmate_tony", "Tony",
+                "A wiry lifer who has worked every kitchen shift going.",
+                personality={"friendly": 50, "practical": 70},
+                location="cafeteria",
+                dialogue={
+                    "greeting": ["Tray's that way.", "You new? Grab a seat."]
+                },
+                skills={"cooking": 55, "strength": 35, "intelligence": 35}
+            ),
+            "inmate_carlos": NPC(
+                "inmate_carlos", "Carlos",
+                "Quiet, neat and always first in the laundry queue.",
+                personality={"quiet": 70, "trustworthy": 55},
+                location="cafeteria",
+                dialogue={
+                    "greeting": ["...", "Hey."]
+                },
+                skills={"cooking": 20, "strength": 40, "intelligence": 45, "crafting": 30}
+            ),
+            "inmate_mike": NPC(
+                "inmate_mike", "Mike",
+                "A hulking regular on the yard weight benches.",
+                personality={"tough": 75, "loyal": 50},
+                gang=GangType.ETHNIC_CREW,
+                location="yard",
+                dialogue={
+                    "greeting": ["Spot me or move.", "What?"]
+                },
+                skills={"strength": 80, "brawling": 55, "crafting": 20, "intelligence": 30}
+            ),
+            "inmate_tyrone": NPC(
+                "inmate_tyrone", "Tyrone",
+                "Former machinist who can fix anything with a file and patience.",
+                personality={"helpful": 60, "practical": 80},
+                location="gym",
+                dialogue={
+                    "greeting": ["Need something fixed?", "Good to see you."]
+                },
+                skills={"crafting": 70, "strength": 50, "intelligence": 55, "planning": 40}
             ),
             "guard_johnson": NPC(
                 "guard_johnson", "Officer Johnson",
@@ -1266,6 +1851,1015 @@ class GameData:
         }
 
 
+class ContentView(MutableMapping):
+    """Copy-on-write view of one shared content table
+    
+    The first time a record is fetched through the view it is deep-copied
+    into the view, so nothing an engine does to a record, however deeply
+    nested, can reach the shared prototypes or another engine.
+    """
+    
+    def __init__(self, prototypes: Mapping[str, Any]):
+        self.prototypes = prototypes
+        self.local: Dict[str, Any] = {}
+        self.deleted: set = set()
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.local:
+            return self.local[key]
+        if key in self.deleted or key not in self.prototypes:
+            raise KeyError(key)
+        record = self.local[key] = GameDatabase.clone(self.prototypes[key])
+        return record
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.local[key] = value
+        self.deleted.discard(key)
+    
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.local.pop(key, None)
+        self.deleted.add(key)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self.local or (key in self.prototypes and key not in self.deleted)
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in self.prototypes:
+            if key not in self.deleted:
+                yield key
+        for key in self.local:
+            if key not in self.prototypes:
+                yield key
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class GameDatabase:
+    """Static game content built once per process and shared between engines
+    
+    The GameData tables are built on first use and frozen behind read-only
+    mappings. Each engine gets ContentViews over them, so creating an engine
+    no longer rebuilds every record. Records only leave the database as deep
+    copies made by the views.
+    """
+    
+    TABLES = {
+        "items": GameData.get_items,
+        "locations": GameData.get_locations,
+        "npcs": GameData.get_npcs,
+        "quests": GameData.get_quests,
+        "recipes": GameData.get_recipes,
+        "processes": GameData.get_processes,
+    }
+    
+    _shared: Optional["GameDatabase"] = None
+    
+    def __init__(self):
+        self.tables: Dict[str, Mapping[str, Any]] = {
+            name: MappingProxyType(builder()) for name, builder in self.TABLES.items()
+        }
+    
+    @classmethod
+    def shared(cls) -> "GameDatabase":
+        """Get the process-wide database, building it on first use"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
+    def view(self, table: str) -> ContentView:
+        """Get a private copy-on-write view of a table"""
+        return ContentView(self.tables[table])
+    
+    @staticmethod
+    def clone(record: Any) -> Any:
+        """Copy a record and everything it contains"""
+        return copy.deepcopy(record)
+
+
+# ============================================================================
+# SAVE FILES
+# ============================================================================
+
+class SaveCodec:
+    """Compact binary encoding for save data
+    
+    A msgpack-style tagged format: ints are zigzag varints, floats are 8-byte
+    doubles and every string is written once to a string table at the front
+    of the record and then referred to by index.
+    """
+    
+    NONE, FALSE, TRUE, INT, FLOAT, STR, LIST, DICT = range(8)
+    
+    @staticmethod
+    def write_varint(out: bytearray, value: int) -> None:
+        """Append an unsigned LEB128 varint"""
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    
+    @staticmethod
+    def read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+        """Read an unsigned LEB128 varint, returning (value, new position)"""
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, pos
+            shift += 7
+    
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        """Encode a JSON-like value (None, bool, int, float, str, list, tuple, dict)"""
+        strings: Dict[str, int] = {}
+        body = bytearray()
+        cls._encode_value(value, body, strings)
+        
+        out = bytearray()
+        cls.write_varint(out, len(strings))
+        for string in strings:
+            raw = string.encode("utf-8")
+            cls.write_varint(out, len(raw))
+            out += raw
+        return bytes(out + body)
+    
+    @classmethod
+    def _encode_value(cls, value: Any, out: bytearray, strings: Dict[str, int]) -> None:
+        if value is None:
+            out.append(cls.NONE)
+        elif value is True:
+            out.append(cls.TRUE)
+        elif value is False:
+            out.append(cls.FALSE)
+        elif isinstance(value, int):
+            out.append(cls.INT)
+            cls.write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+        elif isinstance(value, float):
+            out.append(cls.FLOAT)
+            out += struct.pack("<d", value)
+        elif isinstance(value, str):
+            out.append(cls.STR)
+            cls.write_varint(out, strings.setdefault(value, len(strings)))
+        elif isinstance(value, (list, tuple)):
+            out.append(cls.LIST)
+            cls.write_varint(out, len(value))
+            for item in value:
+                cls._encode_value(item, out, strings)
+        elif isinstance(value, dict):
+            out.append(cls.DICT)
+            cls.write_varint(out, len(value))
+            for key, item in value.items():
+                cls._encode_value(key, out, strings)
+                cls._encode_value(item, out, strings)
+        else:
+            raise TypeError(f"Cannot encode {type(value).__name__} in a save file")
+    
+    @classmethod
+    def decode(cls, data: bytes) -> Any:
+        """Decode a value produced by encode()"""
+        count, pos = cls.read_varint(data, 0)
+        strings = []
+        for _ in range(count):
+            length, pos = cls.read_varint(data, pos)
+            strings.append(data[pos:pos + length].decode("utf-8"))
+            pos += length
+        value, _ = cls._decode_value(data, pos, strings)
+        return value
+    
+    @classmethod
+    def _decode_value(cls, data: bytes, pos: int, strings: List[str]) -> Tuple[Any, int]:
+        tag = data[pos]
+        pos += 1
+        if tag == cls.NONE:
+            return None, pos
+        if tag == cls.TRUE:
+            return True, pos
+        if tag == cls.FALSE:
+            return False, pos
+        if tag == cls.INT:
+            raw, pos = cls.read_varint(data, pos)
+            return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1), pos
+        if tag == cls.FLOAT:
+            return struct.unpack_from("<d", data, pos)[0], pos + 8
+        if tag == cls.STR:
+            index, pos = cls.read_varint(data, pos)
+            return strings[index], pos
+        if tag == cls.LIST:
+            length, pos = cls.read_varint(data, pos)
+            items = []
+            for _ in range(length):
+                item, pos = cls._decode_value(data, pos, strings)
+                items.append(item)
+            return items, pos
+        if tag == cls.DICT:
+            length, pos = cls.read_varint(data, pos)
+            result = {}
+            for _ in range(length):
+                key, pos = cls._decode_value(data, pos, strings)
+                result[key], pos = cls._decode_value(data, pos, strings)
+            return result, pos
+        raise ValueError(f"Corrupt save data: unknown tag {tag}")
+
+
+class SaveJournal:
+    """Append-only binary save file with delta saves and periodic compaction
+    
+    The file is a header followed by records of (section name, payload, crc).
+    Saving appends only the sections whose encoded payload changed since the
+    last save; loading replays the records and keeps the newest per section.
+    Once the journal holds several times more records than live sections it
+    is rewritten with one record per section.
+    
+    Sections the engine tracks through change notifications are marked clean
+    once written and only need to be built and encoded again after
+    mark_dirty; untracked sections are encoded and compared on every save.
+    """
+    
+    MAGIC = b"YLSV"
+    VERSION = 1
+    HEADER = struct.Struct("<4sH")
+    RECORD = struct.Struct("<HII")  # name length, payload length, crc32
+    
+    def __init__(self, path: str, compact_ratio: int = 4):
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.payloads: Dict[str, bytes] = {}  # newest payload per section
+        self.record_count = 0
+        self.appendable = False  # Only append to a file we have fully read or written
+        self.clean: set = set()  # tracked sections unchanged since they were written
+    
+    def exists(self) -> bool:
+        """Check if the save file exists"""
+        return os.path.exists(self.path)
+    
+    def load(self) -> Dict[str, Any]:
+        """Read the journal and return the newest value of every section"""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        
+        magic, version = self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Not a Yatala Lockdown save file")
+        if version > self.VERSION:
+            raise ValueError(f"Save file version {version} is newer than this game supports")
+        
+        self.payloads = {}
+        self.record_count = 0
+        self.clean.clear()
+        pos = self.HEADER.size
+        while pos + self.RECORD.size <= len(data):
+            name_length, payload_length, crc = self.RECORD.unpack_from(data, pos)
+            start = pos + self.RECORD.size
+            end = start + name_length + payload_length
+            if end > len(data) or zlib.crc32(data[start:end]) != crc:
+                break  # Torn write at the end of the journal; keep what came before
+            name = data[start:start + name_length].decode("utf-8")
+            self.payloads[name] = data[start + name_length:end]
+            self.record_count += 1
+            pos = end
+        self.appendable = pos == len(data)
+        
+        return {name: SaveCodec.decode(payload) for name, payload in self.payloads.items()}
+    
+    def is_dirty(self, name: str) -> bool:
+        """Whether a section has to be included in the next save"""
+        return name not in self.clean
+    
+    def mark_dirty(self, name: Optional[str] = None) -> None:
+        """Mark a tracked section, or with no name every section, as changed"""
+        if name is None:
+            self.clean.clear()
+        else:
+            self.clean.discard(name)
+    
+    def save(self, sections: Dict[str, Any], tracked: Iterable[str] = ()) -> int:
+        """Write the sections that changed since the last save, returning how many were written
+        
+        Sections left out keep their last written value. The tracked sections
+        given are marked clean until mark_dirty is called for them.
+        """
+        changed = {}
+        for name, value in sections.items():
+            payload = SaveCodec.encode(value)
+            if self.payloads.get(name) != payload:
+                changed[name] = payload
+        self.payloads.update(changed)
+        self.clean.update(name for name in tracked if name in sections)
+        
+        if not self.appendable or not self.exists() or self.record_count + len(changed) > self.compact_ratio * len(self.payloads):
+            self.compact()
+        elif changed:
+            with open(self.path, "ab") as f:
+                for name, payload in changed.items():
+                    f.write(self._record(name, payload))
+            self.record_count += len(changed)
+        return len(changed)
+    
+    def compact(self) -> None:
+        """Rewrite the journal with a single record per section"""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION))
+            for name, payload in self.payloads.items():
+                f.write(self._record(name, payload))
+        os.replace(temp_path, self.path)
+        self.record_count = len(self.payloads)
+        self.appendable = True
+    
+    def _record(self, name: str, payload: bytes) -> bytes:
+        """Frame one section as a journal record"""
+        body = name.encode("utf-8") + payload
+        return self.RECORD.pack(len(body) - len(payload), len(payload), zlib.crc32(body)) + body
+
+
+class InputJournal:
+    """Compact binary log of every input a session received
+    
+    The file is a header holding the master seed the engine's random streams
+    started from and the terminal size (screens lay out by it), then one
+    record per input: a varint of the zigzagged key code with a clear low
+    bit, or for a line of typed text a varint of its length with the low bit
+    set followed by the UTF-8 bytes. Inputs are flushed as they are recorded,
+    so a crash still leaves a usable journal. The seed and the inputs replay
+    the session exactly, as long as any save it loads is the same file.
+    """
+    
+    MAGIC = b"YLIJ"
+    VERSION = 1
+    HEADER = struct.Struct("<4sH")
+    
+    def __init__(self, seed: int, height: int = 24, width: int = 80,
+                 inputs: Optional[List[Any]] = None):
+        self.seed = seed
+        self.height = height
+        self.width = width
+        self.inputs: List[Any] = inputs if inputs is not None else []  # key codes and lines of text
+        self.file = None
+    
+    @classmethod
+    def record(cls, path: str, seed: int, height: int, width: int) -> "InputJournal":
+        """Start a journal file for a session"""
+        journal = cls(seed, height, width)
+        out = bytearray(cls.HEADER.pack(cls.MAGIC, cls.VERSION))
+        SaveCodec.write_varint(out, seed * 2 if seed >= 0 else -seed * 2 - 1)
+        SaveCodec.write_varint(out, height)
+        SaveCodec.write_varint(out, width)
+        journal.file = open(path, "wb")
+        journal.file.write(out)
+        journal.file.flush()
+        return journal
+    
+    @classmethod
+    def load(cls, path: str) -> "InputJournal":
+        """Read a journal, ignoring a record cut short by a crash"""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < cls.HEADER.size:
+            raise ValueError(f"{path} is not an input journal")
+        magic, version = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path} is not an input journal")
+        seed, pos = SaveCodec.read_varint(data, cls.HEADER.size)
+        height, pos = SaveCodec.read_varint(data, pos)
+        width, pos = SaveCodec.read_varint(data, pos)
+        journal = cls((seed >> 1) ^ -(seed & 1), height, width)
+        
+        while pos < len(data):
+            try:
+                value, pos = SaveCodec.read_varint(data, pos)
+            except IndexError:
+                break
+            if value & 1:
+                length = value >> 1
+                if pos + length > len(data):
+                    break
+                journal.inputs.append(data[pos:pos + length].decode("utf-8"))
+                pos += length
+            else:
+                key = value >> 1
+                journal.inputs.append((key >> 1) ^ -(key & 1))
+        return journal
+    
+    def add(self, value: Any) -> None:
+        """Record a key code or a line of text"""
+        self.inputs.append(value)
+        if not self.file:
+            return
+        out = bytearray()
+        if isinstance(value, str):
+            raw = value.encode("utf-8")
+            SaveCodec.write_varint(out, len(raw) << 1 | 1)
+            out += raw
+        else:
+            SaveCodec.write_varint(out, (value * 2 if value >= 0 else -value * 2 - 1) << 1)
+        self.file.write(out)
+        self.file.flush()
+    
+    def close(self) -> None:
+        """Close the journal file"""
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+# ============================================================================
+# ROUTE PLANNING
+# ============================================================================
+
+MOVE_MINUTES = 5  # time taken to walk between two connected locations
+MINUTES_PER_DAY = 24 * 60
+
+
+class OpeningHours:
+    """When a location can be entered, as merged minute-of-day intervals"""
+    
+    def __init__(self, time_restrictions: Dict[str, Tuple[int, int]]):
+        intervals = []
+        for start, end in time_restrictions.values():
+            start, end = start * 60, end * 60
+            if end > start:
+                intervals.append((start, end))
+            elif end < start:  # Period runs past midnight
+                intervals += [(start, MINUTES_PER_DAY), (0, end)]
+        if not time_restrictions:
+            intervals = [(0, MINUTES_PER_DAY)]
+        
+        self.intervals: List[Tuple[int, int]] = []
+        for start, end in sorted(intervals):
+            if self.intervals and start <= self.intervals[-1][1]:
+                self.intervals[-1] = (self.intervals[-1][0], max(end, self.intervals[-1][1]))
+            else:
+                self.intervals.append((start, end))
+        self.ends = [end for _, end in self.intervals]
+    
+    def is_open(self, total_minutes: int) -> bool:
+        """Check if the location can be entered at an absolute game minute"""
+        minute = total_minutes % MINUTES_PER_DAY
+        i = bisect.bisect_right(self.ends, minute)
+        return i < len(self.intervals) and self.intervals[i][0] <= minute
+    
+    def next_open(self, total_minutes: int) -> Optional[int]:
+        """Earliest absolute game minute at or after the given one when it is open"""
+        if not self.intervals:
+            return None
+        day_start = total_minutes - total_minutes % MINUTES_PER_DAY
+        minute = total_minutes - day_start
+        i = bisect.bisect_right(self.ends, minute)
+        if i == len(self.intervals):
+            return day_start + MINUTES_PER_DAY + self.intervals[0][0]
+        return day_start + max(minute, self.intervals[i][0])
+
+
+@dataclass
+class TravelPlan:
+    """Earliest-arrival route: each step is (location_id, depart minute, arrive minute)"""
+    steps: List[Tuple[str, int, int]]
+    departure: int
+    arrival: int
+    move_minutes: int = MOVE_MINUTES  # walking time per hop of the planner that made it
+    
+    @property
+    def waited(self) -> int:
+        """Minutes spent waiting for locations to open"""
+        return self.arrival - self.departure - len(self.steps) * self.move_minutes
+
+
+class RoutePlanner:
+    """Time-dependent route search over location connections
+    
+    Opening hours are compiled once per location into interval tables. A query
+    is a single Dijkstra over arrival times: moving into a location waits at
+    the current one until the destination next opens, so the result is the
+    earliest arrival including any waits.
+    """
+    
+    def __init__(self, locations: Mapping[str, Location], move_minutes: int = MOVE_MINUTES):
+        self.locations = locations
+        self.move_minutes = move_minutes
+        self.invalidate()
+    
+    def invalidate(self) -> None:
+        """Recompile the tables after connections or opening hours change"""
+        self.hours: Dict[str, OpeningHours] = {
+            loc_id: OpeningHours(location.time_restrictions) for loc_id, location in self.locations.items()
+        }
+        self.edges: Dict[str, List[str]] = {
+            loc_id: [c for c in location.connections if c in self.hours]
+            for loc_id, location in self.locations.items()
+        }
+    
+    def is_open(self, location_id: str, total_minutes: int) -> bool:
+        """Check if a location can be entered at an absolute game minute"""
+        hours = self.hours.get(location_id)
+        return hours is not None and hours.is_open(total_minutes)
+    
+    def plan(self, start: str, destination: str, now: int) -> Optional[TravelPlan]:
+        """Earliest-arrival route from start to destination leaving at or after now"""
+        if start not in self.edges or destination not in self.edges:
+            return None
+        arrival, previous = self._search(start, now, destination)
+        if destination not in arrival:
+            return None
+        return self._route(start, destination, now, arrival, previous)
+    
+    def plan_all(self, start: str, now: int) -> Dict[str, TravelPlan]:
+        """Earliest-arrival routes from start to every reachable location, from one search"""
+        if start not in self.edges:
+            return {}
+        arrival, previous = self._search(start, now)
+        return {loc_id: self._route(start, loc_id, now, arrival, previous)
+                for loc_id in arrival if loc_id != start}
+    
+    def _search(self, start: str, now: int,
+                destination: Optional[str] = None) -> Tuple[Dict[str, int], Dict[str, Tuple[str, int]]]:
+        """Dijkstra over arrival times, stopping early once destination is settled"""
+        arrival = {start: now}
+        previous: Dict[str, Tuple[str, int]] = {}  # location: (came from, departed at)
+        queue = [(now, start)]
+        while queue:
+            time_here, loc_id = heapq.heappop(queue)
+            if loc_id == destination:
+                break
+            if time_here > arrival[loc_id]:
+                continue
+            for neighbour in self.edges[loc_id]:
+                depart = self.hours[neighbour].next_open(time_here)
+                if depart is None:
+                    continue
+                arrive = depart + self.move_minutes
+                if arrive < arrival.get(neighbour, arrive + 1):
+                    arrival[neighbour] = arrive
+                    previous[neighbour] = (loc_id, depart)
+                    heapq.heappush(queue, (arrive, neighbour))
+        return arrival, previous
+    
+    def _route(self, start: str, destination: str, now: int, arrival: Dict[str, int],
+               previous: Dict[str, Tuple[str, int]]) -> TravelPlan:
+        """Walk the search's back-pointers into a plan"""
+        steps = []
+        loc_id = destination
+        while loc_id != start:
+            came_from, depart = previous[loc_id]
+            steps.append((loc_id, depart, arrival[loc_id]))
+            loc_id = came_from
+        steps.reverse()
+        return TravelPlan(steps, now, arrival[destination], self.move_minutes)
+
+
+# ============================================================================
+# CRAFTING
+# ============================================================================
+
+class CraftingIndex:
+    """Inverted index from ingredients and skills to recipes, with a live craftable set
+    
+    Each recipe keeps a count of unmet requirements (unknown recipe, missing
+    ingredients, skills too low). The index listens to the player's changes,
+    and an item or skill change only revisits the recipes that use it, so the
+    craftable set is always current and reading it costs nothing. Energy is
+    still checked by Player.can_craft at crafting time, since it changes with
+    almost every action. The unmet recipe and skill requirements are also
+    counted on their own: the usable set holds the recipes the player could
+    run given the ingredients, which is what the crafting planner chains.
+    """
+    
+    def __init__(self, recipes: Mapping[str, CraftingRecipe]):
+        self.recipes = recipes
+        self.by_item: Dict[str, List[Tuple[str, int]]] = defaultdict(list)  # item id: (recipe id, quantity)
+        self.by_skill: Dict[str, List[Tuple[str, int]]] = defaultdict(list)  # skill: (recipe id, level)
+        for recipe_id, recipe in recipes.items():
+            for item_id, quantity in recipe.required_items.items():
+                self.by_item[item_id].append((recipe_id, quantity))
+            for skill_name, level in recipe.required_skills.items():
+                self.by_skill[skill_name].append((recipe_id, level))
+        
+        self.player: Optional[Player] = None
+        self.met: Dict[Tuple[str, str, str], bool] = {}  # (recipe id, kind, key): requirement met
+        self.unmet: Dict[str, int] = {}
+        self.unmet_skills: Dict[str, int] = {}  # unmet recipe and skill requirements only
+        self.craftable: set = set()
+        self.usable: set = set()
+    
+    def attach(self, player: Player) -> None:
+        """Start tracking a player, computing every recipe's state once"""
+        if self.player and self.on_change in self.player.change_listeners:
+            self.player.change_listeners.remove(self.on_change)
+        self.player = player
+        player.change_listeners.append(self.on_change)
+        
+        self.met.clear()
+        self.craftable.clear()
+        for recipe_id, recipe in self.recipes.items():
+            self.met[(recipe_id, "recipe", recipe_id)] = recipe_id in player.known_recipes
+            for item_id, quantity in recipe.required_items.items():
+                self.met[(recipe_id, "item", item_id)] = player.inventory.count(item_id) >= quantity
+            for skill_name, level in recipe.required_skills.items():
+                self.met[(recipe_id, "skill", skill_name)] = player.get_effective_skill(skill_name) >= level
+        
+        self.unmet = defaultdict(int)
+        self.unmet_skills = defaultdict(int)
+        for (recipe_id, kind, _), met in self.met.items():
+            self.unmet[recipe_id] += not met
+            if kind != "item":
+                self.unmet_skills[recipe_id] += not met
+        self.craftable = {recipe_id for recipe_id in self.recipes if not self.unmet[recipe_id]}
+        self.usable = {recipe_id for recipe_id in self.recipes if not self.unmet_skills[recipe_id]}
+    
+    def on_change(self, kind: str, key: str, value: int) -> None:
+        """Update the recipes affected by one item, skill or recipe change"""
+        if kind == "item":
+            affected = self.by_item.get(key, ())
+        elif kind == "skill":
+            affected = self.by_skill.get(key, ())
+        elif kind == "recipe" and key in self.recipes:
+            affected = [(key, 1)]
+        else:
+            return
+        
+        for recipe_id, needed in affected:
+            requirement = (recipe_id, kind, key)
+            now_met = value >= needed
+            if now_met == self.met[requirement]:
+                continue
+            self.met[requirement] = now_met
+            self.unmet[recipe_id] += -1 if now_met else 1
+            if self.unmet[recipe_id]:
+                self.craftable.discard(recipe_id)
+            else:
+                self.craftable.add(recipe_id)
+            if kind != "item":
+                self.unmet_skills[recipe_id] += -1 if now_met else 1
+                if self.unmet_skills[recipe_id]:
+                    self.usable.discard(recipe_id)
+                else:
+                    self.usable.add(recipe_id)
+    
+    def craftable_recipes(self) -> List[CraftingRecipe]:
+        """Recipes the player has everything for, by name"""
+        return sorted((self.recipes[recipe_id] for recipe_id in self.craftable), key=lambda r: r.name)
+    
+    def recipes_using(self, item_id: str) -> List[CraftingRecipe]:
+        """Recipes that take an item as an ingredient"""
+        return [self.recipes[recipe_id] for recipe_id, _ in self.by_item.get(item_id, ())]
+
+
+@dataclass
+class ProductionOption:
+    """One way of making an item: a crafting recipe or a manufacturing process"""
+    kind: str  # "recipe" or "process"
+    id: str
+    name: str
+    inputs: Dict[str, int]
+    minutes: int
+    output_item: str
+    output_quantity: int
+    success_chance: float
+
+
+@dataclass
+class ChainStep:
+    """A production step: successful runs needed and the attempts expected to get them"""
+    option: ProductionOption
+    runs: int
+    attempts: float
+
+
+@dataclass
+class CraftingPlan:
+    """Full production chain for a quantity of an item, ingredients first"""
+    item_id: str
+    quantity: int
+    steps: List[ChainStep]
+    from_stock: Dict[str, int]  # item id: quantity taken from the inventory
+    missing: Dict[str, int]  # item id: base materials still needed
+    expected_cost: float  # value of everything consumed, in durries
+    expected_minutes: float
+    
+    @property
+    def feasible(self) -> bool:
+        """Check if the inventory already holds everything the chain needs"""
+        return bool(self.steps) and not self.missing
+
+
+class CraftingPlanner:
+    """Cheapest or fastest production chains over the recipe DAG
+    
+    Every item is either a base material (worth its value, made in no time)
+    or the output of recipes and manufacturing processes. The unit cost and
+    time of an item is the best option's inputs plus its own time, divided by
+    its success chance (expected attempts) and output quantity. Results are
+    memoised per item, so each item is solved once however many chains use it.
+    A result reached by cutting a recipe cycle at an item still being solved
+    further up is not memoised, since from another root it may be cheaper.
+    """
+    
+    OBJECTIVES = ("cost", "time")
+    
+    def __init__(self, items: Mapping[str, Item], recipes: Mapping[str, CraftingRecipe],
+                 processes: Optional[Mapping[str, ManufacturingProcess]] = None):
+        self.items = items
+        self.producers: Dict[str, List[ProductionOption]] = defaultdict(list)
+        for recipe in recipes.values():
+            self.producers[recipe.output_item].append(ProductionOption(
+                "recipe", recipe.id, recipe.name, recipe.required_items, recipe.required_time,
+                recipe.output_item, recipe.output_quantity, recipe.success_chance))
+        for process in (processes or {}).values():
+            self.producers[process.output_item].append(ProductionOption(
+                "process", process.id, process.name, process.required_materials, process.required_time,
+                process.output_item, process.output_quantity, process.success_chance))
+        
+        self.usable: Optional[frozenset] = None
+        self.memo: Dict[Tuple[str, str], Tuple[float, float, Optional[ProductionOption]]] = {}
+    
+    def set_usable(self, option_ids: Optional[Iterable[str]]) -> None:
+        """Restrict planning to some recipe/process ids (None allows all), resetting the memo on change"""
+        usable = frozenset(option_ids) if option_ids is not None else None
+        if usable != self.usable:
+            self.usable = usable
+            self.memo.clear()
+    
+    def unit(self, item_id: str, objective: str = "cost") -> Tuple[float, float, Optional[ProductionOption]]:
+        """Expected (cost, minutes, best option) to obtain one unit of an item"""
+        return self._solve(item_id, objective, {})[0]
+    
+    def _solve(self, item_id: str, objective: str,
+               visiting: Dict[str, int]) -> Tuple[Tuple[float, float, Optional[ProductionOption]], int]:
+        """Solve an item, returning its result and the shallowest depth of the
+        items being solved that the result relied on (a cycle cut there)"""
+        key = (item_id, objective)
+        if key in self.memo:
+            return self.memo[key], len(visiting)
+        if item_id in visiting:
+            return (math.inf, math.inf, None), visiting[item_id]  # Recipe cycle
+        
+        depth = visiting[item_id] = len(visiting)
+        low = depth
+        item = self.items.get(item_id)
+        best = (float(item.value) if item else math.inf, 0.0, None)
+        produced = False
+        for option in self.producers.get(item_id, ()):
+            if self.usable is not None and option.id not in self.usable or option.success_chance <= 0:
+                continue
+            cost, minutes = 0.0, float(option.minutes)
+            for input_id, quantity in option.inputs.items():
+                (input_cost, input_minutes, _), input_low = self._solve(input_id, objective, visiting)
+                low = min(low, input_low)
+                cost += quantity * input_cost
+                minutes += quantity * input_minutes
+            scale = 1 / (option.success_chance * option.output_quantity)
+            candidate = (cost * scale, minutes * scale, option)
+            rank = (0, 1) if objective == "cost" else (1, 0)
+            if not produced or tuple(candidate[i] for i in rank) < tuple(best[i] for i in rank):
+                best = candidate
+                produced = True
+        
+        del visiting[item_id]
+        if low >= depth and not math.isinf(best[0]):
+            self.memo[key] = best
+        return best, low
+    
+    def plan(self, item_id: str, quantity: int, stock: Dict[str, int], objective: str = "cost") -> CraftingPlan:
+        """Expand the best chain for a quantity, drawing on stock for everything but the target"""
+        ledger = dict(stock)
+        from_stock: Dict[str, int] = defaultdict(int)
+        missing: Dict[str, int] = defaultdict(int)
+        steps: Dict[str, ChainStep] = {}
+        
+        def obtain(needed_id: str, needed: int, use_stock: bool = True) -> None:
+            if use_stock:
+                taken = min(ledger.get(needed_id, 0), needed)
+                if taken:
+                    ledger[needed_id] -= taken
+                    from_stock[needed_id] += taken
+                    needed -= taken
+            if needed <= 0:
+                return
+            
+            option = self.unit(needed_id, objective)[2]
+            if option is None:
+                missing[needed_id] += needed
+                return
+            
+            runs = math.ceil(needed / option.output_quantity)
+            attempts = runs / option.success_chance
+            for input_id, input_quantity in option.inputs.items():
+                obtain(input_id, math.ceil(input_quantity * attempts))
+            ledger[needed_id] = ledger.get(needed_id, 0) + runs * option.output_quantity - needed
+            
+            step = steps.get(option.id)
+            if step:
+                step.runs += runs
+                step.attempts += attempts
+            else:
+                steps[option.id] = ChainStep(option, runs, attempts)  # Inserted after its inputs
+        
+        obtain(item_id, quantity, use_stock=False)
+        consumed = list(from_stock.items()) + list(missing.items())
+        expected_cost = sum(qty * (self.items[i].value if i in self.items else 0) for i, qty in consumed)
+        expected_minutes = sum(step.attempts * step.option.minutes for step in steps.values())
+        return CraftingPlan(item_id, quantity, list(steps.values()), dict(from_stock), dict(missing),
+                            expected_cost, expected_minutes)
+
+
+# ============================================================================
+# MANUFACTURING
+# ============================================================================
+
+PRODUCTION_BUST_CHANCE = 0.02  # chance per risk level that guards seize a run
+
+
+@dataclass
+class ProductionJob:
+    """A queued manufacturing order of one or more runs of a process"""
+    id: int
+    process: ManufacturingProcess
+    runs: int  # runs not yet started
+    state: str = "queued"  # queued, blocked (short of materials), running, done
+    produced: int = 0  # output items delivered to the stash
+    failed: int = 0
+    busted: int = 0
+    due: Optional[int] = None  # absolute minute the current run finishes
+    event: Optional[ScheduledEvent] = field(default=None, repr=False)
+
+
+class ProductionScheduler:
+    """Concurrent manufacturing jobs sharing a stash of materials and a worker pool
+    
+    Jobs start in submission order as soon as the stash holds a run's
+    materials and enough workers are free. A started run reserves both and
+    schedules its completion on the game Scheduler, so nothing is polled
+    between events and skipping days costs only the completions inside them.
+    Finished goods go back into the stash, where later jobs can use them.
+    A job needing more workers than the whole pool is refused at submission.
+    """
+    
+    def __init__(self, scheduler: Scheduler, workers: int = 1, rng: random.Random = random):
+        self.scheduler = scheduler
+        self.rng = rng
+        self.workers = workers
+        self.free_workers = workers
+        self.stash: Dict[str, int] = defaultdict(int)
+        self.jobs: List[ProductionJob] = []  # unfinished jobs in submission order
+        self.sequence = 0
+        self.listeners: List[Callable[[str, ProductionJob], None]] = []
+    
+    def notify(self, kind: str, job: ProductionJob) -> None:
+        """Tell listeners about a job event (started, shortage, understaffed, completed, failed, busted, done)"""
+        for listener in self.listeners:
+            listener(kind, job)
+    
+    def submit(self, process: ManufacturingProcess, runs: int = 1) -> ProductionJob:
+        """Queue runs of a process, starting them now if possible"""
+        if process.required_workers > self.workers:
+            raise ValueError(f"{process.name} needs {process.required_workers} workers, "
+                             f"the pool has {self.workers}")
+        self.sequence += 1
+        job = ProductionJob(self.sequence, process, runs)
+        self.jobs.append(job)
+        self.dispatch()
+        return job
+    
+    def cancel(self, job: ProductionJob) -> None:
+        """Drop a job, returning the materials and workers of a run in progress"""
+        if job not in self.jobs:
+            return
+        if job.state == "running":
+            self.scheduler.cancel(job.event)
+            self.free_workers += job.process.required_workers
+            for item_id, quantity in job.process.required_materials.items():
+                self.stash[item_id] += quantity
+        self.jobs.remove(job)
+        self.dispatch()
+    
+    def add_stock(self, item_id: str, quantity: int) -> None:
+        """Put materials in the stash"""
+        self.stash[item_id] += quantity
+        self.dispatch()
+    
+    def take_stock(self, item_id: str, quantity: int) -> int:
+        """Take up to a quantity of an item out of the stash, returning how many were taken"""
+        taken = min(quantity, self.stash.get(item_id, 0))
+        if taken:
+            self.stash[item_id] -= taken
+            if not self.stash[item_id]:
+                del self.stash[item_id]
+        return taken
+    
+    def set_workers(self, workers: int) -> None:
+        """Resize the worker pool; runs in progress keep their workers
+        
+        Waiting jobs the smaller pool can no longer staff stay queued for the
+        crew to come back, and listeners are told they are understaffed.
+        """
+        for job in self.jobs:
+            if job.state != "running" and workers < job.process.required_workers <= self.workers:
+                self.notify("understaffed", job)
+        self.free_workers += workers - self.workers
+        self.workers = workers
+        self.dispatch()
+    
+    def dispatch(self) -> None:
+        """Start every waiting job the stash and free workers allow"""
+        for job in self.jobs:
+            if job.state == "running" or job.runs <= 0:
+                continue
+            process = job.process
+            if any(self.stash.get(item_id, 0) < quantity for item_id, quantity in process.required_materials.items()):
+                if job.state != "blocked":
+                    job.state = "blocked"
+                    self.notify("shortage", job)
+                continue
+            if process.required_workers > self.free_workers:
+                job.state = "queued"
+                continue
+            self._start(job, process.required_time)
+    
+    def _start(self, job: ProductionJob, minutes: int) -> None:
+        """Reserve a run's materials and workers and schedule its completion"""
+        process = job.process
+        for item_id, quantity in process.required_materials.items():
+            self.take_stock(item_id, quantity)
+        self.free_workers -= process.required_workers
+        job.runs -= 1
+        job.state = "running"
+        job.due = self.scheduler.game_time.total_minutes + minutes
+        job.event = self.scheduler.schedule_at(job.due, lambda: self._finish(job))
+        self.notify("started", job)
+    
+    def _finish(self, job: ProductionJob) -> None:
+        """Settle a finished run and start whatever can run next"""
+        process = job.process
+        self.free_workers += process.required_workers
+        job.event = None
+        job.due = None
+        
+        if self.rng.random() < process.risk_level * PRODUCTION_BUST_CHANCE:
+            job.busted += 1
+            self.notify("busted", job)
+        elif self.rng.random() < process.success_chance:
+            job.produced += process.output_quantity
+            self.stash[process.output_item] += process.output_quantity
+            self.notify("completed", job)
+        else:
+            job.failed += 1
+            self.notify("failed", job)
+        
+        if job.runs > 0:
+            job.state = "queued"
+        else:
+            job.state = "done"
+            self.jobs.remove(job)
+            self.notify("done", job)
+        self.dispatch()
+    
+    def needed_materials(self) -> Dict[str, int]:
+        """Materials still required by the runs waiting to start"""
+        needed: Dict[str, int] = defaultdict(int)
+        for job in self.jobs:
+            waiting = job.runs
+            for item_id, quantity in job.process.required_materials.items():
+                needed[item_id] += quantity * waiting
+        return needed
+    
+    def to_state(self) -> Dict[str, Any]:
+        """Serialise the stash and jobs for a save file"""
+        now = self.scheduler.game_time.total_minutes
+        return {
+            "stash": dict(self.stash),
+            "jobs": [
+                {"process": job.process.id, "runs": job.runs, "produced": job.produced,
+                 "failed": job.failed, "busted": job.busted,
+                 "remaining": job.due - now if job.state == "running" else None}
+                for job in self.jobs
+            ],
+        }
+    
+    def restore(self, state: Dict[str, Any], processes: Mapping[str, ManufacturingProcess]) -> None:
+        """Rebuild the stash and jobs from a save, rescheduling runs in progress"""
+        self.stash = defaultdict(int, state.get("stash", {}))
+        self.jobs = []
+        self.free_workers = self.workers
+        for job_data in state.get("jobs", []):
+            process = processes.get(job_data["process"])
+            if not process:
+                continue
+            self.sequence += 1
+            job = ProductionJob(self.sequence, process, job_data["runs"], produced=job_data["produced"],
+                                failed=job_data["failed"], busted=job_data["busted"])
+            self.jobs.append(job)
+            if job_data["remaining"] is not None:
+                job.runs += 1  # _start counts the run again
+                for item_id, quantity in process.required_materials.items():
+                    self.stash[item_id] += quantity
+                self._start(job, job_data["remaining"])
+        self.dispatch()
+
+
 # ============================================================================
 # GAME ENGINE
 # ============================================================================
@@ -1273,28 +2867,55 @@ class GameData:
 class GameEngine:
     """Main game engine"""
     
-    def __init__(self):
+    # player change kind: save section it dirties
+    TRACKED_SECTIONS = {
+        "item": "inventory",
+        "skill": "progress",
+        "recipe": "progress",
+        "relationship": "progress",
+    }
+    
+    def __init__(self, seed: Optional[int] = None):
         self.player: Optional[Player] = None
         self.game_time = GameTime()
+        self.random = RandomStreams(seed)
         self.current_state = GameState.MAIN_MENU
-        self.locations: Dict[str, Location] = GameData.get_locations()
-        self.npcs: Dict[str, NPC] = GameData.get_npcs()
-        self.items: Dict[str, Item] = GameData.get_items()
-        self.quests: Dict[str, Quest] = GameData.get_quests()
+        database = GameDatabase.shared()
+        self.locations: MutableMapping[str, Location] = database.view("locations")
+        self.npcs: MutableMapping[str, NPC] = database.view("npcs")
+        self.items: MutableMapping[str, Item] = database.view("items")
+        self.quests: MutableMapping[str, Quest] = database.view("quests")
+        self.recipes: MutableMapping[str, CraftingRecipe] = database.view("recipes")
+        self.crafting = CraftingIndex(self.recipes)
+        self.processes: MutableMapping[str, ManufacturingProcess] = database.view("processes")
+        self.crafting_planner = CraftingPlanner(self.items, self.recipes, self.processes)
         self.message_log: List[str] = []
+        self.routes = RoutePlanner(self.locations)
+        self.roster: Optional["WorkRoster"] = None
+        self.events = EventSystem(self)
+        self.save_journals: Dict[int, SaveJournal] = {}
         self.save_dir = os.path.expanduser("~/.local/share/prison_break")
         self.config_dir = os.path.expanduser("~/.config/prison_break")
         self._ensure_directories()
+        self.reset_schedule()
     
     def _ensure_directories(self) -> None:
         """Create necessary directories"""
         os.makedirs(self.save_dir, exist_ok=True)
         os.makedirs(self.config_dir, exist_ok=True)
     
-    def new_game(self, player_name: str) -> None:
-        """Start a new game"""
+    def new_game(self, player_name: str, seed: Optional[int] = None) -> None:
+        """Start a new game, replayable from its seed
+        
+        Without a seed the game's seed is derived from the current streams,
+        so every game of a session replays from the engine's first seed.
+        """
+        self.random.reset(seed if seed is not None else self.random.derive("new_game"))
         self.player = Player(player_name)
+        self.player.rng = self.random.get("player")
+        self.watch_player()
         self.game_time = GameTime()
+        self.reset_schedule()
         self.message_log = []
         self.add_message(f"Welcome to prison, {player_name}.")
         self.add_message("Your sentence begins now...")
@@ -1303,6 +2924,13 @@ class GameEngine:
         self.player.add_item(self.items["food_tray"])
         self.player.cigarettes = 5
         
+        # Everyone inside knows how to make the basics
+        self.crafting.attach(self.player)
+        for recipe_id in ("shank", "rope"):
+            self.player.learn_recipe(recipe_id)
+        self.player.manufacturing_operations.append("rope_line")
+        self.attach_roster()
+        
         # Activate tutorial quest
         self.quests["tutorial_quest"].status = QuestStatus.ACTIVE
     
@@ -1312,21 +2940,290 @@ class GameEngine:
         if len(self.message_log) > 100:
             self.message_log.pop(0)
     
+    def reset_schedule(self) -> None:
+        """Rebuild the scheduler for the current clock"""
+        self.scheduler = Scheduler(self.game_time)
+        self.scheduler.schedule_every(60, self.hourly_tick)
+        self.scheduler.schedule_every(MINUTES_PER_DAY, self.daily_roster, offset=6 * 60)
+        self.manufacturing = ProductionScheduler(self.scheduler, self.crew_size(), self.random.get("manufacturing"))
+        self.manufacturing.listeners.append(self.on_production)
+    
     def advance_time(self, minutes: int) -> None:
-        """Advance game time"""
-        self.game_time.advance(minutes)
+        """Advance game time, firing scheduled and random events that fall due"""
+        self.skip_time(minutes, interruptible=False)
+    
+    def skip_time(self, minutes: int, interruptible: bool = True) -> int:
+        """Fast-forward up to a number of minutes, returning how many passed
         
-        # Update player status
-        if self.player:
-            hours = minutes // 60
-            if hours > 0:
-                self.player.update_status_effects(hours)
-                self.player.hunger = min(100, self.player.hunger + hours * 2)
-                self.player.hygiene = max(0, self.player.hygiene - hours)
-                
-                # Regenerate energy if resting
-                if self.game_time.hour >= 22 or self.game_time.hour < 6:
-                    self.player.restore_energy(hours * 10)
+        Random events are sampled by their next arrival time rather than
+        rolled per tick, so a long skip costs one draw per event or change
+        of encounter context. An interruptible skip stops at the first event.
+        """
+        elapsed = 0
+        while elapsed < minutes:
+            arrival = self.events.next_event(minutes - elapsed)
+            if arrival is None:
+                self.scheduler.advance(minutes - elapsed)
+                return minutes
+            
+            offset, event = arrival
+            self.scheduler.advance(offset)
+            elapsed += offset
+            self.events.fire(event)
+            if interruptible:
+                break
+        return elapsed
+    
+    def hourly_tick(self) -> None:
+        """Update player needs on every hour boundary"""
+        if not self.player:
+            return
+        
+        self.player.hunger = min(100, self.player.hunger + 2)
+        self.player.hygiene = max(0, self.player.hygiene - 1)
+        
+        # Regenerate energy if resting
+        if self.game_time.hour >= 22 or self.game_time.hour < 6:
+            self.player.restore_energy(10)
+    
+    def apply_status_effect(self, effect: StatusEffect) -> None:
+        """Give the player a status effect and schedule its expiry
+        
+        This is the only way effects should be added: the scheduler is what
+        takes them off again. A fresh effect replaces one of the same name,
+        and an effect restored from a save keeps its original expiry.
+        """
+        if not self.player:
+            return
+        
+        if effect.expires_at is None:
+            effect.expires_at = self.game_time.total_minutes + effect.duration * 60
+        self.player.remove_status_effect(effect.name)
+        self.player.add_status_effect(effect)
+        self.scheduler.schedule_at(effect.expires_at, lambda: self.expire_status_effect(effect))
+    
+    def expire_status_effect(self, effect: StatusEffect) -> None:
+        """Scheduled end of a status effect; a no-op if it was replaced or removed"""
+        if self.player and any(e is effect for e in self.player.status_effects):
+            self.player.status_effects = [e for e in self.player.status_effects if e is not effect]
+            self.player.recompute_effects()
+            self.add_message(f"{effect.name} has worn off.")
+    
+    def use_consumable(self, item: Item) -> bool:
+        """Apply a consumable's effects and remove one from the inventory"""
+        if not self.player or item.item_type != ItemType.CONSUMABLE:
+            return False
+        
+        for effect, value in item.effects.items():
+            if effect == "hunger":
+                self.player.hunger = max(0, self.player.hunger + value)
+            elif effect == "health":
+                self.player.heal(value)
+            elif effect == "energy":
+                self.player.restore_energy(value)
+        
+        self.player.remove_item(item.id, 1)
+        return True
+    
+    def craft(self, recipe_id: str) -> Optional[Item]:
+        """Craft a recipe, spending its time; returns the item or None on failure"""
+        recipe = self.recipes.get(recipe_id)
+        if not self.player or not recipe or not self.player.can_craft(recipe, self.items):
+            self.add_message("You can't craft that right now.")
+            return None
+        
+        crafted = self.player.craft_item(recipe, self.items)
+        self.advance_time(recipe.required_time)
+        if crafted:
+            self.add_message(f"You craft a {crafted.name}.")
+        else:
+            self.add_message(f"Your attempt at a {recipe.name} falls apart.")
+        return crafted
+    
+    def plan_crafting(self, item_id: str, quantity: int = 1, objective: str = "cost") -> Optional[CraftingPlan]:
+        """Plan a full production chain using the recipes and processes the player can actually use"""
+        if not self.player:
+            return None
+        self.crafting_planner.set_usable(
+            list(self.crafting.usable) +
+            [process.id for process in self.processes.values() if self.can_run_process(process)]
+        )
+        stock = {item_id: self.player.inventory.count(item_id) for item_id in self.player.inventory.quantities}
+        return self.crafting_planner.plan(item_id, quantity, stock, objective)
+    
+    def craft_all(self, item_id: str, quantity: int = 1, objective: str = "cost") -> Tuple[int, str]:
+        """Run a whole production chain as one batch, returning how many of the item were made
+        
+        Every attempt is rolled against a ledger of the inventory and the net
+        changes are applied once at the end, with the clock advanced once for
+        the whole batch.
+        """
+        plan = self.plan_crafting(item_id, quantity, objective)
+        if not plan or not plan.steps:
+            return 0, "You don't know how to make that."
+        if any(step.option.kind != "recipe" for step in plan.steps):
+            return 0, "Part of that chain needs a manufacturing operation."
+        if plan.missing:
+            needs = ", ".join(f"{qty}x {self.items[i].name if i in self.items else i}" for i, qty in plan.missing.items())
+            return 0, f"You're short of {needs}."
+        
+        player = self.player
+        stock = {i: player.inventory.count(i) for i in player.inventory.quantities}
+        ledger = dict(stock)
+        rng = player.rng
+        energy = player.current_energy
+        minutes = 0
+        crafted = 0
+        stopped = ""
+        
+        for step in plan.steps:
+            option = step.option
+            energy_cost = option.minutes // 10
+            successes = 0
+            # The target is built to the requested quantity; intermediates to what the chain needs
+            while successes < step.runs:
+                if any(ledger.get(i, 0) < qty for i, qty in option.inputs.items()):
+                    stopped = f"Ran out of materials for {option.name}."
+                    break
+                if energy < energy_cost:
+                    stopped = "Too tired to keep going."
+                    break
+                for input_id, input_quantity in option.inputs.items():
+                    ledger[input_id] -= input_quantity
+                energy -= energy_cost
+                minutes += option.minutes
+                if rng.random() <= option.success_chance:
+                    ledger[option.output_item] = ledger.get(option.output_item, 0) + option.output_quantity
+                    successes += 1
+            crafted += successes
+            if stopped:
+                break
+        
+        # Apply the net inventory change once per item
+        for changed_id in set(stock) | set(ledger):
+            delta = ledger.get(changed_id, 0) - stock.get(changed_id, 0)
+            if delta < 0:
+                player.inventory.remove(changed_id, -delta)
+            elif delta > 0 and changed_id in self.items:
+                prototype = self.items[changed_id]
+                copies = [delta] if prototype.stackable else [1] * delta
+                for copy_quantity in copies:
+                    player.inventory.add(replace(prototype, quantity=copy_quantity))
+        
+        player.current_energy = energy
+        player.stats["items_crafted"] += crafted
+        self.advance_time(minutes)
+        
+        made = max(0, ledger.get(item_id, 0) - stock.get(item_id, 0))
+        name = self.items[item_id].name if item_id in self.items else item_id
+        message = f"Made {made}x {name} in {minutes} minutes. {stopped}".strip()
+        self.add_message(message)
+        return made, message
+    
+    def attach_roster(self) -> None:
+        """Build the inmate work roster for the current player"""
+        self.roster = WorkRoster(self, JobSystem(self).jobs)
+        self.player.change_listeners.append(self.roster.on_change)
+    
+    def daily_roster(self) -> None:
+        """Roll the morning absences and re-staff the manufacturing crew"""
+        if not self.roster:
+            return
+        self.roster.start_day()
+        self.staff_manufacturing()
+    
+    def crew_size(self) -> int:
+        """Workers available for manufacturing: the player plus the rostered crew"""
+        return 1 + len(self.roster.crew()) if self.roster else 1
+    
+    def staff_manufacturing(self, extra: int = 0) -> None:
+        """Ask the roster for enough crew to cover every unfinished manufacturing job, plus extra workers"""
+        if not self.roster:
+            return
+        demand = sum(job.process.required_workers for job in self.manufacturing.jobs) + extra
+        self.roster.set_crew_demand(max(0, demand - 1))
+        self.manufacturing.set_workers(self.crew_size())
+    
+    def can_run_process(self, process: ManufacturingProcess) -> bool:
+        """Check if the player knows a process and has the skills for it"""
+        player = self.player
+        return (process.id in player.manufacturing_operations and
+                all(player.get_effective_skill(skill) >= level for skill, level in process.required_skills.items()))
+    
+    def start_manufacturing(self, process_id: str, runs: int = 1) -> Tuple[bool, str]:
+        """Stash materials from the inventory and queue runs of a process"""
+        process = self.processes.get(process_id)
+        if not self.player or not process:
+            return False, "No such operation."
+        if not self.can_run_process(process):
+            return False, f"You can't run {process.name} yet."
+        if self.player.location != process.location_id:
+            location = self.locations.get(process.location_id)
+            return False, f"That has to be set up in the {location.name if location else process.location_id}."
+        
+        self.staff_manufacturing(process.required_workers)
+        if process.required_workers > self.manufacturing.workers:
+            self.staff_manufacturing()
+            return False, f"{process.name} needs a crew of {process.required_workers}; you can muster {self.manufacturing.workers}."
+        
+        stash = self.manufacturing.stash
+        pending = self.manufacturing.needed_materials()
+        for item_id, quantity in process.required_materials.items():
+            if self.player.inventory.count(item_id) + stash.get(item_id, 0) - pending.get(item_id, 0) < quantity:
+                return False, f"Not enough {self.items[item_id].name if item_id in self.items else item_id}."
+        
+        for item_id, quantity in process.required_materials.items():
+            shortfall = quantity * runs + pending.get(item_id, 0) - stash.get(item_id, 0)
+            moved = min(max(0, shortfall), self.player.inventory.count(item_id))
+            if moved:
+                self.player.remove_item(item_id, moved)
+                self.manufacturing.stash[item_id] += moved
+        
+        self.manufacturing.submit(process, runs)
+        self.staff_manufacturing()
+        return True, f"Queued {runs}x {process.name}."
+    
+    def collect_production(self) -> int:
+        """Move finished goods no queued job needs from the stash into the inventory"""
+        needed = self.manufacturing.needed_materials()
+        outputs = {process.output_item for process in self.processes.values()}
+        collected = 0
+        for item_id in outputs & set(self.manufacturing.stash):
+            collected += self.withdraw_stock(item_id, self.manufacturing.stash[item_id] - needed.get(item_id, 0))
+        return collected
+    
+    def withdraw_stock(self, item_id: str, quantity: int) -> int:
+        """Move up to a quantity of an item from the manufacturing stash into the inventory
+        
+        Materials taken back from the stash are no longer there for the jobs
+        waiting on them, which block until the stash is topped up again.
+        """
+        if not self.player or item_id not in self.items:
+            return 0
+        quantity = self.manufacturing.take_stock(item_id, quantity)
+        prototype = self.items[item_id]
+        copies = [quantity] if prototype.stackable else [1] * quantity
+        for copy_quantity in copies:
+            if copy_quantity:
+                self.player.inventory.add(replace(prototype, quantity=copy_quantity))
+        return quantity
+    
+    def on_production(self, kind: str, job: ProductionJob) -> None:
+        """Report manufacturing progress in the message log"""
+        name = job.process.name
+        if kind == "completed":
+            self.player.stats["items_crafted"] += job.process.output_quantity
+            self.add_message(f"{name}: {job.process.output_quantity} finished and stashed.")
+        elif kind == "failed":
+            self.add_message(f"{name}: the run was botched.")
+        elif kind == "busted":
+            self.add_message(f"{name}: guards raided the operation and seized the run.")
+        elif kind == "shortage":
+            self.add_message(f"{name}: waiting on materials.")
+        elif kind == "understaffed":
+            self.add_message(f"{name}: not enough crew today, waiting.")
+        elif kind == "done":
+            self.staff_manufacturing()
     
     def get_current_location(self) -> Optional[Location]:
         """Get player's current location"""
@@ -1343,53 +3240,128 @@ class GameEngine:
         if not current_loc:
             return False
         
-        if location_id not in current_loc.connections:
+        new_loc = self.locations.get(location_id)
+        if not new_loc or location_id not in current_loc.connections:
             self.add_message("You can't go there from here.")
             return False
         
         # Check time restrictions
-        new_loc = self.locations.get(location_id)
-        if new_loc and new_loc.time_restrictions:
-            current_hour = self.game_time.hour
-            allowed = False
-            for period, (start, end) in new_loc.time_restrictions.items():
-                if start <= current_hour < end:
-                    allowed = True
-                    break
-            if not allowed:
-                self.add_message(f"{new_loc.name} is closed right now.")
-                return False
+        if not self.routes.is_open(location_id, self.game_time.total_minutes):
+            self.add_message(f"{new_loc.name} is closed right now.")
+            return False
         
         self.player.location = location_id
-        self.advance_time(5)  # Moving takes 5 minutes
+        self.advance_time(MOVE_MINUTES)
         self.add_message(f"You move to {new_loc.name}.")
         return True
     
+    def plan_travel(self, location_id: str) -> Optional[TravelPlan]:
+        """Earliest-arrival route from the player's location, waits included"""
+        if not self.player:
+            return None
+        return self.routes.plan(self.player.location, location_id, self.game_time.total_minutes)
+    
+    def plan_all_travel(self) -> Dict[str, TravelPlan]:
+        """Earliest-arrival routes from the player's location to everywhere reachable"""
+        if not self.player:
+            return {}
+        return self.routes.plan_all(self.player.location, self.game_time.total_minutes)
+    
+    def travel_to(self, location_id: str) -> bool:
+        """Walk to any reachable location, waiting wherever the route is closed"""
+        plan = self.plan_travel(location_id)
+        if not plan or not plan.steps:
+            self.add_message("You can't get there from here.")
+            return False
+        
+        for step_id, depart, _ in plan.steps:
+            wait = depart - self.game_time.total_minutes
+            if wait > 0:
+                self.add_message(f"You wait {wait} minutes for {self.locations[step_id].name} to open.")
+                self.advance_time(wait)
+            if not self.move_player(step_id):
+                return False
+        return True
+    
+    def watch_player(self) -> None:
+        """Listen for the player's changes so saves can skip untouched sections"""
+        self.player.change_listeners.append(self.on_player_change)
+        for journal in self.save_journals.values():
+            journal.mark_dirty()
+    
+    def on_player_change(self, kind: str, key: str, value: int) -> None:
+        """Player change listener: mark the save section holding the change dirty"""
+        section = self.TRACKED_SECTIONS.get(kind)
+        if section:
+            for journal in self.save_journals.values():
+                journal.mark_dirty(section)
+    
+    def get_save_journal(self, slot: int) -> SaveJournal:
+        """Get the binary save journal for a slot"""
+        if slot not in self.save_journals:
+            self.save_journals[slot] = SaveJournal(os.path.join(self.save_dir, f"save_{slot}.sav"))
+        return self.save_journals[slot]
+    
     def save_game(self, slot: int = 0) -> bool:
-        """Save game to file"""
+        """Save game to file, writing only the sections that changed"""
         if not self.player:
             return False
         
         try:
-            save_data = {
-                "version": "1.0.0",
-                "timestamp": datetime.now().isoformat(),
+            journal = self.get_save_journal(slot)
+            sections = {
+                "meta": {
+                    "version": "1.1.0",
+                    "timestamp": datetime.now().isoformat(),
+                },
                 "player": {
                     "name": self.player.name,
                     "level": self.player.level,
                     "xp": self.player.xp,
+                    "xp_to_next": self.player.xp_to_next,
                     "attributes": asdict(self.player.attributes),
-                    "skills": asdict(self.player.skills),
+                    "max_health": self.player.max_health,
                     "current_health": self.player.current_health,
+                    "max_energy": self.player.max_energy,
                     "current_energy": self.player.current_energy,
                     "hunger": self.player.hunger,
                     "hygiene": self.player.hygiene,
+                    "stress_level": self.player.stress_level,
+                    "hope_level": self.player.hope_level,
+                    "mental_fatigue": self.player.mental_fatigue,
+                    "mood": self.player.mood,
+                    "medical_conditions": [asdict(c) for c in self.player.medical_conditions],
                     "location": self.player.location,
                     "gang": self.player.gang.name,
+                    "gang_rank": self.player.gang_rank,
+                    "political_standing": {
+                        "overall_influence": self.player.political_standing.overall_influence,
+                        "prison_reputation": self.player.political_standing.prison_reputation,
+                        "guard_relations": self.player.political_standing.guard_relations,
+                        "inmate_respect": self.player.political_standing.inmate_respect,
+                        "corruption_level": self.player.political_standing.corruption_level,
+                        "faction_standing": [
+                            dict(asdict(standing), faction=faction.name)
+                            for faction, standing in self.player.political_standing.faction_standing.items()
+                        ],
+                    },
+                    "crafting_level": self.player.crafting_level,
+                    "manufacturing_level": self.player.manufacturing_level,
+                    "money_laundering_operations": self.player.money_laundering_operations,
+                    "dirty_money": self.player.dirty_money,
+                    "clean_money": self.player.clean_money,
+                    "underground_reputation": self.player.underground_reputation,
+                    "completed_programs": self.player.completed_programs,
+                    "education_level": self.player.education_level,
+                    "vocational_skills": self.player.vocational_skills,
+                    "therapy_sessions": self.player.therapy_sessions,
+                    "parole_progress": self.player.parole_progress,
                     "money": self.player.money,
                     "cigarettes": self.player.cigarettes,
-                    "inventory": [asdict(item) for item in self.player.inventory],
                     "stats": self.player.stats,
+                    "manufacturing_operations": self.player.manufacturing_operations,
+                    "equipment": {slot.value: item.id for slot, item in self.player.equipment.items()},
+                    "status_effects": [asdict(effect) for effect in self.player.status_effects],
                 },
                 "game_time": {
                     "day": self.game_time.day,
@@ -1398,12 +3370,24 @@ class GameEngine:
                 },
                 "quests": {qid: {"status": q.status.name, "progress": q.progress} 
                           for qid, q in self.quests.items()},
+                "manufacturing": self.manufacturing.to_state(),
+                "random": self.random.to_state(),
             }
             
-            save_file = os.path.join(self.save_dir, f"save_{slot}.json")
-            with open(save_file, 'w') as f:
-                json.dump(save_data, f, indent=2)
-            
+            if journal.is_dirty("inventory"):
+                inventory = []
+                for item in self.player.inventory:
+                    item_data = asdict(item)
+                    item_data["item_type"] = item.item_type.name
+                    inventory.append(item_data)
+                sections["inventory"] = inventory
+            if journal.is_dirty("progress"):
+                sections["progress"] = {
+                    "skills": asdict(self.player.skills),
+                    "known_recipes": self.player.known_recipes,
+                    "relationships": self.player.relationships,
+                }
+            journal.save(sections, self.TRACKED_SECTIONS.values())
             self.add_message("Game saved successfully.")
             return True
         except Exception as e:
@@ -1411,18 +3395,25 @@ class GameEngine:
             return False
     
     def load_game(self, slot: int = 0) -> bool:
-        """Load game from file"""
+        """Load game from file, falling back to the old JSON saves"""
         try:
-            save_file = os.path.join(self.save_dir, f"save_{slot}.json")
-            if not os.path.exists(save_file):
+            journal = self.get_save_journal(slot)
+            legacy_file = os.path.join(self.save_dir, f"save_{slot}.json")
+            if journal.exists():
+                save_data = journal.load()
+                save_data["player"]["inventory"] = save_data.get("inventory", [])
+                save_data["player"].update(save_data.get("progress", {}))
+            elif os.path.exists(legacy_file):
+                with open(legacy_file, 'r') as f:
+                    save_data = json.load(f)
+            else:
                 return False
             
-            with open(save_file, 'r') as f:
-                save_data = json.load(f)
-            
             # Restore player
             player_data = save_data["player"]
             self.player = Player(player_data["name"])
+            self.player.rng = self.random.get("player")
+            self.watch_player()
             self.player.level = player_data["level"]
             self.player.xp = player_data["xp"]
             
@@ -1434,18 +3425,51 @@ class GameEngine:
             for key, value in player_data["skills"].items():
                 setattr(self.player.skills, key, value)
             
+            # Older saves lack the derived stats; rebuild them from the level
+            self.player.xp_to_next = player_data.get("xp_to_next", self.player.calculate_xp_needed())
+            self.player.max_health = player_data.get("max_health", 100 + 5 * (self.player.level - 1))
+            self.player.max_energy = player_data.get("max_energy", 100 + 5 * (self.player.level - 1))
             self.player.current_health = player_data["current_health"]
             self.player.current_energy = player_data["current_energy"]
             self.player.hunger = player_data["hunger"]
             self.player.hygiene = player_data["hygiene"]
+            self.player.stress_level = player_data.get("stress_level", self.player.stress_level)
+            self.player.hope_level = player_data.get("hope_level", self.player.hope_level)
+            self.player.mental_fatigue = player_data.get("mental_fatigue", self.player.mental_fatigue)
+            self.player.mood = player_data.get("mood", self.player.mood)
+            self.player.medical_conditions = [
+                MedicalCondition(**condition) for condition in player_data.get("medical_conditions", [])
+            ]
             self.player.location = player_data["location"]
             self.player.gang = GangType[player_data["gang"]]
+            self.player.gang_rank = player_data.get("gang_rank", self.player.gang_rank)
+            
+            # Restore political standing
+            politics = player_data.get("political_standing", {})
+            standing = self.player.political_standing
+            for key in ("overall_influence", "prison_reputation", "guard_relations",
+                        "inmate_respect", "corruption_level"):
+                setattr(standing, key, politics.get(key, getattr(standing, key)))
+            for faction_data in politics.get("faction_standing", []):
+                faction = Faction[faction_data.pop("faction")]
+                standing.faction_standing[faction] = FactionStanding(faction, **faction_data)
+            
+            # Restore economy and rehabilitation progress
+            for key in ("crafting_level", "manufacturing_level", "dirty_money", "clean_money",
+                        "underground_reputation", "education_level", "therapy_sessions",
+                        "parole_progress"):
+                setattr(self.player, key, player_data.get(key, getattr(self.player, key)))
+            for key in ("money_laundering_operations", "completed_programs", "vocational_skills"):
+                setattr(self.player, key, list(player_data.get(key, [])))
             self.player.money = player_data["money"]
             self.player.cigarettes = player_data["cigarettes"]
             self.player.stats = player_data["stats"]
+            self.player.known_recipes = list(player_data.get("known_recipes", []))
+            self.player.manufacturing_operations = list(player_data.get("manufacturing_operations", []))
+            self.player.relationships = dict(player_data.get("relationships", {}))
             
             # Restore inventory
-            self.player.inventory = []
+            self.player.inventory.clear()
             for item_data in player_data["inventory"]:
                 item_type = ItemType[item_data["item_type"]]
                 item = Item(
@@ -1454,13 +3478,33 @@ class GameEngine:
                     item_data["stackable"], item_data["quantity"],
                     item_data["damage"], item_data["effects"]
                 )
-                self.player.inventory.append(item)
+                self.player.inventory.add(item)
+            
+            # Restore equipment
+            self.player.equipment.clear()
+            for item_id in player_data.get("equipment", {}).values():
+                item = self.player.inventory.get(item_id)
+                if item:
+                    self.player.equip(item)
+            self.player.recompute_equipment()
+            self.player.recompute_effects()
             
             # Restore time
             time_data = save_data["game_time"]
             self.game_time.day = time_data["day"]
             self.game_time.hour = time_data["hour"]
             self.game_time.minute = time_data["minute"]
+            self.reset_schedule()
+            self.crafting.attach(self.player)
+            self.attach_roster()
+            self.manufacturing.restore(save_data.get("manufacturing", {}), self.processes)
+            self.staff_manufacturing()
+            if "random" in save_data:
+                self.random.restore(save_data["random"])
+            
+            # Restore status effects, re-scheduling their expiry on the new schedule
+            for effect_data in player_data.get("status_effects", []):
+                self.apply_status_effect(StatusEffect(**effect_data))
             
             # Restore quests
             for qid, qdata in save_data["quests"].items():
@@ -1480,10 +3524,16 @@ class GameEngine:
 # ============================================================================
 
 class UIRenderer:
-    """Handles all UI rendering"""
+    """Handles all UI rendering
+    
+    Every key and line of text the screens read goes through get_key and
+    get_input, which journal it when the session is being recorded.
+    """
     
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, journal: Optional["InputJournal"] = None):
+        load_curses()
         self.stdscr = stdscr
+        self.journal = journal
         self.height, self.width = stdscr.getmaxyx()
         self.setup_colors()
     
@@ -1574,8 +3624,17 @@ class UIRenderer:
         
         curses.noecho()
         curses.curs_set(0)
+        if self.journal:
+            self.journal.add(user_input.strip())
         return user_input.strip()
     
+    def get_key(self) -> int:
+        """Wait for a key press"""
+        key = self.stdscr.getch()
+        if self.journal:
+            self.journal.add(key)
+        return key
+    
     def show_message(self, message: str, wait: bool = True) -> None:
         """Show a message box"""
         lines = self.wrap_text(message, self.width - 10)
@@ -1592,7 +3651,74 @@ class UIRenderer:
         if wait:
             self.draw_text(box_y + box_height - 2, box_x + 2, "Press any key to continue...", 6)
             self.refresh()
-            self.stdscr.getch()
+            self.get_key()
+
+
+class JournalExhausted(Exception):
+    """A replay has used every recorded input"""
+
+
+class HeadlessUI(UIRenderer):
+    """UIRenderer that draws nothing and reads its input from a journal
+    
+    Replays run the real screens against this at full speed. Draw calls since
+    the last clear are kept as a list so the final frame can still be shown.
+    """
+    
+    def __init__(self, inputs: Iterable[Any], height: int = 24, width: int = 80):
+        self.stdscr = None
+        self.journal = None
+        self.height, self.width = height, width
+        self.inputs = iter(inputs)
+        self.frame: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.diverged: Optional[str] = None  # why the replay stopped early, if it did
+    
+    def clear(self) -> None:
+        """Start a new frame"""
+        self.frame = []
+    
+    def refresh(self) -> None:
+        """Nothing to flush"""
+    
+    def draw_box(self, y: int, x: int, height: int, width: int, title: str = "") -> None:
+        """Remember the box for the final frame"""
+        self.frame.append(("draw_box", (y, x, height, width, title)))
+    
+    def draw_text(self, y: int, x: int, text: str, color: int = 7, bold: bool = False) -> None:
+        """Remember the text for the final frame"""
+        self.frame.append(("draw_text", (y, x, text, color, bold)))
+    
+    def next_input(self, kind: type) -> Any:
+        """The next recorded input, which must be of the kind the screen asked for"""
+        try:
+            value = next(self.inputs)
+        except StopIteration:
+            raise JournalExhausted() from None
+        if not isinstance(value, kind):
+            self.diverged = f"Journal out of step: screen wanted {kind.__name__}, got {value!r}"
+            raise JournalExhausted()
+        return value
+    
+    def get_input(self, prompt: str = "> ") -> str:
+        """Next recorded line of text"""
+        return self.next_input(str)
+    
+    def get_key(self) -> int:
+        """Next recorded key"""
+        return self.next_input(int)
+    
+    def show_frame(self, stdscr) -> None:
+        """Draw the last frame on a real terminal and wait for a key"""
+        ui = UIRenderer(stdscr)
+        curses.curs_set(0)
+        ui.clear()
+        for method, args in self.frame:
+            try:
+                getattr(ui, method)(*args)
+            except curses.error:
+                pass  # The terminal is smaller than the recorded one
+        ui.refresh()
+        ui.get_key()
 
 
 # ============================================================================
@@ -1634,7 +3760,7 @@ class GameScreens:
             self.ui.refresh()
             
             # Get input
-            choice = self.ui.stdscr.getch()
+            choice = self.ui.get_key()
             
             if choice == ord('1'):
                 return GameState.CHARACTER_CREATION
@@ -1693,7 +3819,7 @@ Press any key to return...
                 self.ui.draw_text(i, 2, line)
         
         self.ui.refresh()
-        self.ui.stdscr.getch()
+        self.ui.get_key()
     
     def character_creation(self) -> GameState:
         """Character creation screen"""
@@ -1780,6 +3906,7 @@ Good luck. You're going to need it.
                     "3. Move to another location",
                     "4. Rest (advance time)",
                     "5. Check inventory (I)",
+                    "6. Craft (K)",
                 ]
                 
                 for i, action in enumerate(actions):
@@ -1794,7 +3921,7 @@ Good luck. You're going to need it.
             self.ui.refresh()
             
             # Get input
-            key = self.ui.stdscr.getch()
+            key = self.ui.get_key()
             
             # Handle input
             if key == ord('1'):
@@ -1807,6 +3934,8 @@ Good luck. You're going to need it.
                 self.rest()
             elif key == ord('i') or key == ord('I') or key == ord('5'):
                 return GameState.INVENTORY
+            elif key == ord('k') or key == ord('K') or key == ord('6'):
+                self.crafting_menu()
             elif key == ord('c') or key == ord('C'):
                 return GameState.CHARACTER_SHEET
             elif key == ord('m') or key == ord('M'):
@@ -1900,7 +4029,7 @@ Good luck. You're going to need it.
         self.ui.draw_text(4 + len(location.npcs) + 1, 4, "0. Cancel")
         self.ui.refresh()
         
-        choice = self.ui.stdscr.getch()
+        choice = self.ui.get_key()
         
         if ord('1') <= choice <= ord('9'):
             idx = choice - ord('1')
@@ -1915,7 +4044,7 @@ Good luck. You're going to need it.
             return
         
         # Simple dialogue
-        greeting = random.choice(npc.dialogue.get("greeting", ["Hello."]))
+        greeting = self.engine.random.get("dialogue").choice(npc.dialogue.get("greeting", ["Hello."]))
         
         dialogue = f"{npc.name}: {greeting}\n\n"
         dialogue += f"Relationship: {npc.relationship}/100\n"
@@ -1942,16 +4071,170 @@ Good luck. You're going to need it.
             if loc:
                 self.ui.draw_text(4 + i, 4, f"{i + 1}. {loc.name}")
         
-        self.ui.draw_text(4 + len(location.connections) + 1, 4, "0. Cancel")
+        self.ui.draw_text(4 + len(location.connections) + 1, 4, "T. Travel further...")
+        self.ui.draw_text(4 + len(location.connections) + 2, 4, "0. Cancel")
         self.ui.refresh()
         
-        choice = self.ui.stdscr.getch()
+        choice = self.ui.get_key()
         
         if ord('1') <= choice <= ord('9'):
             idx = choice - ord('1')
             if idx < len(location.connections):
                 loc_id = location.connections[idx]
                 self.engine.move_player(loc_id)
+        elif choice in (ord('t'), ord('T')):
+            self.travel_menu()
+    
+    def travel_menu(self) -> None:
+        """Show every reachable location with its earliest arrival time"""
+        plans = self.engine.plan_all_travel()
+        destinations = [(loc_id, loc, plans[loc_id]) for loc_id, loc in self.engine.locations.items()
+                        if loc_id in plans]
+        
+        self.ui.clear()
+        self.ui.draw_text(2, 2, "Where do you want to travel?", 4, True)
+        
+        for i, (loc_id, loc, plan) in enumerate(destinations[:9]):
+            arrival = GameTime()
+            arrival.set_total_minutes(plan.arrival)
+            wait = f", waiting {plan.waited} min" if plan.waited else ""
+            self.ui.draw_text(4 + i, 4, f"{i + 1}. {loc.name} - arrive {arrival.hour:02d}:{arrival.minute:02d}{wait}")
+        
+        self.ui.draw_text(4 + min(len(destinations), 9) + 1, 4, "0. Cancel")
+        self.ui.refresh()
+        
+        choice = self.ui.get_key()
+        
+        if ord('1') <= choice <= ord('9'):
+            idx = choice - ord('1')
+            if idx < len(destinations):
+                self.engine.travel_to(destinations[idx][0])
+    
+    def crafting_menu(self) -> None:
+        """Show the recipes the player can craft right now"""
+        recipes = self.engine.crafting.craftable_recipes()
+        
+        self.ui.clear()
+        self.ui.draw_text(2, 2, "What do you want to craft?", 4, True)
+        
+        if not recipes:
+            self.ui.draw_text(4, 4, "You don't have what you need for anything.", 2)
+        for i, recipe in enumerate(recipes[:9]):
+            ingredients = ", ".join(f"{qty}x {self.engine.items[item_id].name}" if item_id in self.engine.items
+                                    else f"{qty}x {item_id}" for item_id, qty in recipe.required_items.items())
+            self.ui.draw_text(4 + i, 4, f"{i + 1}. {recipe.name} ({ingredients}, {recipe.required_time} min)")
+        
+        self.ui.draw_text(4 + max(1, min(len(recipes), 9)) + 1, 4, "A. Craft a full chain...")
+        self.ui.draw_text(4 + max(1, min(len(recipes), 9)) + 2, 4, "M. Manufacturing...")
+        self.ui.draw_text(4 + max(1, min(len(recipes), 9)) + 3, 4, "0. Cancel")
+        self.ui.refresh()
+        
+        choice = self.ui.get_key()
+        
+        if choice in (ord('a'), ord('A')):
+            self.craft_chain_menu()
+        elif choice in (ord('m'), ord('M')):
+            self.manufacturing_menu()
+        elif ord('1') <= choice <= ord('9'):
+            idx = choice - ord('1')
+            if idx < len(recipes):
+                if self.engine.craft(recipes[idx].id):
+                    self.ui.show_message(f"You crafted a {recipes[idx].name}.")
+                else:
+                    self.ui.show_message(f"Your {recipes[idx].name} fell apart. The materials are gone.")
+    
+    def craft_chain_menu(self) -> None:
+        """Plan and batch-craft a known item together with everything that goes into it"""
+        player = self.engine.player
+        targets = sorted({self.engine.recipes[r].output_item for r in player.known_recipes if r in self.engine.recipes})
+        plans = [(item_id, self.engine.plan_crafting(item_id)) for item_id in targets]
+        
+        self.ui.clear()
+        self.ui.draw_text(2, 2, "Craft what, from the ground up?", 4, True)
+        
+        for i, (item_id, plan) in enumerate(plans[:9]):
+            name = self.engine.items[item_id].name if item_id in self.engine.items else item_id
+            status = "ready" if plan.feasible else "short: " + ", ".join(f"{q}x {m}" for m, q in plan.missing.items())
+            self.ui.draw_text(4 + i, 4, f"{i + 1}. {name} - {len(plan.steps)} steps, ~{plan.expected_minutes:.0f} min ({status})")
+        
+        self.ui.draw_text(4 + max(1, min(len(plans), 9)) + 1, 4, "0. Cancel")
+        self.ui.refresh()
+        
+        choice = self.ui.get_key()
+        
+        if ord('1') <= choice <= ord('9'):
+            idx = choice - ord('1')
+            if idx < len(plans):
+                self.ui.draw_text(4 + max(1, min(len(plans), 9)) + 3, 4, "How many? (1-9)", 4)
+                self.ui.refresh()
+                amount = self.ui.get_key()
+                quantity = amount - ord('0') if ord('1') <= amount <= ord('9') else 1
+                _, message = self.engine.craft_all(plans[idx][0], quantity)
+                self.ui.show_message(message)
+    
+    def manufacturing_menu(self) -> None:
+        """Queue manufacturing runs and collect what they have produced"""
+        manufacturing = self.engine.manufacturing
+        processes = [process for process in self.engine.processes.values() if self.engine.can_run_process(process)]
+        
+        self.ui.clear()
+        self.ui.draw_text(2, 2, f"Manufacturing - {manufacturing.free_workers}/{manufacturing.workers} workers free", 4, True)
+        
+        for i, process in enumerate(processes[:9]):
+            materials = ", ".join(f"{qty}x {item_id}" for item_id, qty in process.required_materials.items())
+            self.ui.draw_text(4 + i, 4, f"{i + 1}. {process.name} ({materials}, {process.required_time // 60}h, "
+                                        f"{process.required_workers} workers)")
+        
+        y = 4 + max(1, min(len(processes), 9)) + 1
+        if self.engine.roster:
+            crew = ", ".join(self.engine.npcs[npc_id].name for npc_id in self.engine.roster.crew())
+            self.ui.draw_text(y, 4, f"Crew: you{', ' + crew if crew else ''}")
+            y += 1
+        for job in manufacturing.jobs[:5]:
+            status = job.state if job.state != "running" else f"running, {job.due - self.engine.game_time.total_minutes} min left"
+            self.ui.draw_text(y, 4, f"- {job.process.name}: {job.runs} queued, {status}", 6)
+            y += 1
+        stashed = ", ".join(f"{qty}x {item_id}" for item_id, qty in manufacturing.stash.items() if qty)
+        self.ui.draw_text(y + 1, 4, f"Stash: {stashed or 'empty'}")
+        self.ui.draw_text(y + 3, 4, "C. Collect finished goods")
+        self.ui.draw_text(y + 4, 4, "W. Withdraw materials")
+        self.ui.draw_text(y + 5, 4, "0. Cancel")
+        self.ui.refresh()
+        
+        choice = self.ui.get_key()
+        
+        if choice in (ord('c'), ord('C')):
+            self.ui.show_message(f"You collected {self.engine.collect_production()} items from the stash.")
+        elif choice in (ord('w'), ord('W')):
+            self.withdraw_menu()
+        elif ord('1') <= choice <= ord('9'):
+            idx = choice - ord('1')
+            if idx < len(processes):
+                _, message = self.engine.start_manufacturing(processes[idx].id)
+                self.ui.show_message(message)
+    
+    def withdraw_menu(self) -> None:
+        """Take an item out of the manufacturing stash"""
+        stashed = [(item_id, qty) for item_id, qty in self.engine.manufacturing.stash.items() if qty]
+        if not stashed:
+            self.ui.show_message("The stash is empty.")
+            return
+        
+        self.ui.clear()
+        self.ui.draw_text(2, 2, "Which item do you want to take back?", 4, True)
+        for i, (item_id, qty) in enumerate(stashed[:9]):
+            name = self.engine.items[item_id].name if item_id in self.engine.items else item_id
+            self.ui.draw_text(4 + i, 4, f"{i + 1}. {name} ({qty})")
+        self.ui.draw_text(4 + min(len(stashed), 9) + 1, 4, "0. Cancel")
+        self.ui.refresh()
+        
+        choice = self.ui.get_key()
+        if ord('1') <= choice <= ord('9'):
+            idx = choice - ord('1')
+            if idx < len(stashed):
+                item_id, qty = stashed[idx]
+                taken = self.engine.withdraw_stock(item_id, qty)
+                self.ui.show_message(f"You took {taken}x {item_id} back from the stash.")
     
     def rest(self) -> None:
         """Rest and advance time"""
@@ -1964,17 +4247,14 @@ Good luck. You're going to need it.
         self.ui.draw_text(8, 4, "0. Cancel")
         self.ui.refresh()
         
-        choice = self.ui.stdscr.getch()
+        choice = self.ui.get_key()
         
         if choice == ord('1'):
-            self.engine.advance_time(30)
-            self.engine.player.restore_energy(10)
+            minutes = 30
         elif choice == ord('2'):
-            self.engine.advance_time(60)
-            self.engine.player.restore_energy(20)
+            minutes = 60
         elif choice == ord('3'):
-            self.engine.advance_time(120)
-            self.engine.player.restore_energy(40)
+            minutes = 120
         elif choice == ord('4'):
             # Calculate time to next meal
             current_hour = self.engine.game_time.hour
@@ -1986,9 +4266,15 @@ Good luck. You're going to need it.
                 hours_to_wait = 17 - current_hour
             else:
                 hours_to_wait = 24 - current_hour + 6
-            
-            self.engine.advance_time(hours_to_wait * 60)
-            self.engine.player.restore_energy(hours_to_wait * 20)
+            minutes = hours_to_wait * 60
+        else:
+            return
+        
+        # Something happening wakes you up
+        rested = self.engine.skip_time(minutes)
+        self.engine.player.restore_energy(rested // 3)
+        if rested < minutes:
+            self.ui.show_message(self.engine.message_log[-1])
     
     def inventory_screen(self) -> GameState:
         """Inventory screen"""
@@ -2015,19 +4301,20 @@ Good luck. You're going to need it.
             if player.inventory:
                 for i, item in enumerate(player.inventory[:20]):
                     qty = f"x{item.quantity}" if item.stackable else ""
-                    item_text = f"{i + 1}. {item.name} {qty} ({item.weight}kg)"
+                    worn = " [equipped]" if any(e is item for e in player.equipment.values()) else ""
+                    item_text = f"{i + 1}. {item.name} {qty} ({item.weight}kg){worn}"
                     self.ui.draw_text(item_y + i, 4, item_text)
             else:
                 self.ui.draw_text(item_y, 4, "Your inventory is empty.", 2)
             
             # Draw controls
             control_y = self.ui.height - 3
-            self.ui.draw_text(control_y, 2, "1-9: Use item | D: Drop item | ESC: Back", 6)
+            self.ui.draw_text(control_y, 2, "1-9: Use/equip item | D: Drop item | ESC: Back", 6)
             
             self.ui.refresh()
             
             # Get input
-            key = self.ui.stdscr.getch()
+            key = self.ui.get_key()
             
             if key == 27:  # ESC
                 return GameState.PLAYING
@@ -2040,23 +4327,15 @@ Good luck. You're going to need it.
     
     def use_item(self, item: Item) -> None:
         """Use an item"""
-        player = self.engine.player
-        
         if item.item_type == ItemType.CONSUMABLE:
-            # Apply effects
-            for effect, value in item.effects.items():
-                if effect == "hunger":
-                    player.hunger = max(0, player.hunger + value)
-                elif effect == "health":
-                    player.heal(value)
-                elif effect == "energy":
-                    player.restore_energy(value)
-            
-            player.remove_item(item.id, 1)
+            self.engine.use_consumable(item)
             self.ui.show_message(f"You used {item.name}.")
         elif item.item_type == ItemType.BOOK:
             self.ui.show_message(f"You read {item.name}. You feel smarter.")
             # Could improve skills here
+        elif self.engine.player.equipment_slot(item):
+            slot = self.engine.player.equip(item)
+            self.ui.show_message(f"You equip the {item.name} ({slot.value}).")
         else:
             self.ui.show_message(f"You can't use {item.name} right now.")
     
@@ -2076,7 +4355,7 @@ Good luck. You're going to need it.
         self.ui.draw_text(4 + len(player.inventory) + 1, 4, "0. Cancel")
         self.ui.refresh()
         
-        choice = self.ui.stdscr.getch()
+        choice = self.ui.get_key()
         
         if ord('1') <= choice <= ord('9'):
             idx = choice - ord('1')
@@ -2149,7 +4428,7 @@ Good luck. You're going to need it.
             self.ui.refresh()
             
             # Get input
-            key = self.ui.stdscr.getch()
+            key = self.ui.get_key()
             
             if key == 27:  # ESC
                 return GameState.PLAYING
@@ -2179,7 +4458,7 @@ Good luck. You're going to need it.
             self.ui.refresh()
             
             # Get input
-            key = self.ui.stdscr.getch()
+            key = self.ui.get_key()
             
             if key == 27:  # ESC
                 return GameState.PLAYING
@@ -2214,7 +4493,7 @@ Good luck. You're going to need it.
             self.ui.refresh()
             
             # Get input
-            key = self.ui.stdscr.getch()
+            key = self.ui.get_key()
             
             if key == 27:  # ESC
                 return GameState.PLAYING
@@ -2253,7 +4532,7 @@ Good luck. You're going to need it.
             self.ui.refresh()
             
             # Get input
-            key = self.ui.stdscr.getch()
+            key = self.ui.get_key()
             
             if key == 27:  # ESC
                 return GameState.PLAYING
@@ -2281,7 +4560,7 @@ Good luck. You're going to need it.
             self.ui.refresh()
             
             # Get input
-            choice = self.ui.stdscr.getch()
+            choice = self.ui.get_key()
             
             if choice == ord('1') or choice == 27:  # ESC
                 return GameState.PLAYING
@@ -2305,17 +4584,18 @@ Good luck. You're going to need it.
 class Game:
     """Main game class"""
     
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, engine: Optional[GameEngine] = None, ui: Optional[UIRenderer] = None):
         self.stdscr = stdscr
-        self.engine = GameEngine()
-        self.ui = UIRenderer(stdscr)
+        self.engine = engine or GameEngine()
+        self.ui = ui or UIRenderer(stdscr)
         self.screens = GameScreens(self.engine, self.ui)
         self.running = True
         
-        # Setup curses
-        curses.curs_set(0)  # Hide cursor
-        self.stdscr.nodelay(0)  # Blocking input
-        self.stdscr.keypad(1)  # Enable keypad
+        # Setup curses (a replay has no terminal)
+        if self.stdscr:
+            curses.curs_set(0)  # Hide cursor
+            self.stdscr.nodelay(0)  # Blocking input
+            self.stdscr.keypad(1)  # Enable keypad
     
     def run(self) -> None:
         """Main game loop"""
@@ -2345,6 +4625,8 @@ class Game:
                     self.running = False
             except KeyboardInterrupt:
                 current_state = GameState.PAUSED
+            except JournalExhausted:
+                self.running = False
             except Exception as e:
                 # Error handling
                 self.ui.show_message(f"An error occurred: {e}\nPress any key to continue...")
@@ -2365,42 +4647,42 @@ class GangSystem:
     def _initialize_gangs(self) -> Dict[GangType, Dict[str, Any]]:
         """Initialize gang data"""
         return {
-            GangType.BROTHERHOOD: {
-                "name": "The Brotherhood",
-                "description": "White supremacist gang focused on protection and drug trade",
+            GangType.REBELS: {
+                "name": "Rebels MC",
+                "description": "Outlaw bikie club running protection and the drug trade",
                 "territory": ["block_a_hall", "workshop"],
-                "leader": "gang_leader_rico",
-                "members": ["inmate_mike", "inmate_tony"],
+                "leader": None,
+                "members": [],
                 "initiation": "Prove your loyalty by fighting a rival gang member",
                 "benefits": {"protection": 20, "drug_access": True},
                 "requirements": {"reputation": 20, "strength": 40}
             },
-            GangType.LOS_HERMANOS: {
+            GangType.ETHNIC_CREW: {
                 "name": "Los Hermanos",
-                "description": "Latino gang with strong family bonds and smuggling network",
-                "territory": ["cafeteria", "kitchen"],
+                "description": "Tight-knit crew with strong family bonds and a smuggling network",
+                "territory": ["yard", "cafeteria"],
                 "leader": "gang_leader_rico",
-                "members": ["inmate_carlos"],
+                "members": ["inmate_mike"],
                 "initiation": "Complete a smuggling run successfully",
                 "benefits": {"smuggling_bonus": 30, "family_protection": True},
                 "requirements": {"reputation": 15, "charisma": 35}
             },
-            GangType.THE_NATION: {
-                "name": "The Nation",
-                "description": "Organized black gang with strict hierarchy",
-                "territory": ["yard", "gym"],
-                "leader": "gang_leader_tyrone",
-                "members": ["inmate_tyrone", "trainer_big_mike"],
+            GangType.HELLS_ANGELS: {
+                "name": "Hells Angels",
+                "description": "Bikie chapter with a strict hierarchy",
+                "territory": ["gym"],
+                "leader": None,
+                "members": [],
                 "initiation": "Earn respect through combat prowess",
                 "benefits": {"respect_bonus": 25, "combat_training": True},
                 "requirements": {"reputation": 25, "brawling": 30}
             },
-            GangType.SYNDICATE: {
-                "name": "The Syndicate",
-                "description": "Organized crime network focused on business",
-                "territory": ["library", "visitation"],
-                "leader": "boss_vincent",
-                "members": ["inmate_marcus"],
+            GangType.COMANCHEROS: {
+                "name": "Comancheros",
+                "description": "Bikie club run like a business",
+                "territory": ["library"],
+                "leader": None,
+                "members": [],
                 "initiation": "Prove your business acumen with a successful trade",
                 "benefits": {"trade_bonus": 40, "connections": True},
                 "requirements": {"reputation": 30, "intelligence": 50}
@@ -2419,23 +4701,21 @@ class GangSystem:
         if not gang_data:
             return False, "Invalid gang"
         
-        requirements = gang_data["requirements"]
-        player = self.engine.player
-        
-        if player.attributes.reputation < requirements.get("reputation", 0):
-            return False, f"Need {requirements['reputation']} reputation"
-        
-        if requirements.get("strength") and player.attributes.strength < requirements["strength"]:
-            return False, f"Need {requirements['strength']} strength"
-        
-        if requirements.get("charisma") and player.attributes.charisma < requirements["charisma"]:
-            return False, f"Need {requirements['charisma']} charisma"
-        
-        if requirements.get("intelligence") and player.attributes.intelligence < requirements["intelligence"]:
-            return False, f"Need {requirements['intelligence']} intelligence"
+        return self.check_requirements(gang_data["requirements"])
+    
+    def check_requirements(self, requirements: Dict[str, int]) -> Tuple[bool, str]:
+        """Check the player against gang requirements
         
-        if requirements.get("brawling") and player.skills.brawling < requirements["brawling"]:
-            return False, f"Need {requirements['brawling']} brawling skill"
+        Attributes are read through get_effective_stat and skills through
+        get_effective_skill, so equipment bonuses and status effects count.
+        """
+        player = self.engine.player
+        for name, minimum in requirements.items():
+            if hasattr(player.skills, name):
+                if player.get_effective_skill(name) < minimum:
+                    return False, f"Need {minimum} {name} skill"
+            elif player.get_effective_stat(name) < minimum:
+                return False, f"Need {minimum} {name}"
         
         return True, "Requirements met"
     
@@ -2458,11 +4738,19 @@ class GangSystem:
 # ADVANCED FEATURES - COMBAT SYSTEM
 # ============================================================================
 
+UNARMED_DAMAGE = 10
+CRITICAL_MULTIPLIER = 1.5
+HEAVY_ATTACK_HIT_CHANCE = 70  # percent
+DIRTY_MOVE_BONUS = 15  # extra weapon damage for a dirty move
+ENEMY_DAMAGE_RANGE = (5, 20)
+
+
 class CombatSystem:
     """Enhanced combat system"""
     
     def __init__(self, engine: GameEngine):
         self.engine = engine
+        self.rng = engine.random.block("combat")
         self.in_combat = False
         self.enemy: Optional[NPC] = None
         self.combat_log: List[str] = []
@@ -2486,17 +4774,22 @@ class CombatSystem:
         if len(self.combat_log) > 10:
             self.combat_log.pop(0)
     
+    @staticmethod
+    def damage_formula(attacker_strength, weapon_damage, skill_level, is_critical=False):
+        """Damage dealt by a swing
+        
+        Branch-free, so the CombatSimulator can pass NumPy arrays and resolve a
+        whole batch of swings with the same formula.
+        """
+        base_damage = weapon_damage + attacker_strength // 10
+        final_damage = (base_damage + (skill_level / 100) * base_damage) // 1
+        final_damage = (final_damage * (1 + (CRITICAL_MULTIPLIER - 1) * is_critical)) // 1
+        return final_damage + (final_damage < 1) * (1 - final_damage)
+    
     def calculate_damage(self, attacker_strength: int, weapon_damage: int, 
                         skill_level: int, is_critical: bool = False) -> int:
         """Calculate damage dealt"""
-        base_damage = weapon_damage + (attacker_strength // 10)
-        skill_modifier = (skill_level / 100) * base_damage
-        final_damage = int(base_damage + skill_modifier)
-        
-        if is_critical:
-            final_damage = int(final_damage * 1.5)
-        
-        return max(1, final_damage)
+        return int(self.damage_formula(attacker_strength, weapon_damage, skill_level, is_critical))
     
     def player_attack(self, action: CombatAction) -> Tuple[int, str]:
         """Player attacks enemy"""
@@ -2504,20 +4797,16 @@ class CombatSystem:
             return 0, "Invalid combat state"
         
         player = self.engine.player
-        
-        # Get weapon damage
-        weapon_damage = 10  # Base unarmed damage
-        for item in player.inventory:
-            if item.item_type == ItemType.WEAPON and item.damage > weapon_damage:
-                weapon_damage = item.damage
+        weapon_damage = player.weapon_damage
+        strength = int(player.get_effective_stat("strength"))
         
         if action == CombatAction.ATTACK:
             # Normal attack
-            is_crit = random.randint(1, 100) <= (player.attributes.perception // 2)
+            is_crit = self.rng.randint(1, 100) <= (int(player.get_effective_stat("perception")) // 2)
             damage = self.calculate_damage(
-                player.attributes.strength,
+                strength,
                 weapon_damage,
-                player.skills.brawling,
+                player.get_effective_skill("brawling"),
                 is_crit
             )
             
@@ -2530,11 +4819,11 @@ class CombatSystem:
         
         elif action == CombatAction.HEAVY_ATTACK:
             # Heavy attack - more damage, less accurate
-            if random.randint(1, 100) <= 70:  # 70% hit chance
+            if self.rng.randint(1, 100) <= HEAVY_ATTACK_HIT_CHANCE:
                 damage = self.calculate_damage(
-                    player.attributes.strength,
+                    strength,
                     weapon_damage * 2,
-                    player.skills.brawling,
+                    player.get_effective_skill("brawling"),
                     False
                 )
                 player.improve_skill("brawling", 2)
@@ -2545,9 +4834,9 @@ class CombatSystem:
         elif action == CombatAction.DIRTY_MOVE:
             # Dirty fighting - high damage, improves dirty fighting skill
             damage = self.calculate_damage(
-                player.attributes.strength,
-                weapon_damage + 15,
-                player.skills.dirty_fighting,
+                strength,
+                weapon_damage + DIRTY_MOVE_BONUS,
+                player.get_effective_skill("dirty_fighting"),
                 False
             )
             player.improve_skill("dirty_fighting", 2)
@@ -2570,8 +4859,8 @@ class CombatSystem:
         if not self.enemy or not self.engine.player:
             return 0, ""
         
-        # Simple enemy AI
-        damage = random.randint(5, 20)
+        # Simple enemy AI, blunted by the player's armour
+        damage = max(1, self.rng.randint(*ENEMY_DAMAGE_RANGE) - self.engine.player.armour)
         return damage, f"{self.enemy.name} attacks for {damage} damage!"
     
     def end_combat(self, player_won: bool) -> None:
@@ -2587,12 +4876,182 @@ class CombatSystem:
         else:
             self.engine.player.stats["fights_lost"] += 1
             self.engine.player.attributes.reputation -= 3
+            self.engine.apply_status_effect(StatusEffect(
+                "Bruised", 6, {"strength": -0.1, "toughness": -0.1},
+                "Sore from a beating"
+            ))
             self.add_combat_log("You lost the fight...")
         
         self.in_combat = False
         self.enemy = None
 
 
+# ============================================================================
+# ADVANCED FEATURES - COMBAT SIMULATION
+# ============================================================================
+
+@dataclass
+class CombatLoadout:
+    """Stats, skills and weapon a fighter brings to a simulated fight
+    
+    Skills are base levels, which grow during a fight and are capped at 100,
+    with equipment bonuses kept apart and added on top, as improve_skill and
+    get_effective_skill treat them.
+    """
+    strength: int = 50
+    perception: int = 50
+    brawling: int = 0
+    dirty_fighting: int = 0
+    weapon_damage: int = UNARMED_DAMAGE
+    health: int = 100
+    armour: int = 0
+    brawling_bonus: float = 0
+    dirty_fighting_bonus: float = 0
+    
+    @classmethod
+    def from_player(cls, player: Player) -> "CombatLoadout":
+        """The loadout a player would fight with right now"""
+        return cls(int(player.get_effective_stat("strength")), int(player.get_effective_stat("perception")),
+                   player.skills.brawling, player.skills.dirty_fighting,
+                   player.weapon_damage, player.current_health, player.armour,
+                   player.stat_bonuses.get("brawling", 0), player.stat_bonuses.get("dirty_fighting", 0))
+
+
+@dataclass
+class CombatReport:
+    """Outcome of a batch of simulated fights with one action mix"""
+    actions: Tuple[str, ...]
+    fights: int
+    win_rate: float
+    turns_to_kill: float  # mean over won fights
+    turns_to_kill_variance: float
+    damage_mean: float  # per player action
+    damage_variance: float
+    damage_taken: float  # mean per fight
+
+
+class CombatSimulator:
+    """Vectorised combat resolution for balance sweeps
+    
+    Plays the same fight as SimulationEngine's fight action (the player
+    cycles through an action mix, the enemy hits back each turn, the player
+    gives up at the surrender threshold) for every fight of a batch at once.
+    Each turn is a handful of NumPy operations over the fights still going,
+    and finished fights are dropped from the arrays, so millions of fights
+    take seconds. Damage goes through CombatSystem.damage_formula and skills
+    grow during a fight exactly as improve_skill would grow them.
+    """
+    
+    def __init__(self, enemy_health: int = 100, surrender_health: int = 20,
+                 max_turns: int = 50, seed: Optional[int] = None):
+        try:
+            import numpy
+        except ImportError as error:
+            raise RuntimeError("Combat simulation needs NumPy (pip install numpy)") from error
+        self.np = numpy
+        self.rng = numpy.random.default_rng(seed)
+        self.enemy_health = enemy_health
+        self.surrender_health = surrender_health
+        self.max_turns = max_turns
+    
+    def simulate(self, loadout: CombatLoadout, actions: Iterable[CombatAction], fights: int) -> CombatReport:
+        """Resolve a batch of fights in which the player repeats an action mix"""
+        np, rng = self.np, self.rng
+        mix = [CombatAction[a] if isinstance(a, str) else a for a in actions] or [CombatAction.ATTACK]
+        
+        fight_ids = np.arange(fights)
+        enemy_health = np.full(fights, self.enemy_health, dtype=np.int64)
+        health = np.full(fights, loadout.health, dtype=np.int64)
+        brawling = np.full(fights, loadout.brawling, dtype=np.int64)
+        dirty_fighting = np.full(fights, loadout.dirty_fighting, dtype=np.int64)
+        won = np.zeros(fights, dtype=bool)
+        turns = np.full(fights, self.max_turns, dtype=np.int64)
+        damage_total = damage_squares = swings = taken = 0.0
+        crit_threshold = loadout.perception // 2
+        
+        for turn in range(self.max_turns):
+            count = fight_ids.size
+            if not count:
+                break
+            action = mix[turn % len(mix)]
+            
+            if action == CombatAction.ATTACK:
+                critical = rng.integers(1, 101, count) <= crit_threshold
+                damage = CombatSystem.damage_formula(loadout.strength, loadout.weapon_damage,
+                                                     brawling + loadout.brawling_bonus, critical)
+                brawling = np.minimum(100, brawling + 1)
+            elif action == CombatAction.HEAVY_ATTACK:
+                hit = rng.integers(1, 101, count) <= HEAVY_ATTACK_HIT_CHANCE
+                damage = hit * CombatSystem.damage_formula(loadout.strength, loadout.weapon_damage * 2,
+                                                           brawling + loadout.brawling_bonus)
+                brawling = np.minimum(100, brawling + 2 * hit)
+            elif action == CombatAction.DIRTY_MOVE:
+                damage = CombatSystem.damage_formula(loadout.strength, loadout.weapon_damage + DIRTY_MOVE_BONUS,
+                                                     dirty_fighting + loadout.dirty_fighting_bonus)
+                dirty_fighting = np.minimum(100, dirty_fighting + 2)
+            else:
+                damage = np.zeros(count)
+            
+            damage_total += float(damage.sum())
+            damage_squares += float(np.square(damage).sum())
+            swings += count
+            enemy_health = enemy_health - damage.astype(np.int64)
+            
+            # Knockouts end before the enemy swings back
+            down = enemy_health <= 0
+            won[fight_ids[down]] = True
+            turns[fight_ids[down]] = turn + 1
+            standing = ~down
+            fight_ids, enemy_health, health = fight_ids[standing], enemy_health[standing], health[standing]
+            brawling, dirty_fighting = brawling[standing], dirty_fighting[standing]
+            
+            hits = np.maximum(1, rng.integers(ENEMY_DAMAGE_RANGE[0], ENEMY_DAMAGE_RANGE[1] + 1, fight_ids.size)
+                              - loadout.armour)
+            taken += float(np.minimum(hits, health).sum())
+            health = np.maximum(0, health - hits)
+            
+            going = health > self.surrender_health
+            turns[fight_ids[~going]] = turn + 1
+            fight_ids, enemy_health, health = fight_ids[going], enemy_health[going], health[going]
+            brawling, dirty_fighting = brawling[going], dirty_fighting[going]
+        
+        kill_turns = turns[won]
+        damage_mean = damage_total / swings if swings else 0.0
+        return CombatReport(
+            tuple(action.name for action in mix),
+            fights,
+            float(won.mean()) if fights else 0.0,
+            float(kill_turns.mean()) if kill_turns.size else math.nan,
+            float(kill_turns.var()) if kill_turns.size else math.nan,
+            damage_mean,
+            damage_squares / swings - damage_mean ** 2 if swings else 0.0,
+            taken / fights if fights else 0.0,
+        )
+    
+    def sweep(self, loadout: CombatLoadout, fights: int, mix_length: int = 2,
+              actions: Optional[Iterable[CombatAction]] = None) -> List[CombatReport]:
+        """Simulate every distinct action mix up to a length, best win rate first
+        
+        Mixes are cycles, so rotations and repeats of a shorter mix (ATTACK,
+        DODGE vs DODGE, ATTACK; ATTACK, ATTACK vs ATTACK) are only run once.
+        """
+        choices = list(actions or CombatAction)
+        seen = set()
+        reports = []
+        for length in range(1, mix_length + 1):
+            for mix in itertools.product(choices, repeat=length):
+                period = next(p for p in range(1, length + 1) if length % p == 0 and mix == mix[:p] * (length // p))
+                mix = mix[:period]
+                canonical = min(tuple(a.value for a in mix[i:] + mix[:i]) for i in range(period))
+                if canonical in seen:
+                    continue
+                seen.add(canonical)
+                reports.append(self.simulate(loadout, mix, fights))
+        reports.sort(key=lambda report: (-report.win_rate, math.inf if math.isnan(report.turns_to_kill)
+                                         else report.turns_to_kill))
+        return reports
+
+
 # ============================================================================
 # ADVANCED FEATURES - TRADING SYSTEM
 # ============================================================================
@@ -2658,12 +5117,69 @@ class TradingSystem:
 # ADVANCED FEATURES - EVENT SYSTEM
 # ============================================================================
 
+class AliasTable:
+    """Walker/Vose alias table for O(1) weighted sampling"""
+    
+    def __init__(self, outcomes: Sequence[Any], weights: Sequence[float]):
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("Alias table needs one positive weight per outcome")
+        total = float(sum(weights))
+        if total <= 0 or min(weights) < 0:
+            raise ValueError("Alias table needs one positive weight per outcome")
+        
+        n = len(outcomes)
+        self.outcomes = list(outcomes)
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        scaled = [w * n / total for w in weights]
+        small = [i for i, w in enumerate(scaled) if w < 1.0]
+        large = [i for i, w in enumerate(scaled) if w >= 1.0]
+        
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Anything left over is 1.0 up to rounding error
+    
+    def sample(self, rng: random.Random = random) -> Any:
+        """Draw one outcome"""
+        column = int(rng.random() * len(self.prob))
+        if rng.random() < self.prob[column]:
+            return self.outcomes[column]
+        return self.outcomes[self.alias[column]]
+
+
+@dataclass
+class EncounterTable:
+    """Compiled random events for one encounter context"""
+    rate: float  # expected events per minute
+    events: AliasTable  # which event an arrival is
+
+
 class EventSystem:
-    """Random event system"""
+    """Random event system
+    
+    Events are filtered into encounter tables keyed by location type, time
+    period and danger level. Each table is compiled once into an alias table
+    and cached, so a check costs the same however many events are registered.
+    An event may narrow where it happens with optional "locations" (location
+    types), "periods" (GameTime.get_period names) and "danger" (min, max) keys.
+    
+    An event's "probability" is its chance of happening within an hour in a
+    matching context. Events arrive as a Poisson process with that rate, so
+    time skips draw the next arrival directly instead of rolling every hour.
+    """
     
     def __init__(self, engine: GameEngine):
         self.engine = engine
-        self.events = self._initialize_events()
+        self.rng = engine.random.block("events")
+        self.events: List[Dict[str, Any]] = []
+        self.tables: Dict[Tuple[Optional[LocationType], str, int], Optional[EncounterTable]] = {}
+        self.listeners: List[Callable[[Dict[str, Any]], None]] = []  # called with each event fired
+        for event in self._initialize_events():
+            self.register_event(event)
     
     def _initialize_events(self) -> List[Dict[str, Any]]:
         """Initialize random events"""
@@ -2680,6 +5196,7 @@ class EventSystem:
                 "name": "Fight in the Yard",
                 "description": "A fight breaks out in the yard!",
                 "probability": 0.15,
+                "danger": (3, 10),
                 "effects": self._fight_event
             },
             {
@@ -2694,6 +5211,7 @@ class EventSystem:
                 "name": "Good Meal",
                 "description": "The cafeteria serves a surprisingly good meal today!",
                 "probability": 0.1,
+                "periods": ["Breakfast", "Lunch", "Dinner"],
                 "effects": self._good_meal
             },
             {
@@ -2701,17 +5219,86 @@ class EventSystem:
                 "name": "Contraband Deal",
                 "description": "Someone offers you a contraband deal.",
                 "probability": 0.12,
+                "periods": ["Morning", "Lunch", "Afternoon", "Evening"],
                 "effects": self._contraband_deal
             },
         ]
     
-    def check_random_event(self) -> Optional[Dict[str, Any]]:
-        """Check if random event occurs"""
-        for event in self.events:
-            if random.random() < event["probability"]:
-                return event
+    def register_event(self, event: Dict[str, Any]) -> None:
+        """Add an event, e.g. from a mod, and drop the compiled tables"""
+        if not 0 <= event["probability"] < 1:
+            raise ValueError(f"Event {event['id']} needs a probability in [0, 1)")
+        self.events.append(event)
+        self.tables.clear()
+    
+    @staticmethod
+    def event_applies(event: Dict[str, Any], location_type: Optional[LocationType],
+                      period: str, danger: int) -> bool:
+        """Whether an event can happen in an encounter context"""
+        locations = event.get("locations")
+        if locations and location_type not in locations:
+            return False
+        periods = event.get("periods")
+        if periods and period not in periods:
+            return False
+        low, high = event.get("danger", (0, 10))
+        return low <= danger <= high
+    
+    def compile_table(self, location_type: Optional[LocationType], period: str,
+                      danger: int) -> Optional[EncounterTable]:
+        """Build the encounter table for one context"""
+        events = [e for e in self.events
+                  if e["probability"] > 0 and self.event_applies(e, location_type, period, danger)]
+        if not events:
+            return None
+        rates = [-math.log1p(-e["probability"]) / 60 for e in events]
+        return EncounterTable(sum(rates), AliasTable(events, rates))
+    
+    def encounter_key(self, game_time: Optional[GameTime] = None) -> Tuple[Optional[LocationType], str, int]:
+        """Encounter context for where the player is, now or at another time"""
+        period = (game_time or self.engine.game_time).get_period()
+        location = self.engine.get_current_location()
+        if location is None:
+            return None, period, 0
+        return location.location_type, period, location.danger_level
+    
+    def table_for(self, key: Tuple[Optional[LocationType], str, int]) -> Optional[EncounterTable]:
+        """Compiled table for a context, building it on first use"""
+        if key not in self.tables:
+            self.tables[key] = self.compile_table(*key)
+        return self.tables[key]
+    
+    def next_event(self, within: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Sample the next random event within a number of minutes
+        
+        Returns the whole minutes until it happens and the event, or None if
+        the window passes quietly. The context only changes at period
+        boundaries while time skips, and arrivals are memoryless, so each
+        stretch draws one exponential gap.
+        """
+        if not self.engine.player:
+            return None
+        
+        clock = GameTime()
+        start = self.engine.game_time.total_minutes
+        elapsed = 0
+        while elapsed < within:
+            clock.set_total_minutes(start + elapsed)
+            stretch = min(within - elapsed, clock.minutes_until_period_change())
+            table = self.table_for(self.encounter_key(clock))
+            if table:
+                gap = self.rng.expovariate(table.rate)
+                if gap < stretch:
+                    return elapsed + max(1, math.ceil(gap)), table.events.sample(self.rng)
+            elapsed += stretch
         return None
     
+    def fire(self, event: Dict[str, Any]) -> None:
+        """Apply an event and tell the listeners"""
+        self.engine.add_message(event["effects"]())
+        for listener in self.listeners:
+            listener(event)
+    
     def _guard_shakedown(self) -> str:
         """Guard shakedown event"""
         if not self.engine.player:
@@ -2719,10 +5306,9 @@ class EventSystem:
         
         # Check for contraband
         contraband_found = False
-        for item in self.engine.player.inventory[:]:
-            if item.item_type == ItemType.CONTRABAND:
-                self.engine.player.remove_item(item.id, item.quantity)
-                contraband_found = True
+        for item in self.engine.player.inventory.of_type(ItemType.CONTRABAND):
+            self.engine.player.remove_item(item.id, item.quantity)
+            contraband_found = True
         
         if contraband_found:
             self.engine.player.attributes.reputation -= 10
@@ -2771,6 +5357,8 @@ class JobSystem:
                 "pay": 10,
                 "duration": 4,  # hours
                 "requirements": {"cooking": 0},
+                "skill": "cooking",
+                "slots": 3,
                 "benefits": {"food_access": True},
                 "description": "Work in the kitchen preparing meals"
             },
@@ -2780,6 +5368,8 @@ class JobSystem:
                 "pay": 8,
                 "duration": 4,
                 "requirements": {},
+                "skill": None,
+                "slots": 2,
                 "benefits": {"hygiene_bonus": 10},
                 "description": "Wash and fold prison laundry"
             },
@@ -2789,6 +5379,8 @@ class JobSystem:
                 "pay": 12,
                 "duration": 4,
                 "requirements": {"intelligence": 40},
+                "skill": "intelligence",
+                "slots": 1,
                 "benefits": {"book_access": True, "intelligence_gain": 1},
                 "description": "Help organize books and assist inmates"
             },
@@ -2798,6 +5390,8 @@ class JobSystem:
                 "pay": 15,
                 "duration": 6,
                 "requirements": {"strength": 35},
+                "skill": "crafting",
+                "slots": 2,
                 "benefits": {"crafting_bonus": 5, "tool_access": True},
                 "description": "Manual labor in the prison workshop"
             },
@@ -2807,6 +5401,8 @@ class JobSystem:
                 "pay": 10,
                 "duration": 3,
                 "requirements": {"strength": 30},
+                "skill": "strength",
+                "slots": 1,
                 "benefits": {"workout_bonus": 10},
                 "description": "Maintain gym equipment and clean"
             }
@@ -2827,10 +5423,10 @@ class JobSystem:
         
         for req, value in requirements.items():
             if hasattr(player.attributes, req):
-                if getattr(player.attributes, req) < value:
+                if player.get_effective_stat(req) < value:
                     return False, f"Need {value} {req}"
             elif hasattr(player.skills, req):
-                if getattr(player.skills, req) < value:
+                if player.get_effective_skill(req) < value:
                     return False, f"Need {value} {req} skill"
         
         # Check energy
@@ -2863,6 +5459,11 @@ class JobSystem:
             player.attributes.intelligence += benefits["intelligence_gain"]
         if "hygiene_bonus" in benefits:
             player.hygiene = min(100, player.hygiene + benefits["hygiene_bonus"])
+        if "tool_access" in benefits:
+            for process in self.engine.processes.values():
+                if process.location_id == job["location"] and process.id not in player.manufacturing_operations:
+                    player.manufacturing_operations.append(process.id)
+                    self.engine.add_message(f"You picked up how the {process.name} works.")
         
         # Gain XP
         player.add_xp(50)
@@ -2870,19 +5471,455 @@ class JobSystem:
         return True, f"You worked {job['name']} and earned ${job['pay']}!"
 
 
+# ============================================================================
+# ADVANCED FEATURES - WORK ROSTER
+# ============================================================================
+
+ROSTER_FORBIDDEN = 1e9  # cost of a placement that breaks a requirement
+ROSTER_CREW_SLOTS = 6  # manufacturing crew places the roster can fill
+ROSTER_CREW_PAY = 25  # value of a crew place before skill (a cut of the output)
+ROSTER_ALLY_RELATIONSHIP = 50  # standing an inmate needs to join the player's crew
+ROSTER_ABSENCE_CHANCE = 0.1  # daily chance an inmate is called off work
+
+
+class AssignmentSolver:
+    """Minimum-cost assignment on a square cost matrix (Hungarian method)
+    
+    Rows are matched one shortest augmenting path at a time while dual
+    potentials are kept for every row and column. When a single row or column
+    changes, only its old match is undone and one path is re-augmented, which
+    is O(n^2) instead of another O(n^3) solve.
+    """
+    
+    def __init__(self, cost: List[List[float]]):
+        size = len(cost)
+        self.cost = cost
+        self.u = [0.0] * size
+        self.v = [0.0] * (size + 1)  # the extra column is the root of each search
+        self.row_of = [-1] * (size + 1)  # column: matched row
+        self.col_of = [-1] * size  # row: matched column
+        for row in range(size):
+            self._augment(row)
+    
+    def _augment(self, start: int) -> None:
+        """Match a free row along the shortest augmenting path (Dijkstra on reduced costs)"""
+        size = len(self.cost)
+        cost, u, v, row_of = self.cost, self.u, self.v, self.row_of
+        min_slack = [math.inf] * size
+        way = [size] * size
+        used = [False] * (size + 1)
+        
+        row_of[size] = start
+        col = size
+        while True:
+            used[col] = True
+            row = row_of[col]
+            row_cost, row_u = cost[row], u[row]
+            delta, next_col = math.inf, -1
+            for j in range(size):
+                if not used[j]:
+                    slack = row_cost[j] - row_u - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = col
+                    if min_slack[j] < delta:
+                        delta, next_col = min_slack[j], j
+            for j in range(size + 1):
+                if used[j]:
+                    u[row_of[j]] += delta
+                    v[j] -= delta
+                elif j < size:
+                    min_slack[j] -= delta
+            col = next_col
+            if row_of[col] == -1:
+                break
+        
+        while col != size:
+            previous = way[col]
+            row = row_of[previous]
+            row_of[col] = row
+            self.col_of[row] = col
+            col = previous
+        row_of[size] = -1
+    
+    def update_row(self, row: int, costs: List[float]) -> None:
+        """Replace one row's costs and restore an optimal assignment"""
+        self.cost[row] = costs
+        col = self.col_of[row]
+        self.row_of[col] = -1
+        self.col_of[row] = -1
+        self.u[row] = min(c - v for c, v in zip(costs, self.v))
+        self._augment(row)
+    
+    def update_column(self, col: int, costs: List[float]) -> None:
+        """Replace one column's costs and restore an optimal assignment"""
+        for row, value in enumerate(costs):
+            self.cost[row][col] = value
+        row = self.row_of[col]
+        self.row_of[col] = -1
+        self.col_of[row] = -1
+        self.v[col] = min(self.cost[i][col] - self.u[i] for i in range(len(self.cost)))
+        self._augment(row)
+
+
+class WorkRoster:
+    """Assigns NPC inmates to job shifts and to the player's manufacturing crew
+    
+    Inmates are the rows and shift or crew places the columns of an assignment
+    problem, padded so any inmate can sit idle and any place can stay empty.
+    An inmate is worth a job's pay scaled by their skill in it, and places
+    whose requirements they miss are forbidden. The solver keeps its state
+    between days, so an inmate going missing or a crew place opening only
+    re-solves that one row or column.
+    """
+    
+    def __init__(self, engine: GameEngine, jobs: Dict[str, Dict[str, Any]]):
+        self.engine = engine
+        self.jobs = jobs
+        self.workers = [npc_id for npc_id, npc in engine.npcs.items() if not npc.is_guard]
+        self.rows = {npc_id: row for row, npc_id in enumerate(self.workers)}
+        self.places: List[Tuple[str, int]] = [(job_id, slot) for job_id, job in jobs.items()
+                                              for slot in range(job.get("slots", 1))]
+        self.places += [("crew", slot) for slot in range(ROSTER_CREW_SLOTS)]
+        self.available = {npc_id: True for npc_id in self.workers}
+        self.crew_demand = 0
+        
+        size = len(self.workers) + len(self.places)
+        self.solver = AssignmentSolver([self._row(row, size) for row in range(size)])
+    
+    def value(self, npc_id: str, place: Tuple[str, int]) -> Optional[float]:
+        """What an inmate produces in a place, or None if they can't take it"""
+        if not self.available[npc_id]:
+            return None
+        npc = self.engine.npcs[npc_id]
+        job_id, slot = place
+        
+        if job_id == "crew":
+            player = self.engine.player
+            if slot >= self.crew_demand or not player or \
+                    player.relationships.get(npc_id, 0) < ROSTER_ALLY_RELATIONSHIP:
+                return None
+            return ROSTER_CREW_PAY * (1 + npc.skills.get("crafting", 0) / 100)
+        
+        job = self.jobs[job_id]
+        if any(npc.skills.get(name, 0) < level for name, level in job["requirements"].items()):
+            return None
+        skill = job.get("skill")
+        return job["pay"] * (1 + (npc.skills.get(skill, 0) if skill else 0) / 100)
+    
+    def _cost(self, row: int, col: int) -> float:
+        """Assignment cost of a cell in the padded matrix"""
+        if row >= len(self.workers) or col >= len(self.places):
+            return 0.0  # Vacancy rows and idle columns
+        value = self.value(self.workers[row], self.places[col])
+        return ROSTER_FORBIDDEN if value is None else -value
+    
+    def _row(self, row: int, size: int) -> List[float]:
+        """Cost row for one inmate (or vacancy)"""
+        return [self._cost(row, col) for col in range(size)]
+    
+    def set_available(self, npc_id: str, available: bool) -> None:
+        """Mark an inmate as able to work or not, re-solving only their row"""
+        if self.available.get(npc_id, available) == available:
+            return
+        self.available[npc_id] = available
+        self.refresh(npc_id)
+    
+    def refresh(self, npc_id: str) -> None:
+        """Re-solve one inmate's placement after their skills or standing changed"""
+        row = self.rows[npc_id]
+        self.solver.update_row(row, self._row(row, len(self.solver.cost)))
+    
+    def set_crew_demand(self, demand: int) -> None:
+        """Open or close crew places, re-solving only the places that changed"""
+        demand = min(demand, ROSTER_CREW_SLOTS)
+        if demand == self.crew_demand:
+            return
+        changed = range(min(demand, self.crew_demand), max(demand, self.crew_demand))
+        self.crew_demand = demand
+        first_crew = len(self.places) - ROSTER_CREW_SLOTS
+        for slot in changed:
+            col = first_crew + slot
+            self.solver.update_column(col, [self._cost(row, col) for row in range(len(self.solver.cost))])
+    
+    def on_change(self, kind: str, key: str, value: int) -> None:
+        """Player change listener: standing decides who may join the crew"""
+        if kind == "relationship" and key in self.rows:
+            self.refresh(key)
+    
+    def start_day(self) -> None:
+        """Roll who is called off work today"""
+        rng = self.engine.random.get("roster")
+        for npc_id in self.workers:
+            self.set_available(npc_id, rng.random() >= ROSTER_ABSENCE_CHANCE)
+    
+    def placement(self, npc_id: str) -> Optional[Tuple[str, int]]:
+        """The place an inmate is working, if any"""
+        row = self.rows[npc_id]
+        col = self.solver.col_of[row]
+        if col >= len(self.places) or self.solver.cost[row][col] >= ROSTER_FORBIDDEN:
+            return None
+        return self.places[col]
+    
+    def shifts(self) -> Dict[str, List[str]]:
+        """Inmates working each job or the crew"""
+        staffed: Dict[str, List[str]] = defaultdict(list)
+        for npc_id in self.workers:
+            place = self.placement(npc_id)
+            if place:
+                staffed[place[0]].append(npc_id)
+        return staffed
+    
+    def crew(self) -> List[str]:
+        """Inmates on the player's manufacturing crew"""
+        return self.shifts().get("crew", [])
+    
+    def total_output(self) -> float:
+        """Combined value of today's placements"""
+        return sum(self.value(npc_id, place) for npc_id in self.workers
+                   for place in [self.placement(npc_id)] if place)
+
+
+# ============================================================================
+# ADVANCED FEATURES - HEADLESS SIMULATION
+# ============================================================================
+
+class SimulationEngine:
+    """Headless simulation driver for batch playthroughs
+
+    Drives the GameEngine and its subsystems from a scripted action stream.
+    Nothing here touches curses or the UIRenderer, so whole sentences can be
+    played out for balance testing without a terminal.
+
+    Actions are tuples of (verb, *args):
+        ("wait", minutes)             - let time pass
+        ("rest", minutes)             - rest, restoring energy, until something happens
+        ("move", location_id)         - move to a connected location
+        ("travel", location_id)       - walk the earliest-arrival route to any location
+        ("work", job_id)              - work a JobSystem shift
+        ("fight", npc_id, [actions])  - fight an NPC using CombatAction names
+        ("use", item_id)              - use a consumable from the inventory
+    """
+
+    def __init__(self, engine: Optional[GameEngine] = None, player_name: str = "Prisoner",
+                 enemy_health: int = 100, surrender_health: int = 20, max_combat_turns: int = 50,
+                 seed: Optional[int] = None):
+        self.engine = engine or GameEngine(seed)
+        if not self.engine.player:
+            self.engine.new_game(player_name)
+
+        self.events = self.engine.events
+        self.events.listeners.append(self.on_event)
+        self.jobs = JobSystem(self.engine)
+        self.combat = CombatSystem(self.engine)
+
+        self.enemy_health = enemy_health
+        self.surrender_health = surrender_health
+        self.max_combat_turns = max_combat_turns
+
+        self.actions_run: int = 0
+        self.failed_actions: int = 0
+        self.event_counts: Dict[str, int] = defaultdict(int)
+        self.handlers: Dict[str, Callable[..., bool]] = {
+            "wait": self._action_wait,
+            "rest": self._action_rest,
+            "move": self._action_move,
+            "travel": self._action_travel,
+            "work": self._action_work,
+            "fight": self._action_fight,
+            "use": self._action_use,
+        }
+
+    @property
+    def sentence_minutes(self) -> int:
+        """Length of the player's sentence in game minutes"""
+        return self.engine.player.sentence_years * 365 * 24 * 60
+
+    def elapsed_minutes(self) -> int:
+        """Game minutes elapsed since the sentence began"""
+        game_time = self.engine.game_time
+        return (game_time.day - 1) * 24 * 60 + game_time.hour * 60 + game_time.minute
+
+    def is_finished(self) -> bool:
+        """Check if the playthrough has ended"""
+        player = self.engine.player
+        return player.current_health <= 0 or self.elapsed_minutes() >= self.sentence_minutes
+
+    def run_action(self, action: Tuple[Any, ...]) -> bool:
+        """Run a single scripted action; random events arrive as its time passes"""
+        verb, args = action[0], action[1:]
+        handler = self.handlers.get(verb)
+        if not handler:
+            raise ValueError(f"Unknown simulation action: {verb}")
+
+        succeeded = handler(*args)
+        self.actions_run += 1
+        if not succeeded:
+            self.failed_actions += 1
+        return succeeded
+
+    def on_event(self, event: Dict[str, Any]) -> None:
+        """Count random events for the summary"""
+        self.event_counts[event["id"]] += 1
+
+    def run(self, actions: Iterable[Tuple[Any, ...]]) -> Dict[str, Any]:
+        """Play out an action stream until it runs dry or the sentence ends"""
+        for action in actions:
+            if self.is_finished():
+                break
+            self.run_action(action)
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarise the playthrough for batch analysis"""
+        player = self.engine.player
+        return {
+            "actions": self.actions_run,
+            "failed_actions": self.failed_actions,
+            "day": self.engine.game_time.day,
+            "alive": player.current_health > 0,
+            "served": self.elapsed_minutes() >= self.sentence_minutes,
+            "level": player.level,
+            "money": player.money,
+            "reputation": player.attributes.reputation,
+            "stats": dict(player.stats),
+            "events": dict(self.event_counts),
+        }
+
+    def _action_wait(self, minutes: int) -> bool:
+        """Let time pass"""
+        self.engine.advance_time(minutes)
+        return True
+
+    def _action_rest(self, minutes: int) -> bool:
+        """Rest, restoring energy at the same rate as the rest screen"""
+        rested = self.engine.skip_time(minutes)
+        self.engine.player.restore_energy(rested // 3)
+        return True
+
+    def _action_move(self, location_id: str) -> bool:
+        """Move to a connected location"""
+        return self.engine.move_player(location_id)
+
+    def _action_travel(self, location_id: str) -> bool:
+        """Walk to any reachable location, waiting for closed ones to open"""
+        return self.engine.travel_to(location_id)
+
+    def _action_work(self, job_id: str) -> bool:
+        """Work a job shift"""
+        worked, message = self.jobs.work_job(job_id)
+        self.engine.add_message(message)
+        return worked
+
+    def _action_fight(self, npc_id: str, actions: Optional[List[Any]] = None) -> bool:
+        """Fight an NPC until one side goes down, cycling through the given actions"""
+        if not self.combat.start_combat(npc_id):
+            return False
+
+        player = self.engine.player
+        moves = [CombatAction[a] if isinstance(a, str) else a for a in (actions or ["ATTACK"])]
+        enemy_health = self.enemy_health
+
+        for turn in range(self.max_combat_turns):
+            damage, message = self.combat.player_attack(moves[turn % len(moves)])
+            self.combat.add_combat_log(message)
+            enemy_health -= damage
+            if enemy_health <= 0:
+                break
+
+            damage, message = self.combat.enemy_attack()
+            self.combat.add_combat_log(message)
+            player.take_damage(damage)
+            if player.current_health <= self.surrender_health:
+                break
+
+        player_won = enemy_health <= 0
+        self.combat.end_combat(player_won)
+        self.engine.advance_time(10)
+        return player_won
+
+    def _action_use(self, item_id: str) -> bool:
+        """Use a consumable item"""
+        item = self.engine.player.inventory.get(item_id)
+        if not item:
+            return False
+        return self.engine.use_consumable(item)
+
+
+def simulate_sentences(count: int, script_factory: Callable[[int], Iterable[Tuple[Any, ...]]],
+                       seed: Optional[int] = None, **options: Any) -> List[Dict[str, Any]]:
+    """Run many headless playthroughs and collect their summaries
+
+    script_factory receives the run number and returns that run's action stream.
+    Each run gets its own streams spawned from the seed, so a run plays out the
+    same wherever and in whatever order it is run.
+    """
+    streams = RandomStreams(seed)
+    results = []
+    for run_number in range(count):
+        simulation = SimulationEngine(seed=streams.spawn(run_number).seed, **options)
+        results.append(simulation.run(script_factory(run_number)))
+    return results
+
+
 # ============================================================================
 # MAIN ENTRY POINT
 # ============================================================================
 
-def main(stdscr):
-    """Main entry point"""
-    game = Game(stdscr)
-    game.run()
+def main(stdscr, record_path: Optional[str] = None):
+    """Main entry point, journalling every input if asked to"""
+    engine = GameEngine()
+    journal = InputJournal.record(record_path, engine.random.seed, *stdscr.getmaxyx()) if record_path else None
+    game = Game(stdscr, engine, UIRenderer(stdscr, journal))
+    try:
+        game.run()
+    finally:
+        if journal:
+            journal.close()
+
+
+def replay_session(path: str, render_final: bool = False) -> Game:
+    """Re-run a recorded session headlessly, optionally showing its last frame
+    
+    The replay loads and saves in a scratch copy of the save directory, so
+    it sees the same saves as the session did without overwriting them.
+    """
+    import shutil
+    import tempfile
+    
+    journal = InputJournal.load(path)
+    ui = HeadlessUI(journal.inputs, journal.height, journal.width)
+    engine = GameEngine(journal.seed)
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copytree(engine.save_dir, scratch, dirs_exist_ok=True)
+        engine.save_dir = scratch
+        game = Game(None, engine, ui)
+        game.run()
+    if ui.diverged:
+        raise ValueError(ui.diverged)
+    if render_final:
+        load_curses().wrapper(ui.show_frame)
+    return game
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Prison Break")
+    parser.add_argument("--record", metavar="JOURNAL", help="record every input of the session to an input journal")
+    parser.add_argument("--replay", metavar="JOURNAL", help="replay an input journal headlessly and report the result")
+    parser.add_argument("--render-final", action="store_true", help="draw the last frame of a replay")
+    args = parser.parse_args()
+    
+    if args.replay:
+        started = time.perf_counter()
+        game = replay_session(args.replay, args.render_final)
+        player = game.engine.player
+        where = f" on {game.engine.game_time.get_time_string()} at {player.location}" if player else ""
+        print(f"Replayed {args.replay} in {(time.perf_counter() - started) * 1000:.1f} ms{where}")
+        sys.exit(0)
+    
     try:
-        curses.wrapper(main)
+        load_curses().wrapper(main, args.record)
     except KeyboardInterrupt:
         print("\nGame terminated by user.")
     except Exception as e: